@@ -1,4 +1,8 @@
 import argparse
+import asyncio
+import json
+import logging
+import os
 import sys
 from rag_workbench.config.settings import (
     PipelineConfig, 
@@ -62,6 +66,99 @@ def run_graph_placeholder():
     print("You would implement a `GraphStore` and `GraphRetrievalStrategy` in `rag_workbench/strategies`.")
     print("Then update `PipelineBuilder` to support building a graph-based pipeline.")
 
+def run_bench(args):
+    # Imported per command: the harness and servers pull in modules not every platform has
+    from rag_workbench.bench.harness import BenchmarkSuite, compare_to_baseline, load_report, save_report
+    print("=== Running Benchmarks ===")
+    suite = BenchmarkSuite(
+        num_documents=args.documents,
+        words_per_document=args.words,
+        num_queries=args.queries,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        dimension=args.dimension,
+        seed=args.seed
+    )
+    report = suite.run(args.sections)
+    
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        save_report(report, args.output)
+        print(f"Wrote report to {args.output}")
+    else:
+        print(output)
+    
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if args.baseline and os.path.exists(args.baseline):
+        try:
+            regressions = compare_to_baseline(report, load_report(args.baseline), tolerance=args.tolerance)
+        except ValueError as e:
+            print(f"\nSkipping baseline comparison: {e}")
+            return 0
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+def run_serve(args):
+    from rag_workbench.bench.corpus import generate_corpus
+    from rag_workbench.serving import MicroBatcher, QueryServer, serve_stdio
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = PipelineConfig.model_validate(json.load(f))
+    else:
+        config = PipelineConfig(
+            embedding=EmbeddingConfig(model_type=EmbeddingModelType.MOCK, dimension=256),
+            vector_store=VectorStoreConfig(store_type=VectorStoreType.NUMPY)
+        )
+    if args.max_batch_size is not None:
+        config.serving.max_batch_size = args.max_batch_size
+    if args.max_wait_ms is not None:
+        config.serving.max_batch_wait_ms = args.max_wait_ms
+    pipeline = PipelineBuilder.build(config)
+    if args.synthetic_documents:
+        pipeline.ingest_stream(iter(generate_corpus(args.synthetic_documents)))
+    batcher = MicroBatcher.from_config(pipeline, config.serving)
+
+    try:
+        if args.stdio:
+            asyncio.run(serve_stdio(batcher, default_k=config.retrieval.k))
+            return
+        server = QueryServer(batcher, host=args.host, port=args.port, default_k=config.retrieval.k)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    finally:
+        pipeline.close()
+
+def run_loadtest(args):
+    from rag_workbench.serving.loadtest import build_load_test_pipeline, compare_batching, run_load
+    if args.url:
+        host, _, port = args.url.rpartition(":")
+        print(f"=== Load testing {args.url} ===")
+        results = {"server": asyncio.run(run_load(host or "127.0.0.1", int(port), args.requests, args.concurrency))}
+    else:
+        print("=== Load testing an in-process server (mock embedder): per-request vs micro-batched ===")
+        pipeline = build_load_test_pipeline(args.documents, args.dimension, embed_latency_ms=args.embed_latency_ms)
+        results = asyncio.run(compare_batching(
+            pipeline,
+            num_requests=args.requests,
+            concurrency=args.concurrency,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms
+        ))
+    print(json.dumps(results, indent=2, sort_keys=True))
+    if "per_request" in results:
+        speedup = results["micro_batched"]["qps"] / results["per_request"]["qps"]
+        print(f"\nMicro-batching: {speedup:.2f}x the QPS of per-request processing.")
+
 def main():
     parser = argparse.ArgumentParser(description="RAG Workbench CLI")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -72,12 +169,58 @@ def main():
     # Graph Demo
     subparsers.add_parser("graph-demo", help="Run a placeholder for Graph RAG")
     
+    # Benchmarks
+    bench_parser = subparsers.add_parser("bench", help="Benchmark chunkers, embedders, stores and the pipeline")
+    bench_parser.add_argument("--documents", type=int, default=200, help="Synthetic documents to generate")
+    bench_parser.add_argument("--words", type=int, default=300, help="Words per synthetic document")
+    bench_parser.add_argument("--queries", type=int, default=100, help="Queries for latency measurements")
+    bench_parser.add_argument("--chunk-size", type=int, default=500)
+    bench_parser.add_argument("--chunk-overlap", type=int, default=50)
+    bench_parser.add_argument("--dimension", type=int, default=256, help="Mock embedding dimension")
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--sections", nargs="+", choices=["chunkers", "embedders", "stores", "memory", "quantization", "pipeline"],
+                              help="Only run these benchmark sections")
+    bench_parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    bench_parser.add_argument("--baseline", default="bench_baseline.json", help="Baseline report to compare against")
+    bench_parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    bench_parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression")
+    
+    # Query server
+    serve_parser = subparsers.add_parser("serve", help="Serve queries over HTTP (or stdio) with micro-batching")
+    serve_parser.add_argument("--config", help="PipelineConfig as JSON (default: mock embedder + NumPy store)")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--stdio", action="store_true", help="Read JSON-line queries on stdin instead of HTTP")
+    serve_parser.add_argument("--max-batch-size", type=int, help="Queries per batch (overrides the config)")
+    serve_parser.add_argument("--max-wait-ms", type=float, help="Batching window in ms (overrides the config)")
+    serve_parser.add_argument("--synthetic-documents", type=int, default=0,
+                              help="Ingest this many synthetic documents at startup")
+    
+    # Load test
+    load_parser = subparsers.add_parser("loadtest", help="Load-test the query server")
+    load_parser.add_argument("--url", help="host:port of a running `serve`; default compares modes in-process")
+    load_parser.add_argument("--requests", type=int, default=2000)
+    load_parser.add_argument("--concurrency", type=int, default=64, help="Concurrent client connections")
+    load_parser.add_argument("--documents", type=int, default=2000, help="Synthetic documents to ingest")
+    load_parser.add_argument("--dimension", type=int, default=256, help="Mock embedding dimension")
+    load_parser.add_argument("--max-batch-size", type=int, default=64)
+    load_parser.add_argument("--max-wait-ms", type=float, default=3.0)
+    load_parser.add_argument("--embed-latency-ms", type=float, default=0.0,
+                             help="Simulated per-call embedding latency (e.g. a remote API round trip)")
+    
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     if args.command == "vector-demo":
         run_vector_demo()
     elif args.command == "graph-demo":
         run_graph_placeholder()
+    elif args.command == "bench":
+        sys.exit(run_bench(args))
+    elif args.command == "serve":
+        run_serve(args)
+    elif args.command == "loadtest":
+        run_loadtest(args)
     else:
         parser.print_help()
 
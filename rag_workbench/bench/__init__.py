@@ -0,0 +1,2 @@
+from .corpus import generate_corpus, generate_queries
+from .harness import BenchmarkSuite, compare_to_baseline
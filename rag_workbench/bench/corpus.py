@@ -0,0 +1,58 @@
+import random
+from typing import List
+from rag_workbench.core.interfaces import Document
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(2, 10))))
+    return sorted(words)
+
+def _zipf_weights(size: int) -> List[float]:
+    # Natural-language-like word frequencies
+    return [1.0 / (rank + 1) for rank in range(size)]
+
+def generate_corpus(
+    num_documents: int,
+    words_per_document: int = 300,
+    vocabulary_size: int = 5000,
+    seed: int = 0,
+) -> List[Document]:
+    """Deterministic synthetic corpus of paragraphed, Zipf-distributed text.
+
+    The same arguments always produce the same documents, so benchmark runs are
+    comparable across commits and machines.
+    """
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, vocabulary_size)
+    weights = _zipf_weights(vocabulary_size)
+    documents = []
+    for i in range(num_documents):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_document)
+        parts = []
+        sentence_length = 0
+        for j, word in enumerate(words):
+            parts.append(word)
+            sentence_length += 1
+            if sentence_length >= rng.randint(8, 20):
+                parts[-1] += "."
+                sentence_length = 0
+                # Paragraph breaks every few sentences, line breaks otherwise
+                parts.append("\n\n" if rng.random() < 0.2 else "\n")
+            elif j < len(words) - 1:
+                parts.append(" ")
+        documents.append(Document(
+            content="".join(parts),
+            metadata={"source": f"synthetic/{i % 10}", "index": i},
+            id=f"doc-{i}"
+        ))
+    return documents
+
+def generate_queries(num_queries: int, vocabulary_size: int = 5000, words_per_query: int = 6, seed: int = 0) -> List[str]:
+    """Deterministic queries drawn from the same vocabulary as `generate_corpus`."""
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, vocabulary_size)
+    weights = _zipf_weights(vocabulary_size)
+    query_rng = random.Random(seed + 1)
+    return [" ".join(query_rng.choices(vocabulary, weights=weights, k=words_per_query)) for _ in range(num_queries)]
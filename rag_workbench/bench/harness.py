@@ -0,0 +1,272 @@
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from rag_workbench.config.settings import (
+    PipelineConfig,
+    ChunkingConfig,
+    EmbeddingConfig,
+    VectorStoreConfig,
+    ChunkingStrategyType,
+    EmbeddingModelType,
+    VectorStoreType
+)
+from rag_workbench.core.interfaces import Document
+from rag_workbench.pipeline.builder import PipelineBuilder
+from rag_workbench.bench.corpus import generate_corpus, generate_queries
+
+try:
+    import resource
+except ImportError:
+    # Unix only; peak RSS is reported as 0 elsewhere
+    resource = None
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (0 where unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latency samples (seconds), reported in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+def _retained_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated (per tracemalloc) once `build` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+class BenchmarkSuite:
+    """Benchmarks each pipeline component on its own and end to end.
+
+    Every result is a flat dict of metrics. Keys ending in `_per_sec` are
+    higher-is-better and keys ending in `_ms` lower-is-better; `compare_to_baseline`
+    relies on this naming.
+    """
+    CHUNKERS = [ChunkingStrategyType.FIXED, ChunkingStrategyType.RECURSIVE, ChunkingStrategyType.TOKEN]
+    EMBEDDERS = [EmbeddingModelType.MOCK, EmbeddingModelType.HASH]
+    STORES = [VectorStoreType.MEMORY, VectorStoreType.NUMPY, VectorStoreType.IVF]
+
+    def __init__(
+        self,
+        num_documents: int = 200,
+        words_per_document: int = 300,
+        num_queries: int = 100,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        dimension: int = 256,
+        k: int = 4,
+        seed: int = 0,
+    ):
+        self.num_documents = num_documents
+        self.words_per_document = words_per_document
+        self.num_queries = num_queries
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.dimension = dimension
+        self.k = k
+        self.seed = seed
+        self.corpus = generate_corpus(num_documents, words_per_document, seed=seed)
+        self.queries = generate_queries(num_queries, seed=seed)
+
+    def _config(self, chunker=ChunkingStrategyType.RECURSIVE, embedder=EmbeddingModelType.HASH,
+                store=VectorStoreType.NUMPY) -> PipelineConfig:
+        return PipelineConfig(
+            chunking=ChunkingConfig(strategy=chunker, chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap),
+            embedding=EmbeddingConfig(model_type=embedder, dimension=self.dimension),
+            # Small nlist so the IVF index actually trains on benchmark-sized corpora
+            vector_store=VectorStoreConfig(store_type=store, nlist=32, nprobe=4, train_size=256)
+        )
+
+    def _chunks(self) -> List[Document]:
+        return PipelineBuilder._build_chunker(self._config().chunking).chunk(self.corpus)
+
+    def bench_chunkers(self) -> Dict[str, Dict[str, float]]:
+        total_chars = sum(len(doc.content) for doc in self.corpus)
+        results = {}
+        for strategy in self.CHUNKERS:
+            chunker = PipelineBuilder._build_chunker(self._config(chunker=strategy).chunking)
+            chunks = []
+            seconds = _timed(lambda: chunks.extend(chunker.chunk(self.corpus)))
+            results[f"chunker.{strategy.value}"] = {
+                "chunks": len(chunks),
+                "docs_per_sec": len(self.corpus) / seconds,
+                "mb_per_sec": total_chars / seconds / 1e6,
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        return results
+
+    def bench_embedders(self) -> Dict[str, Dict[str, float]]:
+        texts = [chunk.content for chunk in self._chunks()]
+        results = {}
+        for model_type in self.EMBEDDERS:
+            embedder = PipelineBuilder._build_embedder(self._config(embedder=model_type).embedding)
+            seconds = _timed(lambda: embedder.embed_documents(texts))
+            latencies = [_timed(lambda q=q: embedder.embed_query(q)) for q in self.queries]
+            results[f"embedder.{model_type.value}"] = {
+                "texts_per_sec": len(texts) / seconds,
+                **percentiles(latencies),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        return results
+
+    def bench_stores(self) -> Dict[str, Dict[str, float]]:
+        chunks = self._chunks()
+        embedder = PipelineBuilder._build_embedder(self._config().embedding)
+        embeddings = embedder.embed_documents([chunk.content for chunk in chunks])
+        query_embeddings = embedder.embed_documents(self.queries)
+        results = {}
+        for store_type in self.STORES:
+            store = PipelineBuilder._build_vector_store(self._config(store=store_type).vector_store)
+            seconds = _timed(lambda: store.add_documents(chunks, embeddings))
+            latencies = [_timed(lambda q=q: store.search(q, k=self.k)) for q in query_embeddings]
+            batch_seconds = _timed(lambda: store.search_batch(query_embeddings, k=self.k))
+            results[f"store.{store_type.value}"] = {
+                "adds_per_sec": len(chunks) / seconds,
+                "queries_per_sec": len(latencies) / sum(latencies),
+                "batch_queries_per_sec": len(query_embeddings) / batch_seconds,
+                **percentiles(latencies),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        return results
+
+    def bench_memory(self) -> Dict[str, Dict[str, float]]:
+        """Retained memory per stored chunk: plain Document lists vs each store."""
+        embedder = PipelineBuilder._build_embedder(self._config().embedding)
+        num_chunks = len(self._chunks())
+        results = {"memory.document_list": {
+            "bytes_per_chunk": _retained_bytes(self._chunks) / num_chunks,
+        }}
+        for store_type in self.STORES:
+            def build():
+                # Chunks and embeddings are created inside the measurement so whatever
+                # the store keeps of them is counted, as it would be during ingestion
+                store = PipelineBuilder._build_vector_store(self._config(store=store_type).vector_store)
+                chunks = self._chunks()
+                store.add_documents(chunks, embedder.embed_documents([chunk.content for chunk in chunks]))
+                return store
+            results[f"memory.{store_type.value}"] = {
+                "bytes_per_chunk": _retained_bytes(build) / num_chunks,
+            }
+        return results
+
+    def bench_quantization(self) -> Dict[str, Dict[str, float]]:
+        """Vector memory, recall@k against exact search and latency of quantized stores."""
+        chunks = self._chunks()
+        embedder = PipelineBuilder._build_embedder(self._config().embedding)
+        embeddings = embedder.embed_documents([chunk.content for chunk in chunks])
+        query_embeddings = embedder.embed_documents(self.queries)
+        exact = PipelineBuilder._build_vector_store(self._config().vector_store)
+        exact.add_documents(chunks, embeddings)
+        truth = [{doc.id for doc in hits} for hits in exact.search_batch(query_embeddings, k=self.k)]
+        exact_bytes = exact.vectors.nbytes
+        results = {}
+        for quantization in ("int8", "pq"):
+            for rerank_factor in (0, 4):
+                config = self._config().vector_store.model_copy(
+                    update={"quantization": quantization, "rerank_factor": rerank_factor}
+                )
+                store = PipelineBuilder._build_vector_store(config)
+                store.add_documents(chunks, embeddings)
+                hits = store.search_batch(query_embeddings, k=self.k)
+                recall = sum(len(t & {doc.id for doc in h}) for t, h in zip(truth, hits)) / (len(truth) * self.k)
+                latencies = [_timed(lambda q=q: store.search(q, k=self.k)) for q in query_embeddings]
+                results[f"quantization.{quantization}.rerank_{rerank_factor}"] = {
+                    "bytes_per_vector": store.memory_bytes() / len(chunks),
+                    "compression": exact_bytes / store.memory_bytes(),
+                    "recall_at_k": recall,
+                    "queries_per_sec": len(latencies) / sum(latencies),
+                    **percentiles(latencies),
+                }
+                store.close()
+        return results
+
+    def bench_pipeline(self) -> Dict[str, Dict[str, float]]:
+        pipeline = PipelineBuilder.build(self._config())
+        try:
+            stats = pipeline.ingest_stream(iter(self.corpus))
+            latencies = [_timed(lambda q=q: pipeline.query(q, k=self.k)) for q in self.queries]
+        finally:
+            pipeline.close()
+        return {"pipeline.end_to_end": {
+            "ingest_docs_per_sec": stats.documents / stats.wall_seconds,
+            "ingest_chunks_per_sec": stats.chunk.items / stats.wall_seconds,
+            "queries_per_sec": len(latencies) / sum(latencies),
+            **percentiles(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }}
+
+    def run(self, sections: Optional[List[str]] = None) -> Dict[str, object]:
+        benches = {
+            "chunkers": self.bench_chunkers,
+            "embedders": self.bench_embedders,
+            "stores": self.bench_stores,
+            "memory": self.bench_memory,
+            "quantization": self.bench_quantization,
+            "pipeline": self.bench_pipeline,
+        }
+        results: Dict[str, Dict[str, float]] = {}
+        for name in sections or list(benches):
+            results.update(benches[name]())
+        return {
+            "params": {
+                "num_documents": self.num_documents,
+                "words_per_document": self.words_per_document,
+                "num_queries": self.num_queries,
+                "chunk_size": self.chunk_size,
+                "chunk_overlap": self.chunk_overlap,
+                "dimension": self.dimension,
+                "k": self.k,
+                "seed": self.seed,
+            },
+            "results": results,
+        }
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float = 0.10) -> List[str]:
+    """List metrics that regressed by more than `tolerance` relative to the baseline."""
+    if report.get("params") != baseline.get("params"):
+        raise ValueError("Benchmark parameters differ from the baseline; results are not comparable")
+    regressions = []
+    for bench, metrics in report["results"].items():
+        previous = baseline.get("results", {}).get(bench)
+        if not previous:
+            continue
+        for name, value in metrics.items():
+            old = previous.get(name)
+            if not old:
+                continue
+            if name.endswith("_per_sec") and value < old * (1 - tolerance):
+                regressions.append(f"{bench}.{name}: {value:.2f} < baseline {old:.2f}")
+            elif name.endswith("_ms") and value > old * (1 + tolerance):
+                regressions.append(f"{bench}.{name}: {value:.3f} > baseline {old:.3f}")
+    return regressions
+
+def load_report(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_report(report: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
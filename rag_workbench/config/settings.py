@@ -5,36 +5,112 @@ from enum import Enum
 class ChunkingStrategyType(str, Enum):
     FIXED = "fixed"
     RECURSIVE = "recursive"
+    TOKEN = "token" # chunk_size/chunk_overlap measured in tokens
     # Add more as implemented
 
 class EmbeddingModelType(str, Enum):
     OPENAI = "openai"
     HUGGINGFACE = "huggingface"
     MOCK = "mock"
+    HASH = "hash" # Deterministic offline embedder (feature hashing)
 
 class VectorStoreType(str, Enum):
     CHROMA = "chroma"
     FAISS = "faiss"
     MEMORY = "memory"
+    NUMPY = "numpy"
+    IVF = "ivf" # Pure-NumPy approximate index, no FAISS required
+
+class RetrievalStrategyType(str, Enum):
+    VECTOR = "vector"
+    HYBRID = "hybrid" # BM25 keyword search fused with vector search
 
 class ChunkingConfig(BaseModel):
     strategy: ChunkingStrategyType = ChunkingStrategyType.FIXED
     chunk_size: int = 1000
     chunk_overlap: int = 200
     separators: Optional[list[str]] = None
+    tokenizer: Optional[str] = None # TOKEN only: tiktoken encoding or "simple"; auto-detected if unset
+    num_workers: int = 1 # >1 chunks large batches in a process pool; 0 uses every CPU
+    parallel_min_documents: int = 64 # Smaller batches are chunked in-process
+    parallel_min_characters: int = 1_000_000
 
 class EmbeddingConfig(BaseModel):
     model_type: EmbeddingModelType = EmbeddingModelType.MOCK
     model_name: str = "text-embedding-3-small" # Default for OpenAI
     api_key: Optional[str] = None
+    dimension: Optional[int] = None # MOCK/HASH models only
+    batch_size: int = 2048 # Max inputs per embedding request
+    max_batch_tokens: int = 300_000 # Max estimated tokens per embedding request
+    max_concurrency: int = 4 # Embedding requests in flight at once
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_retries: int = 5
+    cache_path: Optional[str] = None # SQLite file; enables the embedding cache when set
+    cache_max_entries: Optional[int] = 1_000_000
+    cache_lru_size: int = 1024 # In-process LRU entries for query embeddings
 
 class VectorStoreConfig(BaseModel):
     store_type: VectorStoreType = VectorStoreType.CHROMA
     collection_name: str = "rag_workbench"
     persist_directory: str = "./chroma_db"
+    dtype: str = "float32" # NUMPY/IVF stores: "float32" or "float16"
+    # Approximate (FAISS/IVF) index settings
+    index_type: str = "hnsw" # FAISS only: "hnsw" or "ivf"
+    index_path: Optional[str] = None # Load the index/store from here if it exists
+    mmap: bool = False # NUMPY store only: serve index_path memory-mapped
+    writable: bool = False # mmap only: persist every write to index_path; one writer per directory at a time
+    nlist: int = 1024 # IVF cells
+    nprobe: int = 16 # IVF cells scanned per query (recall vs latency)
+    hnsw_m: int = 32
+    ef_search: int = 64 # HNSW candidate list size per query (recall vs latency)
+    train_size: Optional[int] = None # Vectors used to train IVF (default 39 * nlist) or the quantizer
+    # Quantized storage (NUMPY store): compact codes in RAM, full-precision vectors on disk
+    quantization: Optional[str] = None # "int8" (4x smaller) or "pq" (product quantization)
+    pq_subvectors: Optional[int] = None # PQ bytes per vector; defaults to about dimension / 8
+    rerank_factor: int = 4 # Re-score k * rerank_factor candidates exactly from disk; 0 = codes only
+    raw_vectors_path: Optional[str] = None # File for the full-precision vectors; a temporary file if unset
+    # Sharding: the store above becomes one shard; index_path holds shard-000, shard-001, ...
+    num_shards: int = 1 # Partitions searched in parallel and merged; 1 = unsharded
+    shard_key: Optional[str] = None # Metadata field to partition by (filters on it skip other shards); ID hash if unset
+    shard_processes: bool = False # Run each shard in its own worker process instead of threads
+
+class IngestionConfig(BaseModel):
+    batch_size: int = 64 # Chunks per micro-batch in streaming ingest
+    queue_size: int = 4 # Max batches buffered between streaming stages
+    chunk_batch_size: Optional[int] = None # Documents per chunking call in streaming ingest; defaults to batch_size
+    incremental: bool = False # Skip unchanged documents and delete stale chunks on re-ingest
+    manifest_path: Optional[str] = None # JSON manifest for incremental ingest; in-memory if unset
+
+class InstrumentationConfig(BaseModel):
+    enabled: bool = False # Record counters and stage latency histograms (RAGPipeline.metrics)
+    log_spans: bool = False # Also emit every span/counter as a DEBUG log record
+    opentelemetry: bool = False # Also forward to the OpenTelemetry API (requires opentelemetry-api)
+
+class ServingConfig(BaseModel):
+    max_concurrent_queries: Optional[int] = 64 # Async queries (aquery/aquery_batch) in flight at once; None = unlimited
+    coalesce_queries: bool = True # Identical in-flight async queries share one query embedding call
+    max_batch_size: int = 64 # `serve`: queries gathered into one batched embed + search
+    max_batch_wait_ms: float = 3.0 # `serve`: longest a batch waits to fill while another batch executes (latency ceiling)
+    max_concurrent_batches: int = 1 # `serve`: batches executing at once
+
+class QueryCacheConfig(BaseModel):
+    enabled: bool = False # Cache query results; invalidated by every pipeline ingest/delete
+    max_entries: int = 10_000 # Exact layer: (normalized query text, k, filter) -> results, LRU
+    ttl_seconds: Optional[float] = None # Expire entries after this long; None = only LRU/invalidation
+    semantic_threshold: Optional[float] = None # Reuse results of a cached query at >= this cosine similarity (e.g. 0.95); VECTOR retrieval only
+    semantic_max_entries: int = 1024 # Query embeddings kept for the semantic layer, LRU
 
 class RetrievalConfig(BaseModel):
     k: int = 4
+    strategy: RetrievalStrategyType = RetrievalStrategyType.VECTOR
+    fusion: str = "rrf" # HYBRID: "rrf" (reciprocal rank fusion) or "weighted" (normalized scores)
+    rrf_k: int = 60
+    vector_weight: float = 0.5 # HYBRID "weighted" fusion: vector share of the combined score
+    candidates: int = 50 # HYBRID: results taken from each search before fusing
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    index_path: Optional[str] = None # HYBRID: BM25 index directory, loaded if it exists and saved after every ingest/delete
 
 class GenerationConfig(BaseModel):
     model_name: str = "gpt-4o"
@@ -45,5 +121,9 @@ class PipelineConfig(BaseModel):
     chunking: ChunkingConfig = Field(default_factory=ChunkingConfig)
     embedding: EmbeddingConfig = Field(default_factory=EmbeddingConfig)
     vector_store: VectorStoreConfig = Field(default_factory=VectorStoreConfig)
+    ingestion: IngestionConfig = Field(default_factory=IngestionConfig)
+    instrumentation: InstrumentationConfig = Field(default_factory=InstrumentationConfig)
+    serving: ServingConfig = Field(default_factory=ServingConfig)
+    query_cache: QueryCacheConfig = Field(default_factory=QueryCacheConfig)
     retrieval: RetrievalConfig = Field(default_factory=RetrievalConfig)
     generation: GenerationConfig = Field(default_factory=GenerationConfig)
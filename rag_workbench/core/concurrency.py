@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+class RequestCoalescer:
+    """Lets concurrent callers asking for the same key share one in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is still
+    running await the same result instead of issuing their own. Nothing is cached:
+    once the call finishes, the next request for the key starts a new one. The call
+    is shielded, so a cancelled caller does not cancel it for the others.
+    """
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        on_coalesced: Optional[Callable[[], None]] = None,
+    ) -> T:
+        """Result of `call()` for this key; `on_coalesced` is called if this caller joined
+        a call already in flight (the shared `coalesced` counter can't tell callers apart)."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures belong to one event loop; start over if used from another
+            self._inflight = {}
+            self._loop = loop
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            if on_coalesced is not None:
+                on_coalesced()
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(call())
+        self._inflight[key] = future
+
+        def done(finished: asyncio.Future) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            # Mark the exception retrieved in case every waiter was cancelled
+            if not finished.cancelled():
+                finished.exception()
+
+        future.add_done_callback(done)
+        return await asyncio.shield(future)
+
+class ConcurrencyLimiter:
+    """Async context manager admitting at most `limit` holders at once (None = no limit).
+
+    Unlike a bare asyncio.Semaphore it can be created outside a running loop and
+    reused across loops (e.g. successive asyncio.run calls).
+    """
+    def __init__(self, limit: Optional[int] = None):
+        if limit is not None and limit <= 0:
+            raise ValueError("Concurrency limit must be positive or None")
+        self.limit = limit
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.active = 0
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        if self.limit is not None:
+            loop = asyncio.get_running_loop()
+            if loop is not self._loop:
+                self._semaphore = asyncio.Semaphore(self.limit)
+                self._loop = loop
+            await self._semaphore.acquire()
+        self.active += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.active -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
@@ -0,0 +1,202 @@
+import bisect
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+class InstrumentationHook:
+    """Receives timing spans and counter increments; override what you need."""
+    def on_span(self, name: str, seconds: float, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def on_counter(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        pass
+
+class Instrumentation:
+    """Fan-out point for pipeline telemetry.
+
+    With no hooks registered it is disabled: `span` returns a shared no-op context
+    manager and `incr` returns immediately, so instrumented code pays about one
+    attribute check per call.
+    """
+    def __init__(self, hooks: Optional[Sequence[InstrumentationHook]] = None):
+        self.hooks: List[InstrumentationHook] = list(hooks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hooks)
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.append(hook)
+
+    def span(self, name: str, **attributes):
+        if not self.hooks:
+            return _NULL_SPAN
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            seconds = time.perf_counter() - start
+            for hook in self.hooks:
+                hook.on_span(name, seconds, attributes)
+
+    def incr(self, name: str, value: float = 1, **attributes) -> None:
+        if not self.hooks:
+            return
+        for hook in self.hooks:
+            hook.on_counter(name, value, attributes)
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+NULL_INSTRUMENTATION = Instrumentation()
+
+# Latency buckets in seconds, from 100us to 60s
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-th quantile (inf if in the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+class MetricsRecorder(InstrumentationHook):
+    """Aggregates counters and span latency histograms in process."""
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, name: str, seconds: float, attributes: Dict[str, Any]) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def on_counter(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "spans": {
+                    name: {
+                        "count": h.count,
+                        "total_seconds": h.sum,
+                        "p50_seconds": h.quantile(0.5),
+                        "p99_seconds": h.quantile(0.99),
+                    }
+                    for name, h in self.histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "rag") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(prefix, name) + "_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = _metric_name(prefix, name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum {h.sum}")
+                lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+def _metric_name(prefix: str, name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}")
+
+class LoggingHook(InstrumentationHook):
+    """Emits every span and counter as a structured log record (fields in `extra`)."""
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.log = log or logger
+        self.level = level
+
+    def on_span(self, name: str, seconds: float, attributes: Dict[str, Any]) -> None:
+        if self.log.isEnabledFor(self.level):
+            self.log.log(
+                self.level, f"span {name} took {seconds * 1000:.2f}ms",
+                extra={"span": name, "duration_seconds": seconds, "attributes": attributes}
+            )
+
+    def on_counter(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        if self.log.isEnabledFor(self.level):
+            self.log.log(
+                self.level, f"counter {name} += {value}",
+                extra={"counter": name, "value": value, "attributes": attributes}
+            )
+
+class OpenTelemetryHook(InstrumentationHook):
+    """Forwards spans and counters to the OpenTelemetry API (tracer and meter)."""
+    def __init__(self, service_name: str = "rag_workbench"):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetry is not installed. Please install it with `pip install opentelemetry-api`."
+            )
+        self._tracer = trace.get_tracer(service_name)
+        self._meter = metrics.get_meter(service_name)
+        self._counters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, name: str, seconds: float, attributes: Dict[str, Any]) -> None:
+        # Spans are reported after the fact, so rebuild their start time from the duration
+        end_ns = time.time_ns()
+        span = self._tracer.start_span(
+            name, start_time=end_ns - int(seconds * 1e9), attributes=_otel_attributes(attributes)
+        )
+        span.end(end_time=end_ns)
+
+    def on_counter(self, name: str, value: float, attributes: Dict[str, Any]) -> None:
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = self._meter.create_counter(name)
+        counter.add(value, attributes=_otel_attributes(attributes))
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry only accepts primitive attribute values
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in attributes.items()}
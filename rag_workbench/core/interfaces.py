@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Any, Dict, Optional
 from dataclasses import dataclass
@@ -20,6 +21,10 @@ class ChunkingStrategy(ABC):
         """Split documents into smaller chunks."""
         pass
 
+    def chunk_each(self, documents: List[Document]) -> List[List[Document]]:
+        """Chunk several documents at once, returning each document's chunks separately."""
+        return [self.chunk([doc]) for doc in documents]
+
 class EmbeddingModel(ABC):
     @abstractmethod
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
@@ -31,25 +36,109 @@ class EmbeddingModel(ABC):
         """Embed a single query text."""
         pass
 
+    # Async counterparts. The defaults run the sync method in a worker thread so the
+    # event loop is never blocked; models with a native async client override them.
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts without blocking the event loop."""
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a single query text without blocking the event loop."""
+        return await asyncio.to_thread(self.embed_query, text)
+
 class VectorStore(ABC):
     @abstractmethod
     def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
-        """Add documents and their embeddings to the store."""
+        """Add documents and their embeddings to the store, replacing any with the same ID."""
         pass
     
     @abstractmethod
-    def search(self, query_embedding: List[float], k: int = 4) -> List[Document]:
-        """Search for similar documents using a query embedding."""
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Search for similar documents using a query embedding.
+
+        `where` is an optional metadata filter in Chroma's `where` syntax, e.g.
+        {"source": "wiki"}, {"year": {"$gte": 2020}} or {"$or": [...]}; only
+        documents whose metadata matches it are returned.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete documents by ID. Unknown IDs are ignored."""
         pass
 
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Search for several query embeddings at once, one result list per query.
+
+        The default runs one search per query; stores that can score a whole batch
+        in a single pass should override this. `where` applies to every query.
+        """
+        return [self.search(query_embedding, k=k, where=where) for query_embedding in query_embeddings]
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        """Fetch stored documents by ID, in the order given. Unknown IDs are skipped."""
+        raise NotImplementedError(f"{type(self).__name__} does not support lookup by ID")
+
+    # Async counterparts, offloaded to a worker thread by default
+    async def aadd_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        await asyncio.to_thread(self.add_documents, documents, embeddings)
+
+    async def asearch(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return await asyncio.to_thread(self.search, query_embedding, k, where)
+
+    async def asearch_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        return await asyncio.to_thread(self.search_batch, query_embeddings, k, where)
+
+    async def adelete(self, ids: List[str]) -> None:
+        await asyncio.to_thread(self.delete, ids)
+
 class RetrievalStrategy(ABC):
+    # Hooks called by the pipeline. A strategy that keeps its own index (e.g. a
+    # lexical one) is fed every chunk the pipeline stores and deletes.
+    def bind(self, embedding_model: EmbeddingModel, vector_store: VectorStore) -> None:
+        """Give the strategy the pipeline's embedding model and vector store."""
+        pass
+
+    def index_documents(self, documents: List[Document]) -> None:
+        """Called after documents have been added to the vector store."""
+        pass
+
+    def remove_documents(self, ids: List[str]) -> None:
+        """Called after documents have been deleted from the vector store."""
+        pass
+
+    def persist(self) -> None:
+        """Called at the end of every pipeline ingest or delete, to save an on-disk index."""
+        pass
+
     @abstractmethod
     def retrieve(self, query: str, k: int = 4) -> List[Document]:
         """Retrieve relevant documents for a query."""
         pass
 
+    def retrieve_batch(self, queries: List[str], k: int = 4) -> List[List[Document]]:
+        """Retrieve for several queries at once; the default retrieves one by one."""
+        return [self.retrieve(query, k=k) for query in queries]
+
+    async def aretrieve(self, query: str, k: int = 4) -> List[Document]:
+        return await asyncio.to_thread(self.retrieve, query, k)
+
+    async def aretrieve_batch(self, queries: List[str], k: int = 4) -> List[List[Document]]:
+        return await asyncio.to_thread(self.retrieve_batch, queries, k)
+
 class GenerationModel(ABC):
     @abstractmethod
     def generate(self, prompt: str, context: List[Document]) -> str:
         """Generate a response based on the prompt and context."""
         pass
+
+    async def agenerate(self, prompt: str, context: List[Document]) -> str:
+        return await asyncio.to_thread(self.generate, prompt, context)
@@ -1,2 +1,5 @@
 from .manager import RAGPipeline
 from .builder import PipelineBuilder
+from .streaming import StreamingIngestor, IngestStats
+from .manifest import IngestionManifest
+from .query_cache import QueryCache
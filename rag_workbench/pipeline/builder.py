@@ -1,71 +1,203 @@
+import logging
+import os
+from functools import partial
+from typing import Optional
 from rag_workbench.config.settings import (
     PipelineConfig,
     ChunkingStrategyType,
     EmbeddingModelType,
-    VectorStoreType
+    VectorStoreType,
+    RetrievalStrategyType
 )
 from rag_workbench.core.interfaces import (
     ChunkingStrategy,
     EmbeddingModel,
-    VectorStore
+    VectorStore,
+    RetrievalStrategy
+)
+from rag_workbench.strategies.chunking import (
+    FixedSizeChunker,
+    RecursiveCharacterChunker,
+    TokenChunker,
+    ParallelChunker,
+    get_tokenizer
+)
+from rag_workbench.strategies.embedding import (
+    MockEmbeddingModel,
+    HashEmbeddingModel,
+    OpenAIEmbeddingModel,
+    CachedEmbeddingModel,
+    SQLiteEmbeddingStore
+)
+from rag_workbench.strategies.storage import (
+    ChromaDBVectorStore,
+    InMemoryVectorStore,
+    NumpyVectorStore,
+    MappedVectorStore,
+    QuantizedVectorStore,
+    IVFVectorStore,
+    FaissVectorStore,
+    ShardedVectorStore
+)
+from rag_workbench.strategies.storage.sharded import shard_path
+from rag_workbench.strategies.retrieval import BM25Index, HybridRetriever
+from rag_workbench.core.instrumentation import (
+    Instrumentation,
+    MetricsRecorder,
+    LoggingHook,
+    OpenTelemetryHook
 )
-from rag_workbench.strategies.chunking import FixedSizeChunker, RecursiveCharacterChunker
-from rag_workbench.strategies.embedding import MockEmbeddingModel, OpenAIEmbeddingModel
-from rag_workbench.strategies.storage import ChromaDBVectorStore, InMemoryVectorStore
 from rag_workbench.pipeline.manager import RAGPipeline
+from rag_workbench.pipeline.manifest import IngestionManifest
+from rag_workbench.pipeline.query_cache import QueryCache
+
+logger = logging.getLogger(__name__)
 
 class PipelineBuilder:
     @staticmethod
     def build(config: PipelineConfig) -> RAGPipeline:
+        # 0. Build Instrumentation (shared by every component that reports metrics)
+        instrumentation = PipelineBuilder._build_instrumentation(config.instrumentation)
+        
         # 1. Build Chunking Strategy
         chunker = PipelineBuilder._build_chunker(config.chunking)
         
         # 2. Build Embedding Model
-        embedder = PipelineBuilder._build_embedder(config.embedding)
+        embedder = PipelineBuilder._build_embedder(config.embedding, instrumentation)
         
         # 3. Build Vector Store
         store = PipelineBuilder._build_vector_store(config.vector_store)
         
-        # 4. Build Retrieval & Generation (TODO)
+        # 4. Build Retrieval (bound to the embedder and store by the pipeline) & Generation (TODO)
+        if config.retrieval.index_path and config.vector_store.index_path and (
+            os.path.abspath(config.retrieval.index_path) == os.path.abspath(config.vector_store.index_path)
+        ):
+            # Saving a store replaces its whole directory
+            raise ValueError("retrieval.index_path must differ from vector_store.index_path")
+        retriever = PipelineBuilder._build_retriever(config.retrieval)
+        
+        query_cache = None
+        if config.query_cache.enabled:
+            if config.query_cache.semantic_threshold is not None and retriever is not None:
+                # Strategies embed and search internally, so there is no query embedding to match on
+                raise ValueError(
+                    "query_cache.semantic_threshold requires the default vector retrieval; "
+                    f"with the {RetrievalStrategyType(config.retrieval.strategy).value} strategy only the exact layer is available"
+                )
+            query_cache = QueryCache(
+                max_entries=config.query_cache.max_entries,
+                ttl_seconds=config.query_cache.ttl_seconds,
+                semantic_threshold=config.query_cache.semantic_threshold,
+                semantic_max_entries=config.query_cache.semantic_max_entries,
+                instrumentation=instrumentation
+            )
+
+        manifest = None
+        if config.ingestion.incremental:
+            manifest = IngestionManifest(config.ingestion.manifest_path)
         
         return RAGPipeline(
             chunking_strategy=chunker,
             embedding_model=embedder,
-            vector_store=store
+            vector_store=store,
+            retrieval_strategy=retriever,
+            ingest_batch_size=config.ingestion.batch_size,
+            ingest_queue_size=config.ingestion.queue_size,
+            ingest_chunk_batch_size=config.ingestion.chunk_batch_size,
+            manifest=manifest,
+            instrumentation=instrumentation,
+            max_concurrent_queries=config.serving.max_concurrent_queries,
+            coalesce_queries=config.serving.coalesce_queries,
+            query_cache=query_cache
         )
 
+    @staticmethod
+    def _build_instrumentation(config) -> Instrumentation:
+        hooks = []
+        if config.enabled:
+            hooks.append(MetricsRecorder())
+        if config.log_spans:
+            hooks.append(LoggingHook())
+        if config.opentelemetry:
+            hooks.append(OpenTelemetryHook())
+        return Instrumentation(hooks)
+
     @staticmethod
     def _build_chunker(config) -> ChunkingStrategy:
         if config.strategy == ChunkingStrategyType.FIXED:
-            return FixedSizeChunker(
+            chunker = FixedSizeChunker(
                 chunk_size=config.chunk_size,
                 chunk_overlap=config.chunk_overlap
             )
         elif config.strategy == ChunkingStrategyType.RECURSIVE:
-            return RecursiveCharacterChunker(
+            chunker = RecursiveCharacterChunker(
                 chunk_size=config.chunk_size,
                 chunk_overlap=config.chunk_overlap,
                 separators=config.separators
             )
+        elif config.strategy == ChunkingStrategyType.TOKEN:
+            chunker = TokenChunker(
+                chunk_size=config.chunk_size,
+                chunk_overlap=config.chunk_overlap,
+                separators=config.separators,
+                tokenizer=get_tokenizer(config.tokenizer)
+            )
         else:
             raise ValueError(f"Unknown chunking strategy: {config.strategy}")
 
+        if config.num_workers != 1:
+            chunker = ParallelChunker(
+                chunker,
+                num_workers=config.num_workers or None,
+                min_documents=config.parallel_min_documents,
+                min_characters=config.parallel_min_characters
+            )
+        return chunker
+
     @staticmethod
-    def _build_embedder(config) -> EmbeddingModel:
+    def _build_embedder(config, instrumentation: Optional[Instrumentation] = None) -> EmbeddingModel:
         if config.model_type == EmbeddingModelType.MOCK:
-            return MockEmbeddingModel()
+            embedder = MockEmbeddingModel(dimension=config.dimension or 1536)
+        elif config.model_type == EmbeddingModelType.HASH:
+            embedder = HashEmbeddingModel(dimension=config.dimension or 256)
         elif config.model_type == EmbeddingModelType.OPENAI:
             if not config.api_key:
                 raise ValueError("API key required for OpenAI embedding model")
-            return OpenAIEmbeddingModel(
+            embedder = OpenAIEmbeddingModel(
                 api_key=config.api_key,
-                model_name=config.model_name
+                model_name=config.model_name,
+                batch_size=config.batch_size,
+                max_batch_tokens=config.max_batch_tokens,
+                max_concurrency=config.max_concurrency,
+                requests_per_minute=config.requests_per_minute,
+                tokens_per_minute=config.tokens_per_minute,
+                max_retries=config.max_retries
             )
         else:
             raise ValueError(f"Unknown embedding model type: {config.model_type}")
 
+        if config.cache_path:
+            embedder = CachedEmbeddingModel(
+                embedder,
+                model_name=PipelineBuilder._embedder_identity(config, embedder),
+                store=SQLiteEmbeddingStore(config.cache_path, max_entries=config.cache_max_entries),
+                lru_size=config.cache_lru_size,
+                instrumentation=instrumentation
+            )
+        return embedder
+
+    @staticmethod
+    def _embedder_identity(config, embedder: EmbeddingModel) -> str:
+        """Embedding cache namespace: the model type plus whatever determines its vectors."""
+        if config.model_type == EmbeddingModelType.OPENAI:
+            return f"{config.model_type.value}:{config.model_name}"
+        # MOCK/HASH ignore model_name; their vectors depend only on the dimension
+        return f"{config.model_type.value}:{embedder.dimension}"
+
     @staticmethod
     def _build_vector_store(config) -> VectorStore:
+        if config.num_shards > 1:
+            return PipelineBuilder._build_sharded_store(config)
         if config.store_type == VectorStoreType.CHROMA:
             return ChromaDBVectorStore(
                 collection_name=config.collection_name,
@@ -73,5 +205,107 @@ class PipelineBuilder:
             )
         elif config.store_type == VectorStoreType.MEMORY:
             return InMemoryVectorStore()
+        elif config.store_type == VectorStoreType.NUMPY:
+            if config.quantization:
+                return PipelineBuilder._build_quantized_store(config)
+            if config.index_path and config.mmap:
+                return MappedVectorStore.open(config.index_path, writable=config.writable, dtype=config.dtype)
+            if config.index_path and os.path.exists(config.index_path):
+                return NumpyVectorStore.load(config.index_path)
+            return NumpyVectorStore(dtype=config.dtype)
+        elif config.store_type == VectorStoreType.FAISS:
+            try:
+                import faiss  # noqa: F401
+            except ImportError:
+                logger.warning("FAISS is not installed; falling back to the NumPy IVF index.")
+                return PipelineBuilder._build_ivf_store(config)
+            if config.index_path and os.path.exists(config.index_path):
+                return FaissVectorStore.load(config.index_path)
+            return FaissVectorStore(
+                index_type=config.index_type,
+                hnsw_m=config.hnsw_m,
+                ef_search=config.ef_search,
+                nlist=config.nlist,
+                nprobe=config.nprobe,
+                train_size=config.train_size
+            )
+        elif config.store_type == VectorStoreType.IVF:
+            return PipelineBuilder._build_ivf_store(config)
         else:
             raise ValueError(f"Unknown vector store type: {config.store_type}")
+
+    @staticmethod
+    def _build_sharded_store(config) -> VectorStore:
+        if config.store_type == VectorStoreType.CHROMA:
+            raise ValueError("Chroma cannot be sharded; its searches return no scores to merge")
+        if config.index_path:
+            layout = ShardedVectorStore.read_layout(config.index_path)
+            if layout is not None and layout["num_shards"] != config.num_shards:
+                raise ValueError(
+                    f"{config.index_path} holds {layout['num_shards']} shards, config asks for {config.num_shards}"
+                )
+        return ShardedVectorStore(
+            partial(PipelineBuilder._build_shard, config),
+            num_shards=config.num_shards,
+            partition_key=config.shard_key,
+            processes=config.shard_processes
+        )
+
+    @staticmethod
+    def _build_shard(config, shard: int) -> VectorStore:
+        """One shard: the configured store, persisted under its own directory."""
+        updates = {"num_shards": 1}
+        if config.index_path:
+            updates["index_path"] = shard_path(config.index_path, shard)
+        if config.raw_vectors_path:
+            updates["raw_vectors_path"] = f"{config.raw_vectors_path}.{shard:03d}"
+        return PipelineBuilder._build_vector_store(config.model_copy(update=updates))
+
+    @staticmethod
+    def _build_quantized_store(config) -> VectorStore:
+        if config.mmap:
+            raise ValueError("mmap is not supported with quantization; quantized stores keep their codes in memory")
+        if config.index_path and os.path.exists(config.index_path):
+            store = QuantizedVectorStore.load(config.index_path)
+            store.rerank_factor = config.rerank_factor
+            return store
+        return QuantizedVectorStore(
+            quantization=config.quantization,
+            pq_subvectors=config.pq_subvectors,
+            train_size=config.train_size,
+            rerank_factor=config.rerank_factor,
+            raw_path=config.raw_vectors_path
+        )
+
+    @staticmethod
+    def _build_retriever(config) -> Optional[RetrievalStrategy]:
+        if config.strategy == RetrievalStrategyType.VECTOR:
+            return None
+        elif config.strategy == RetrievalStrategyType.HYBRID:
+            if config.index_path and os.path.exists(os.path.join(config.index_path, "bm25.json")):
+                index = BM25Index.load(config.index_path)
+            else:
+                index = BM25Index(k1=config.bm25_k1, b=config.bm25_b)
+            return HybridRetriever(
+                index=index,
+                fusion=config.fusion,
+                rrf_k=config.rrf_k,
+                vector_weight=config.vector_weight,
+                candidates=config.candidates,
+                path=config.index_path
+            )
+        else:
+            raise ValueError(f"Unknown retrieval strategy: {config.strategy}")
+
+    @staticmethod
+    def _build_ivf_store(config) -> VectorStore:
+        if config.index_path and os.path.exists(config.index_path):
+            store = IVFVectorStore.load(config.index_path)
+            store.nprobe = config.nprobe
+            return store
+        return IVFVectorStore(
+            nlist=config.nlist,
+            nprobe=config.nprobe,
+            train_size=config.train_size,
+            dtype=config.dtype
+        )
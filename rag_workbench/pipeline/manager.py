@@ -1,4 +1,6 @@
-from typing import List, Optional
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from rag_workbench.core.interfaces import (
     IngestionStrategy,
     ChunkingStrategy,
@@ -8,6 +10,14 @@ from rag_workbench.core.interfaces import (
     GenerationModel,
     Document
 )
+from rag_workbench.pipeline.streaming import StreamingIngestor, IngestStats
+from rag_workbench.core.concurrency import ConcurrencyLimiter, RequestCoalescer
+from rag_workbench.core.instrumentation import Instrumentation, MetricsRecorder, NULL_INSTRUMENTATION
+from rag_workbench.pipeline.manifest import IngestionManifest, document_key, content_hash
+from rag_workbench.pipeline.query_cache import QueryCache
+from rag_workbench.strategies.embedding.executor import estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 class RAGPipeline:
     def __init__(
@@ -17,46 +27,461 @@ class RAGPipeline:
         vector_store: VectorStore,
         retrieval_strategy: Optional[RetrievalStrategy] = None,
         generation_model: Optional[GenerationModel] = None,
+        ingest_batch_size: int = 64,
+        ingest_queue_size: int = 4,
+        ingest_chunk_batch_size: Optional[int] = None,
+        manifest: Optional[IngestionManifest] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        max_concurrent_queries: Optional[int] = None,
+        coalesce_queries: bool = True,
+        query_cache: Optional[QueryCache] = None,
     ):
         self.chunking_strategy = chunking_strategy
         self.embedding_model = embedding_model
         self.vector_store = vector_store
         self.retrieval_strategy = retrieval_strategy
         self.generation_model = generation_model
+        self.ingest_batch_size = ingest_batch_size
+        self.ingest_queue_size = ingest_queue_size
+        self.ingest_chunk_batch_size = ingest_chunk_batch_size
+        self.manifest = manifest
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        # Async serving: bound concurrent aquery calls and share identical in-flight query embeddings
+        self.query_limiter = ConcurrencyLimiter(max_concurrent_queries)
+        self.coalescer = RequestCoalescer() if coalesce_queries else None
+        # Invalidated by every ingest and delete that goes through the pipeline
+        self.query_cache = query_cache
+        if retrieval_strategy is not None:
+            retrieval_strategy.bind(embedding_model, vector_store)
+
+    @property
+    def metrics(self) -> Optional[MetricsRecorder]:
+        """The in-process metrics recorder, if instrumentation records metrics."""
+        for hook in self.instrumentation.hooks:
+            if isinstance(hook, MetricsRecorder):
+                return hook
+        return None
+
+    def ingest(self, documents: List[Document], prune: bool = False):
+        """Full ingestion flow: Chunk -> Embed -> Store
+
+        With a manifest configured, ingestion is incremental: unchanged documents are
+        skipped, changed ones are re-chunked and their stale chunks deleted. With
+        `prune=True`, `documents` is treated as the full corpus snapshot and documents
+        missing from it are deleted from the store as well.
+        """
+        if self.manifest is None:
+            if prune:
+                raise ValueError("prune=True requires a pipeline configured with an ingestion manifest.")
+            logger.info(f"Ingesting {len(documents)} documents...")
+            inst = self.instrumentation
+            inst.incr("ingest.documents", len(documents))
+            
+            # 1. Chunk
+            with inst.span("ingest.chunk", documents=len(documents)):
+                chunks = self.chunking_strategy.chunk(documents)
+            inst.incr("ingest.chunks", len(chunks))
+            logger.info(f"Created {len(chunks)} chunks.")
+            
+            # 2. Embed
+            # Extract text content for embedding
+            texts = [chunk.content for chunk in chunks]
+            embeddings = self._embed_documents(texts, "ingest.embed")
+            logger.info(f"Generated {len(embeddings)} embeddings.")
+            
+            # 3. Store
+            with inst.span("ingest.store", chunks=len(chunks)):
+                self.vector_store.add_documents(chunks, embeddings)
+                self._after_store(chunks)
+            logger.info("Stored documents in vector store.")
+            self._persist()
+            return
+
+        self._ingest_incremental(documents, prune)
+
+    def _ingest_incremental(self, documents: List[Document], prune: bool):
+        # 1. Diff the snapshot against the manifest
+        changed = []
+        stale_ids = set()
+        seen = set()
+        for doc in documents:
+            key = document_key(doc)
+            hash_ = content_hash(doc)
+            seen.add(key)
+            if self.manifest.get_hash(key) == hash_:
+                continue
+            stale_ids.update(self.manifest.get_chunk_ids(key))
+            changed.append((key, hash_, doc))
+        removed = [key for key in self.manifest.keys() if key not in seen] if prune else []
+        for key in removed:
+            stale_ids.update(self.manifest.get_chunk_ids(key))
+        inst = self.instrumentation
+        inst.incr("ingest.documents", len(documents))
+        inst.incr("ingest.documents_skipped", len(documents) - len(changed))
+        logger.info(
+            f"Ingesting {len(documents)} documents incrementally: {len(changed)} new or changed, "
+            f"{len(documents) - len(changed)} unchanged, {len(removed)} removed."
+        )
+
+        # 2. Chunk only changed documents, keeping track of which chunks belong to which
+        chunks = []
+        chunk_ids_by_key = {}
+        with inst.span("ingest.chunk", documents=len(changed)):
+            # One call for all changed documents, so a parallel chunker can use its pool
+            per_document = self.chunking_strategy.chunk_each([doc for _, _, doc in changed])
+            for (key, _, _), doc_chunks in zip(changed, per_document):
+                chunk_ids_by_key[key] = [chunk.id for chunk in doc_chunks]
+                chunks.extend(doc_chunks)
+        inst.incr("ingest.chunks", len(chunks))
+        logger.info(f"Created {len(chunks)} chunks.")
+
+        # 3. Embed and store (stores upsert by chunk ID)
+        if chunks:
+            embeddings = self._embed_documents([chunk.content for chunk in chunks], "ingest.embed")
+            with inst.span("ingest.store", chunks=len(chunks)):
+                self.vector_store.add_documents(chunks, embeddings)
+                self._after_store(chunks)
+            logger.info(f"Stored {len(embeddings)} chunks in vector store.")
+
+        # 4. Update the manifest, then delete chunks that no document lists any more
+        for key, hash_, _ in changed:
+            self.manifest.record(key, hash_, chunk_ids_by_key[key])
+        for key in removed:
+            self.manifest.remove(key)
+        stale_ids = {
+            chunk_id for chunk_id in stale_ids if not self.manifest.is_referenced(chunk_id)
+        }
+        if stale_ids:
+            with inst.span("ingest.delete", chunks=len(stale_ids)):
+                self.vector_store.delete(sorted(stale_ids))
+                self._after_delete(sorted(stale_ids))
+            inst.incr("ingest.chunks_deleted", len(stale_ids))
+            logger.info(f"Deleted {len(stale_ids)} stale chunks.")
+
+        self.manifest.save()
+        self._persist()
+
+    def ingest_stream(
+        self,
+        documents: Iterable[Document],
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        chunk_batch_size: Optional[int] = None,
+    ) -> IngestStats:
+        """Streaming ingestion flow: Chunk -> Embed -> Store in bounded micro-batches.
+
+        Accepts any iterable (e.g. a generator reading from disk) and keeps peak memory
+        flat: chunks are embedded and stored batch by batch instead of all at once.
+        """
+        ingestor = StreamingIngestor(
+            self.chunking_strategy,
+            self.embedding_model,
+            self.vector_store,
+            batch_size=batch_size or self.ingest_batch_size,
+            queue_size=queue_size or self.ingest_queue_size,
+            chunk_batch_size=chunk_batch_size or self.ingest_chunk_batch_size,
+            instrumentation=self.instrumentation,
+            on_stored=self._after_store,
+        )
+        stats = ingestor.run(documents)
+        self._persist()
+        logger.info(
+            f"Streamed {stats.documents} documents as {stats.chunk.items} chunks "
+            f"in {stats.batches} batches ({stats.wall_seconds:.2f}s)."
+        )
+        logger.info(
+            f"Throughput (items/s): chunk={stats.chunk.throughput:.1f} "
+            f"embed={stats.embed.throughput:.1f} store={stats.store.throughput:.1f}"
+        )
+        return stats
+
+    def query(self, query_text: str, k: int = 4, where: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Retrieval flow: [Cache] -> Embed Query -> [Semantic Cache] -> Search Store
+
+        `where` restricts results to documents whose metadata matches the filter
+        (see VectorStore.search).
+        """
+        inst = self.instrumentation
+        with inst.span("query", k=k):
+            inst.incr("query.requests")
+            if self.retrieval_strategy:
+                self._check_no_filter(where)
+            results, _, generation = self._cache_lookup([query_text], k, where)
+            if results[0] is not None:
+                return results[0]
+            # If a specific retrieval strategy is defined (e.g. hybrid or re-ranking), use it;
+            # it was bound to this pipeline's embedding model and vector store.
+            # Otherwise, default to vector store search
+            if self.retrieval_strategy:
+                with inst.span("query.retrieve", k=k):
+                    results = [self.retrieval_strategy.retrieve(query_text, k=k)]
+                self._cache_results([query_text], k, where, results, generation)
+                return results[0]
+
+            # 1. Embed Query
+            with inst.span("query.embed"):
+                query_embedding = self.embedding_model.embed_query(query_text)
+            inst.incr("embedding.calls")
+
+            # 2. Search (unless a near-identical query's results are cached)
+            similar = self._similar_lookup([query_embedding], k, where)
+            if similar[0] is None:
+                with inst.span("query.search", k=k):
+                    results = [self.vector_store.search(query_embedding, k=k, where=where)]
+            else:
+                results = similar
+            self._cache_results([query_text], k, where, results, generation, [query_embedding], similar)
+            return results[0]
+
+    def query_batch(
+        self, query_texts: List[str], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Batched retrieval flow: one embedding call and one store search for all
+        queries (those answered from the query cache are left out of both)."""
+        if not query_texts:
+            return []
+        inst = self.instrumentation
+        with inst.span("query_batch", queries=len(query_texts), k=k):
+            inst.incr("query.requests", len(query_texts))
+            if self.retrieval_strategy:
+                self._check_no_filter(where)
+            results, pending, generation = self._cache_lookup(query_texts, k, where)
+            if not pending:
+                return results
+            texts = [query_texts[i] for i in pending]
+            if self.retrieval_strategy:
+                with inst.span("query.retrieve", k=k):
+                    fresh = self.retrieval_strategy.retrieve_batch(texts, k=k)
+                self._cache_results(texts, k, where, fresh, generation)
+            else:
+                # 1. Embed all queries in a single batch
+                query_embeddings = self._embed_documents(texts, "query.embed")
+
+                # 2. Search the store for the whole batch at once
+                similar = self._similar_lookup(query_embeddings, k, where)
+                fresh = list(similar)
+                unanswered = [i for i, hits in enumerate(similar) if hits is None]
+                if unanswered:
+                    with inst.span("query.search", queries=len(unanswered), k=k):
+                        found = self.vector_store.search_batch(
+                            [query_embeddings[i] for i in unanswered], k=k, where=where
+                        )
+                    for i, hits in zip(unanswered, found):
+                        fresh[i] = hits
+                self._cache_results(texts, k, where, fresh, generation, query_embeddings, similar)
+            for i, hits in zip(pending, fresh):
+                results[i] = hits
+            return results
+
+    def delete(self, ids: List[str]) -> None:
+        """Delete chunks by ID from the vector store (and the retrieval strategy's index)."""
+        if not ids:
+            return
+        with self.instrumentation.span("delete", chunks=len(ids)):
+            self.vector_store.delete(ids)
+            self._after_delete(ids)
+        self._persist()
 
-    def ingest(self, documents: List[Document]):
-        """Full ingestion flow: Chunk -> Embed -> Store"""
-        print(f"Ingesting {len(documents)} documents...")
-        
-        # 1. Chunk
-        chunks = self.chunking_strategy.chunk(documents)
-        print(f"Created {len(chunks)} chunks.")
-        
-        # 2. Embed
-        # Extract text content for embedding
-        texts = [chunk.content for chunk in chunks]
-        embeddings = self.embedding_model.embed_documents(texts)
-        print(f"Generated {len(embeddings)} embeddings.")
-        
-        # 3. Store
-        self.vector_store.add_documents(chunks, embeddings)
-        print("Stored documents in vector store.")
-
-    def query(self, query_text: str, k: int = 4) -> List[Document]:
-        """Retrieval flow: Embed Query -> Search Store"""
-        # 1. Embed Query
-        query_embedding = self.embedding_model.embed_query(query_text)
-        
-        # 2. Search
-        # If a specific retrieval strategy is defined (e.g. for re-ranking), use it
-        # Otherwise, default to vector store search
+    def close(self) -> None:
+        """Release components' resources: worker pools, file handles and store locks."""
+        for component in (self.chunking_strategy, self.embedding_model, self.vector_store):
+            close = getattr(component, "close", None)
+            if close is not None:
+                close()
+
+    def _after_store(self, chunks: List[Document]) -> None:
+        """Keep everything derived from the store in step after chunks were added."""
+        if self.retrieval_strategy:
+            self.retrieval_strategy.index_documents(chunks)
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
+
+    def _after_delete(self, ids: List[str]) -> None:
         if self.retrieval_strategy:
-            # Note: This is a simplification. A real retrieval strategy might need access to the vector store
-            # or might be a wrapper around it. For now, let's assume direct vector store search 
-            # is the default "strategy" if none is provided.
-            return self.retrieval_strategy.retrieve(query_text, k=k)
-        else:
-            return self.vector_store.search(query_embedding, k=k)
+            self.retrieval_strategy.remove_documents(ids)
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
+
+    def _persist(self) -> None:
+        """Save derived indexes once a write operation is complete (with the manifest)."""
+        if self.retrieval_strategy:
+            self.retrieval_strategy.persist()
+
+    def _cache_lookup(
+        self, query_texts: List[str], k: int, where: Optional[Dict[str, Any]]
+    ) -> Tuple[List[Optional[List[Document]]], List[int], int]:
+        """Exact query-cache lookups: (results or None per query, indices of misses, generation)."""
+        cache = self.query_cache
+        if cache is None:
+            return [None] * len(query_texts), list(range(len(query_texts))), 0
+        # Captured before searching so results racing an ingest are not cached
+        generation = cache.generation
+        results = [cache.get(query_text, k, where) for query_text in query_texts]
+        return results, [i for i, hits in enumerate(results) if hits is None], generation
+
+    def _similar_lookup(
+        self, query_embeddings: List[List[float]], k: int, where: Optional[Dict[str, Any]]
+    ) -> List[Optional[List[Document]]]:
+        cache = self.query_cache
+        if cache is None or cache.semantic_threshold is None:
+            return [None] * len(query_embeddings)
+        return [cache.get_similar(embedding, k, where) for embedding in query_embeddings]
+
+    def _cache_results(
+        self,
+        query_texts: List[str],
+        k: int,
+        where: Optional[Dict[str, Any]],
+        results: List[List[Document]],
+        generation: int,
+        query_embeddings: Optional[List[List[float]]] = None,
+        similar: Optional[List[Optional[List[Document]]]] = None,
+    ) -> None:
+        cache = self.query_cache
+        if cache is None:
+            return
+        for i, (query_text, hits) in enumerate(zip(query_texts, results)):
+            # Results borrowed from a similar query are not offered to further similar queries
+            embedding = None
+            if query_embeddings is not None and (similar is None or similar[i] is None):
+                embedding = query_embeddings[i]
+            cache.put(query_text, k, where, hits, generation, embedding=embedding)
+
+    @staticmethod
+    def _check_no_filter(where: Optional[Dict[str, Any]]) -> None:
+        if where:
+            raise ValueError("Metadata filters are not supported with a custom retrieval strategy")
+
+    def _embed_documents(self, texts: List[str], span: str) -> List[List[float]]:
+        inst = self.instrumentation
+        with inst.span(span, texts=len(texts)):
+            embeddings = self.embedding_model.embed_documents(texts)
+        if inst.enabled:
+            inst.incr("embedding.calls")
+            inst.incr("embedding.texts", len(texts))
+            inst.incr("embedding.tokens", sum(estimate_tokens(text) for text in texts))
+        return embeddings
+
+    async def aingest(self, documents: List[Document], prune: bool = False):
+        """Async `ingest`: chunking and storing run in worker threads, embedding uses the
+        model's async API (native for OpenAI). Incremental ingest runs `ingest` in a thread."""
+        if self.manifest is not None:
+            await asyncio.to_thread(self.ingest, documents, prune)
+            return
+        if prune:
+            raise ValueError("prune=True requires a pipeline configured with an ingestion manifest.")
+        inst = self.instrumentation
+        inst.incr("ingest.documents", len(documents))
+        with inst.span("ingest.chunk", documents=len(documents)):
+            chunks = await asyncio.to_thread(self.chunking_strategy.chunk, documents)
+        inst.incr("ingest.chunks", len(chunks))
+        if not chunks:
+            return
+        embeddings = await self._aembed_documents([chunk.content for chunk in chunks], "ingest.embed")
+        with inst.span("ingest.store", chunks=len(chunks)):
+            await self.vector_store.aadd_documents(chunks, embeddings)
+            await asyncio.to_thread(self._after_store, chunks)
+        logger.info(f"Stored {len(chunks)} chunks from {len(documents)} documents.")
+        await asyncio.to_thread(self._persist)
+
+    async def aquery(self, query_text: str, k: int = 4, where: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Async `query`, for serving many concurrent requests from one event loop.
+
+        At most `max_concurrent_queries` run at once (the rest wait their turn), and
+        with coalescing enabled, concurrent queries for the same text share one
+        query embedding call.
+        """
+        inst = self.instrumentation
+        async with self.query_limiter:
+            with inst.span("query", k=k):
+                inst.incr("query.requests")
+                if self.retrieval_strategy:
+                    self._check_no_filter(where)
+                results, _, generation = self._cache_lookup([query_text], k, where)
+                if results[0] is not None:
+                    return results[0]
+                if self.retrieval_strategy:
+                    with inst.span("query.retrieve", k=k):
+                        results = [await self.retrieval_strategy.aretrieve(query_text, k=k)]
+                    self._cache_results([query_text], k, where, results, generation)
+                    return results[0]
+
+                with inst.span("query.embed"):
+                    query_embedding = await self._aembed_query(query_text)
+                similar = self._similar_lookup([query_embedding], k, where)
+                if similar[0] is None:
+                    with inst.span("query.search", k=k):
+                        results = [await self.vector_store.asearch(query_embedding, k=k, where=where)]
+                else:
+                    results = similar
+                self._cache_results([query_text], k, where, results, generation, [query_embedding], similar)
+                return results[0]
+
+    async def aquery_batch(
+        self, query_texts: List[str], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """Async `query_batch`: one embedding call and one store search for all uncached queries."""
+        if not query_texts:
+            return []
+        inst = self.instrumentation
+        async with self.query_limiter:
+            with inst.span("query_batch", queries=len(query_texts), k=k):
+                inst.incr("query.requests", len(query_texts))
+                if self.retrieval_strategy:
+                    self._check_no_filter(where)
+                results, pending, generation = self._cache_lookup(query_texts, k, where)
+                if not pending:
+                    return results
+                texts = [query_texts[i] for i in pending]
+                if self.retrieval_strategy:
+                    with inst.span("query.retrieve", k=k):
+                        fresh = await self.retrieval_strategy.aretrieve_batch(texts, k=k)
+                    self._cache_results(texts, k, where, fresh, generation)
+                else:
+                    query_embeddings = await self._aembed_documents(texts, "query.embed")
+                    similar = self._similar_lookup(query_embeddings, k, where)
+                    fresh = list(similar)
+                    unanswered = [i for i, hits in enumerate(similar) if hits is None]
+                    if unanswered:
+                        with inst.span("query.search", queries=len(unanswered), k=k):
+                            found = await self.vector_store.asearch_batch(
+                                [query_embeddings[i] for i in unanswered], k=k, where=where
+                            )
+                        for i, hits in zip(unanswered, found):
+                            fresh[i] = hits
+                    self._cache_results(texts, k, where, fresh, generation, query_embeddings, similar)
+                for i, hits in zip(pending, fresh):
+                    results[i] = hits
+                return results
+
+    async def _aembed_query(self, query_text: str) -> List[float]:
+        inst = self.instrumentation
+        if self.coalescer is None:
+            inst.incr("embedding.calls")
+            return await self.embedding_model.aembed_query(query_text)
+
+        def call():
+            inst.incr("embedding.calls")
+            return self.embedding_model.aembed_query(query_text)
+
+        return await self.coalescer.run(query_text, call, on_coalesced=lambda: inst.incr("query.coalesced"))
+
+    async def _aembed_documents(self, texts: List[str], span: str) -> List[List[float]]:
+        inst = self.instrumentation
+        with inst.span(span, texts=len(texts)):
+            embeddings = await self.embedding_model.aembed_documents(texts)
+        if inst.enabled:
+            inst.incr("embedding.calls")
+            inst.incr("embedding.texts", len(texts))
+            inst.incr("embedding.tokens", sum(estimate_tokens(text) for text in texts))
+        return embeddings
+
+    async def agenerate(self, query_text: str) -> str:
+        """Async `generate`: retrieve with `aquery`, then generate off the event loop."""
+        if not self.generation_model:
+            raise ValueError("No generation model configured for this pipeline.")
+        context_docs = await self.aquery(query_text)
+        return await self.generation_model.agenerate(query_text, context_docs)
 
     def generate(self, query_text: str) -> str:
         """Full RAG flow: Retrieve -> Generate"""
@@ -0,0 +1,76 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+# Manifest keys are the chunkers' document keys, so chunk IDs derive from them
+from rag_workbench.strategies.chunking.strategies import content_hash, document_key
+
+class IngestionManifest:
+    """Tracks what has been ingested: document key -> content hash and chunk IDs.
+
+    Lets incremental ingestion skip unchanged documents and find the stale chunks of
+    changed or removed ones. With a `path`, the manifest is loaded from and saved to a
+    JSON file (written atomically); without one it lives only in memory. It should be
+    persisted alongside the vector store it describes.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        # chunk ID -> number of entries listing it
+        self._refs: Dict[str, int] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            for entry in self._entries.values():
+                self._ref(entry["chunk_ids"], 1)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def get_hash(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry["hash"] if entry else None
+
+    def get_chunk_ids(self, key: str) -> List[str]:
+        entry = self._entries.get(key)
+        return list(entry["chunk_ids"]) if entry else []
+
+    def is_referenced(self, chunk_id: str) -> bool:
+        """Whether any entry still lists `chunk_id`."""
+        return chunk_id in self._refs
+
+    def record(self, key: str, hash_: str, chunk_ids: Iterable[str]) -> None:
+        self.remove(key)
+        entry = {"hash": hash_, "chunk_ids": list(chunk_ids)}
+        self._entries[key] = entry
+        self._ref(entry["chunk_ids"], 1)
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._ref(entry["chunk_ids"], -1)
+
+    def _ref(self, chunk_ids: Iterable[str], delta: int) -> None:
+        for chunk_id in chunk_ids:
+            count = self._refs.get(chunk_id, 0) + delta
+            if count > 0:
+                self._refs[chunk_id] = count
+            else:
+                self._refs.pop(chunk_id, None)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,218 @@
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+from rag_workbench.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from rag_workbench.core.interfaces import Document
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def normalize_query(text: str) -> str:
+    """Cache key form of a query: Unicode NFKC, case-folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+def _filter_key(where: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(where, sort_keys=True, default=str) if where else ""
+
+@dataclass
+class _Entry:
+    results: List[Document]
+    expires: float
+    # Semantic layer only: what the entry can answer
+    k: int = 0
+    where: str = ""
+
+class QueryCache:
+    """Two-layer cache of query results, invalidated whenever the store changes.
+
+    The exact layer maps (normalized query text, k, filter) to results. The
+    optional semantic layer (`semantic_threshold` set) keeps the embeddings of
+    recently searched queries; a query whose embedding has cosine similarity of
+    at least the threshold with a cached one (same filter, cached k >= k) reuses
+    its results and skips the search. The semantic layer only serves the
+    pipeline's default vector retrieval: a custom retrieval strategy embeds
+    queries itself, so it uses the exact layer alone. Both layers evict least
+    recently used entries beyond their size and, with `ttl_seconds`, entries
+    older than that.
+
+    `invalidate()` (called by the pipeline after every ingest or delete) empties
+    the cache and bumps `generation`. Callers capture the generation before
+    computing results and pass it to `put`, so a query that raced a write cannot
+    store results from before it.
+    """
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = None,
+        semantic_threshold: Optional[float] = None,
+        semantic_max_entries: int = 1024,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        if max_entries <= 0 or semantic_max_entries <= 0:
+            raise ValueError("max_entries and semantic_max_entries must be positive")
+        if semantic_threshold is not None:
+            if not 0.0 < semantic_threshold <= 1.0:
+                raise ValueError("semantic_threshold must be in (0, 1]")
+            if np is None:
+                raise ImportError("NumPy is not installed. Please install it with `pip install numpy`.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.semantic_max_entries = semantic_max_entries
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.generation = 0
+        self._exact: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # Semantic layer: one normalized embedding per slot, slots kept in LRU order
+        self._vectors = None
+        self._slots: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.semantic_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @property
+    def misses(self) -> int:
+        return self.lookups - self.hits - self.semantic_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from either layer."""
+        return (self.hits + self.semantic_hits) / self.lookups if self.lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._exact),
+            "semantic_entries": len(self._slots),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "generation": self.generation,
+        }
+
+    def get(self, query: str, k: int, where: Optional[Dict[str, Any]] = None) -> Optional[List[Document]]:
+        """Exact-layer lookup; counts as a lookup for the hit-rate metrics."""
+        key = (normalize_query(query), k, _filter_key(where))
+        now = time.monotonic()
+        with self._lock:
+            self.lookups += 1
+            entry = self._exact.get(key)
+            if entry is not None and entry.expires < now:
+                del self._exact[key]
+                entry = None
+            if entry is not None:
+                self._exact.move_to_end(key)
+                self.hits += 1
+        self.instrumentation.incr("query_cache.lookups")
+        if entry is None:
+            return None
+        self.instrumentation.incr("query_cache.hits")
+        return list(entry.results)
+
+    def get_similar(
+        self, embedding: List[float], k: int, where: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Document]]:
+        """Semantic-layer lookup for a query that missed the exact layer."""
+        if self.semantic_threshold is None or not self._slots:
+            return None
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+        where_key = _filter_key(where)
+        now = time.monotonic()
+        with self._lock:
+            if self._vectors is None or len(query) != self._vectors.shape[1]:
+                return None
+            scores = self._vectors @ query
+            # Best first among the slots above the threshold; freed slots are zero rows
+            candidates = np.flatnonzero(scores >= self.semantic_threshold)
+            entry = None
+            for slot in candidates[np.argsort(-scores[candidates])]:
+                candidate = self._slots.get(int(slot))
+                if candidate is None:
+                    continue
+                if candidate.expires < now:
+                    self._release(int(slot))
+                    continue
+                if candidate.k >= k and candidate.where == where_key:
+                    self._slots.move_to_end(int(slot))
+                    entry = candidate
+                    break
+            if entry is None:
+                return None
+            self.semantic_hits += 1
+        self.instrumentation.incr("query_cache.semantic_hits")
+        return entry.results[:k]
+
+    def put(
+        self,
+        query: str,
+        k: int,
+        where: Optional[Dict[str, Any]],
+        results: List[Document],
+        generation: int,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """Cache results computed while the cache was at `generation`.
+
+        Pass the query `embedding` to also make the results reusable by similar
+        queries; leave it out for results that themselves came from a semantic hit.
+        """
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        key = (normalize_query(query), k, _filter_key(where))
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._exact[key] = _Entry(list(results), expires)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+            if self.semantic_threshold is not None and embedding is not None:
+                self._put_similar(embedding, _Entry(list(results), expires, k, key[2]))
+
+    def _put_similar(self, embedding: List[float], entry: _Entry) -> None:
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._vectors is None or len(vector) != self._vectors.shape[1]:
+            self._vectors = np.zeros((self.semantic_max_entries, len(vector)), dtype=np.float32)
+            self._slots.clear()
+            self._free = list(range(self.semantic_max_entries - 1, -1, -1))
+        if not self._free:
+            self._release(next(iter(self._slots)))
+        slot = self._free.pop()
+        self._vectors[slot] = vector
+        self._slots[slot] = entry
+
+    def _release(self, slot: int) -> None:
+        del self._slots[slot]
+        self._vectors[slot] = 0.0
+        self._free.append(slot)
+
+    @staticmethod
+    def _normalize(embedding: List[float]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    def invalidate(self) -> None:
+        """Drop every entry and start a new generation (the store has changed)."""
+        with self._lock:
+            self.generation += 1
+            self._exact.clear()
+            if self._vectors is not None:
+                self._vectors[:] = 0.0
+                self._slots.clear()
+                self._free = list(range(self.semantic_max_entries - 1, -1, -1))
+        self.instrumentation.incr("query_cache.invalidations")
@@ -0,0 +1,206 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from rag_workbench.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from rag_workbench.strategies.embedding.executor import estimate_tokens
+from rag_workbench.core.interfaces import (
+    ChunkingStrategy,
+    EmbeddingModel,
+    VectorStore,
+    Document
+)
+
+# Marks the end of the stream on a stage queue
+_DONE = object()
+
+def _groups(documents: Iterable[Document], size: int) -> Iterator[List[Document]]:
+    group: List[Document] = []
+    for doc in documents:
+        group.append(doc)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of time spent inside the stage."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+@dataclass
+class IngestStats:
+    documents: int = 0
+    batches: int = 0
+    wall_seconds: float = 0.0
+    chunk: StageStats = field(default_factory=StageStats)
+    embed: StageStats = field(default_factory=StageStats)
+    store: StageStats = field(default_factory=StageStats)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "documents": self.documents,
+            "chunks": self.chunk.items,
+            "batches": self.batches,
+            "wall_seconds": self.wall_seconds,
+            "chunk_per_sec": self.chunk.throughput,
+            "embed_per_sec": self.embed.throughput,
+            "store_per_sec": self.store.throughput,
+        }
+
+class StreamingIngestor:
+    """Pipes documents through chunk -> embed -> store in micro-batches.
+
+    Each stage runs in its own thread and hands batches to the next one through a
+    bounded queue, so at most about (2 * queue_size + 3) * batch_size chunks (plus
+    one group of `chunk_batch_size` documents being chunked) are held in memory
+    regardless of corpus size, and chunks are stored as soon as their batch has
+    been embedded. Documents are chunked `chunk_batch_size` (default: batch_size)
+    at a time, so a parallel chunker gets groups large enough to use its pool.
+    """
+    def __init__(
+        self,
+        chunking_strategy: ChunkingStrategy,
+        embedding_model: EmbeddingModel,
+        vector_store: VectorStore,
+        batch_size: int = 64,
+        queue_size: int = 4,
+        chunk_batch_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        on_stored: Optional[Callable[[List[Document]], None]] = None,
+    ):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        if chunk_batch_size is not None and chunk_batch_size <= 0:
+            raise ValueError("chunk_batch_size must be positive")
+        self.chunking_strategy = chunking_strategy
+        self.embedding_model = embedding_model
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.chunk_batch_size = chunk_batch_size or batch_size
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        # Called with each batch once it is in the store (e.g. to update a BM25
+        # index or invalidate cached query results)
+        self.on_stored = on_stored
+
+    def run(self, documents: Iterable[Document]) -> IngestStats:
+        stats = IngestStats()
+        inst = self.instrumentation
+        embed_queue = queue.Queue(maxsize=self.queue_size)
+        store_queue = queue.Queue(maxsize=self.queue_size)
+        failed = threading.Event()
+        errors: List[BaseException] = []
+
+        def fail(exc: BaseException):
+            errors.append(exc)
+            failed.set()
+
+        def put(q: queue.Queue, item) -> bool:
+            # Poll so a failure downstream can't leave the producer blocked on a full queue
+            while not failed.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def finish(q: queue.Queue, consumer: threading.Thread):
+            # The end-of-stream marker must always reach a live consumer, even after a failure
+            while consumer.is_alive():
+                try:
+                    q.put(_DONE, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def embed_worker():
+            try:
+                while True:
+                    batch = embed_queue.get()
+                    if batch is _DONE or failed.is_set():
+                        break
+                    start = time.perf_counter()
+                    with inst.span("ingest.embed", texts=len(batch)):
+                        embeddings = self.embedding_model.embed_documents([chunk.content for chunk in batch])
+                    stats.embed.seconds += time.perf_counter() - start
+                    stats.embed.items += len(batch)
+                    if inst.enabled:
+                        inst.incr("embedding.calls")
+                        inst.incr("embedding.texts", len(batch))
+                        inst.incr("embedding.tokens", sum(estimate_tokens(chunk.content) for chunk in batch))
+                    if not put(store_queue, (batch, embeddings)):
+                        break
+            except BaseException as exc:
+                fail(exc)
+            finally:
+                finish(store_queue, store_thread)
+
+        def store_worker():
+            try:
+                while True:
+                    item = store_queue.get()
+                    if item is _DONE or failed.is_set():
+                        break
+                    batch, embeddings = item
+                    start = time.perf_counter()
+                    with inst.span("ingest.store", chunks=len(batch)):
+                        self.vector_store.add_documents(batch, embeddings)
+                        if self.on_stored is not None:
+                            self.on_stored(batch)
+                    stats.store.seconds += time.perf_counter() - start
+                    stats.store.items += len(batch)
+            except BaseException as exc:
+                fail(exc)
+
+        embed_thread = threading.Thread(target=embed_worker, name="ingest-embed", daemon=True)
+        store_thread = threading.Thread(target=store_worker, name="ingest-store", daemon=True)
+        workers = [embed_thread, store_thread]
+        wall_start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        # Chunking runs on the calling thread so the input iterator is consumed where it was created
+        try:
+            pending: List[Document] = []
+            for group in _groups(documents, self.chunk_batch_size):
+                if failed.is_set():
+                    break
+                start = time.perf_counter()
+                with inst.span("ingest.chunk", documents=len(group)):
+                    chunks = self.chunking_strategy.chunk(group)
+                stats.chunk.seconds += time.perf_counter() - start
+                inst.incr("ingest.documents", len(group))
+                inst.incr("ingest.chunks", len(chunks))
+                stats.chunk.items += len(chunks)
+                stats.documents += len(group)
+                pending.extend(chunks)
+                while len(pending) >= self.batch_size:
+                    batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                    stats.batches += 1
+                    if not put(embed_queue, batch):
+                        break
+            if pending and not failed.is_set():
+                stats.batches += 1
+                put(embed_queue, pending)
+        except BaseException as exc:
+            fail(exc)
+        finally:
+            finish(embed_queue, embed_thread)
+            for worker in workers:
+                worker.join()
+
+        stats.wall_seconds = time.perf_counter() - wall_start
+        if errors:
+            raise errors[0]
+        return stats
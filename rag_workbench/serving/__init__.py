@@ -0,0 +1,2 @@
+from .batcher import MicroBatcher, BatcherStats
+from .server import QueryServer, serve_stdio
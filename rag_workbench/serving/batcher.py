@@ -0,0 +1,161 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from rag_workbench.config.settings import ServingConfig
+from rag_workbench.core.interfaces import Document
+from rag_workbench.pipeline.manager import RAGPipeline
+
+@dataclass
+class _Request:
+    query: str
+    k: int
+    where: Optional[Dict[str, Any]]
+    future: "asyncio.Future[List[Document]]"
+
+@dataclass
+class BatcherStats:
+    requests: int = 0
+    batches: int = 0
+    # Batch size -> number of batches of that size
+    sizes: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+class MicroBatcher:
+    """Collects concurrent queries into micro-batches served by one embed + one search.
+
+    A batch opens with the first waiting request and takes everything already
+    queued. If no other batch is executing, it then runs at once: requests that
+    arrive meanwhile queue up for the next batch, so batches grow with load without
+    any wait. Otherwise it keeps collecting until `max_wait_ms` passes or
+    `max_batch_size` requests have joined. It runs as a single
+    `RAGPipeline.aquery_batch` call (one embedding call, one matrix-matrix search)
+    and each caller gets its own slice of the results. Requests are grouped by
+    `where` filter; each batch searches with its largest k.
+    """
+    def __init__(
+        self,
+        pipeline: RAGPipeline,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 3.0,
+        max_concurrent_batches: int = 1,
+    ):
+        if max_batch_size <= 0 or max_concurrent_batches <= 0:
+            raise ValueError("max_batch_size and max_concurrent_batches must be positive")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_batches = max_concurrent_batches
+        self.stats = BatcherStats()
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._workers: List[asyncio.Task] = []
+        # Batches currently executing
+        self._running = 0
+
+    @classmethod
+    def from_config(cls, pipeline: RAGPipeline, config: ServingConfig) -> "MicroBatcher":
+        return cls(
+            pipeline,
+            max_batch_size=config.max_batch_size,
+            max_wait_ms=config.max_batch_wait_ms,
+            max_concurrent_batches=config.max_concurrent_batches,
+        )
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_batches)]
+
+    async def stop(self) -> None:
+        if self._queue is None:
+            return
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    async def __aenter__(self) -> "MicroBatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def query(self, query: str, k: int = 4, where: Optional[Dict[str, Any]] = None) -> List[Document]:
+        if not self._workers:
+            raise RuntimeError("MicroBatcher is not running; call start() or use it as an async context manager")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Request(query, k, where, future))
+        return await future
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    # Take whatever is already queued without waiting, then wait out the window
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    # Nothing else is executing, so waiting would only add latency
+                    if self._running == 0:
+                        break
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                self._running += 1
+                try:
+                    await self._run(batch)
+                finally:
+                    self._running -= 1
+            except asyncio.CancelledError:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(RuntimeError("MicroBatcher stopped"))
+                raise
+
+    async def _run(self, batch: List[_Request]) -> None:
+        self.stats.requests += len(batch)
+        self.stats.batches += 1
+        self.stats.sizes[len(batch)] = self.stats.sizes.get(len(batch), 0) + 1
+        self.pipeline.instrumentation.incr("serve.batches")
+
+        groups: Dict[str, List[_Request]] = {}
+        for request in batch:
+            if request.future.done():
+                # Caller went away (e.g. cancelled) while queued
+                continue
+            key = json.dumps(request.where, sort_keys=True, default=str) if request.where else ""
+            groups.setdefault(key, []).append(request)
+
+        for requests in groups.values():
+            # Identical queries in a batch are embedded and searched once
+            texts = list(dict.fromkeys(request.query for request in requests))
+            k = max(request.k for request in requests)
+            try:
+                results = await self.pipeline.aquery_batch(texts, k=k, where=requests[0].where)
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+            by_text = dict(zip(texts, results))
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_result(by_text[request.query][:request.k])
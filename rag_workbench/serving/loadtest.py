@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+from typing import Dict, List
+from rag_workbench.config.settings import (
+    PipelineConfig,
+    EmbeddingConfig,
+    VectorStoreConfig,
+    ServingConfig,
+    EmbeddingModelType,
+    VectorStoreType
+)
+from rag_workbench.core.interfaces import EmbeddingModel
+from rag_workbench.pipeline.builder import PipelineBuilder
+from rag_workbench.pipeline.manager import RAGPipeline
+from rag_workbench.bench.corpus import generate_corpus, generate_queries
+from rag_workbench.bench.harness import percentiles
+from rag_workbench.serving.batcher import BatcherStats, MicroBatcher
+from rag_workbench.serving.server import QueryServer
+
+class DelayedEmbeddingModel(EmbeddingModel):
+    """Adds a fixed latency to every embedding call, simulating a remote API's round trip."""
+    def __init__(self, model: EmbeddingModel, latency_ms: float):
+        self.model = model
+        self.latency = latency_ms / 1000.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self.model.embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        return await self.model.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency)
+        return await self.model.aembed_query(text)
+
+def build_load_test_pipeline(num_documents: int, dimension: int, embed_latency_ms: float = 0.0) -> RAGPipeline:
+    """A NumPy-store pipeline over a synthetic corpus, embedded with the mock embedder."""
+    config = PipelineConfig(
+        embedding=EmbeddingConfig(model_type=EmbeddingModelType.MOCK, dimension=dimension),
+        vector_store=VectorStoreConfig(store_type=VectorStoreType.NUMPY),
+        # The batcher is the only client; don't let the pipeline's own limit throttle batches
+        serving=ServingConfig(max_concurrent_queries=None)
+    )
+    pipeline = PipelineBuilder.build(config)
+    pipeline.ingest_stream(iter(generate_corpus(num_documents, seed=0)))
+    if embed_latency_ms:
+        pipeline.embedding_model = DelayedEmbeddingModel(pipeline.embedding_model, embed_latency_ms)
+    return pipeline
+
+async def _client(host: str, port: int, queries: List[str], k: int, latencies: List[float], errors: List[str]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for query in queries:
+            body = json.dumps({"query": query, "k": k}).encode("utf-8")
+            start = time.perf_counter()
+            writer.write(
+                b"POST /query HTTP/1.1\r\nHost: loadtest\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            response = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != b"200":
+                errors.append(response.decode("utf-8", "replace"))
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, num_requests: int, concurrency: int, k: int = 4, seed: int = 0) -> Dict[str, float]:
+    """Send `num_requests` queries over `concurrency` keep-alive connections."""
+    queries = generate_queries(num_requests, seed=seed)
+    per_client = [queries[i::concurrency] for i in range(concurrency)]
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, part, k, latencies, errors) for part in per_client if part))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "qps": len(latencies) / elapsed,
+        **percentiles(latencies),
+    }
+
+async def compare_batching(
+    pipeline: RAGPipeline,
+    num_requests: int = 2000,
+    concurrency: int = 64,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 3.0,
+    k: int = 4,
+) -> Dict[str, Dict[str, float]]:
+    """Load-test an in-process server per-request and micro-batched.
+
+    Per-request mode still runs up to `concurrency` requests at once, each with its
+    own embed and search call, like a plain async server calling `aquery`.
+    """
+    modes = {
+        "per_request": MicroBatcher(pipeline, max_batch_size=1, max_wait_ms=0, max_concurrent_batches=concurrency),
+        "micro_batched": MicroBatcher(pipeline, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms),
+    }
+    results = {}
+    for name, batcher in modes.items():
+        server = QueryServer(batcher, port=0)
+        host, port = await server.start()
+        try:
+            # Warm-up round so both modes are measured in steady state
+            await run_load(host, port, min(concurrency, num_requests), concurrency, k=k, seed=1)
+            batcher.stats = BatcherStats()
+            results[name] = await run_load(host, port, num_requests, concurrency, k=k)
+            results[name]["mean_batch_size"] = batcher.stats.mean_batch_size
+        finally:
+            await server.close()
+    return results
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+from rag_workbench.core.interfaces import Document
+from rag_workbench.serving.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+# Largest request body accepted, in bytes
+_MAX_BODY = 1 << 20
+
+def document_to_json(doc: Document) -> Dict[str, Any]:
+    return {"id": doc.id, "content": doc.content, "metadata": doc.metadata}
+
+def _parse_query(payload: Any, default_k: int) -> Tuple[str, int, Optional[Dict[str, Any]]]:
+    if not isinstance(payload, dict) or not isinstance(payload.get("query"), str):
+        raise ValueError('Expected a JSON object with a string "query"')
+    k = payload.get("k", default_k)
+    if not isinstance(k, int) or k <= 0:
+        raise ValueError('"k" must be a positive integer')
+    where = payload.get("where")
+    if where is not None and not isinstance(where, dict):
+        raise ValueError('"where" must be a JSON object')
+    return payload["query"], k, where
+
+class QueryServer:
+    """Minimal HTTP/1.1 JSON server in front of a MicroBatcher (stdlib asyncio only).
+
+    Endpoints:
+      POST /query    {"query": "...", "k": 4, "where": {...}} -> {"results": [...]}
+      GET  /health   liveness check
+      GET  /stats    micro-batching (and query cache) statistics
+      GET  /metrics  Prometheus text (when the pipeline records metrics)
+
+    Connections are kept alive, so a client can send many requests on one socket.
+    """
+    def __init__(self, batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8000, default_k: int = 4):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.default_k = default_k
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening and return the bound (host, port); port 0 picks a free one."""
+        await self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        logger.info(f"Serving on http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Malformed Content-Length"}, keep_alive=False)
+                    break
+                if length > _MAX_BODY:
+                    await self._respond(writer, 400, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload = await self._route(method, path, body)
+                await self._respond(writer, status, payload, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/query":
+            if method != "POST":
+                return 405, {"error": "Use POST /query"}
+            try:
+                query, k, where = _parse_query(json.loads(body or b"null"), self.default_k)
+                results = await self.batcher.query(query, k=k, where=where)
+            except (ValueError, TypeError) as e:
+                return 400, {"error": str(e)}
+            except Exception as e:
+                logger.exception("Query failed")
+                return 500, {"error": str(e)}
+            return 200, {"results": [document_to_json(doc) for doc in results]}
+        if method != "GET":
+            return 405, {"error": f"Use GET {path}"}
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            stats = self.batcher.stats
+            payload = {"requests": stats.requests, "batches": stats.batches, "mean_batch_size": stats.mean_batch_size}
+            query_cache = self.batcher.pipeline.query_cache
+            if query_cache is not None:
+                payload["query_cache"] = query_cache.stats()
+            return 200, payload
+        if path == "/metrics":
+            metrics = self.batcher.pipeline.metrics
+            if metrics is None:
+                return 404, {"error": "Instrumentation is not enabled"}
+            return 200, metrics.to_prometheus()
+        return 404, {"error": f"Unknown path {path}"}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+async def serve_stdio(batcher: MicroBatcher, default_k: int = 4) -> None:
+    """Serve JSON lines on stdin/stdout: {"id": ..., "query": ...} -> {"id": ..., "results": [...]}.
+
+    Requests are handled concurrently (and so batched together); responses are
+    written as they complete and carry the request's "id" to match them up.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=_MAX_BODY)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    pending: List[asyncio.Task] = []
+
+    def write(response: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    async def answer(line: bytes) -> None:
+        request_id = None
+        try:
+            payload = json.loads(line)
+            if isinstance(payload, dict):
+                request_id = payload.get("id")
+            query, k, where = _parse_query(payload, default_k)
+            results = await batcher.query(query, k=k, where=where)
+            write({"id": request_id, "results": [document_to_json(doc) for doc in results]})
+        except Exception as e:
+            write({"id": request_id, "error": str(e)})
+
+    async with batcher:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                pending.append(asyncio.create_task(answer(line)))
+                pending = [task for task in pending if not task.done()]
+        await asyncio.gather(*pending)
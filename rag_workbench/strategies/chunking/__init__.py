@@ -1 +1,3 @@
-from .strategies import FixedSizeChunker, RecursiveCharacterChunker
+from .strategies import FixedSizeChunker, RecursiveCharacterChunker, TokenChunker
+from .parallel import ParallelChunker
+from .tokenizers import Tokenizer, SimpleTokenizer, TiktokenTokenizer, CachedTokenizer, get_tokenizer
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+from rag_workbench.core.interfaces import ChunkingStrategy, Document
+
+class ParallelChunker(ChunkingStrategy):
+    """Runs another chunker across a process pool.
+
+    Documents are cut into contiguous shards of roughly equal total text size, so
+    workers get similar amounts of text, and shard results are concatenated in
+    input order, so output (including per-document chunk_index, parent_id and
+    chunk IDs) is identical to running the wrapped chunker directly. A document is
+    never split across shards: a single huge document is chunked by one worker.
+    Inputs below the size thresholds are chunked in-process, where pool overhead
+    would dominate. The pool is created lazily and reused; call `close` (or close the
+    pipeline) to stop it. Workers are spawned rather than forked, since forking a
+    process that runs ingest and serving threads can copy held locks into the child.
+    """
+    def __init__(
+        self,
+        chunker: ChunkingStrategy,
+        num_workers: Optional[int] = None,
+        min_documents: int = 64,
+        min_characters: int = 1_000_000,
+        shards_per_worker: int = 4,
+    ):
+        self.chunker = chunker
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.min_documents = min_documents
+        self.min_characters = min_characters
+        self.shards_per_worker = shards_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def chunk(self, documents: List[Document]) -> List[Document]:
+        return self._run(self.chunker.chunk, documents)
+
+    def chunk_each(self, documents: List[Document]) -> List[List[Document]]:
+        return self._run(self.chunker.chunk_each, documents)
+
+    def _run(self, method: Callable[[List[Document]], list], documents: List[Document]) -> list:
+        """Apply a list-returning chunker method to shards in the pool, results concatenated."""
+        total_chars = sum(len(doc.content) for doc in documents)
+        if (
+            self.num_workers <= 1
+            or len(documents) < self.min_documents
+            or total_chars < self.min_characters
+        ):
+            return method(documents)
+
+        shards = self._make_shards(documents, total_chars)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        results = []
+        # map() yields shard results in submission order, keeping output deterministic
+        for shard_results in self._pool.map(method, shards):
+            results.extend(shard_results)
+        return results
+
+    def _make_shards(self, documents: List[Document], total_chars: int) -> List[List[Document]]:
+        num_shards = min(len(documents), self.num_workers * self.shards_per_worker)
+        target = total_chars / num_shards
+        shards = []
+        current: List[Document] = []
+        current_chars = 0
+        for doc in documents:
+            current.append(doc)
+            current_chars += len(doc.content)
+            if current_chars >= target:
+                shards.append(current)
+                current, current_chars = [], 0
+        if current:
+            shards.append(current)
+        return shards
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __getstate__(self):
+        # The pool itself can't be pickled; a copy starts without one
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
@@ -1,6 +1,34 @@
-from typing import List, Optional
-import uuid
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import List, Optional, Tuple
+import hashlib
+import json
 from rag_workbench.core.interfaces import ChunkingStrategy, Document
+from rag_workbench.strategies.chunking.tokenizers import Tokenizer, get_tokenizer
+
+def content_hash(doc: Document) -> str:
+    """Hash of everything that ends up in the document's chunks (content and metadata)."""
+    payload = json.dumps(
+        {"content": doc.content, "metadata": doc.metadata},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def document_key(doc: Document) -> str:
+    """Stable key for a source document: its ID, or its content hash if it has none."""
+    return doc.id if doc.id is not None else f"sha256:{content_hash(doc)}"
+
+def make_chunk_id(parent_key: str, chunk_index: int, text: str) -> str:
+    """Deterministic, content-derived chunk ID.
+
+    Re-chunking the same document yields the same IDs, so stores can upsert instead
+    of duplicating and unchanged chunks are recognised across ingests. `parent_key`
+    is the document's `document_key`, so chunks of different documents never share
+    an ID, even without document IDs.
+    """
+    key = f"{parent_key}\0{chunk_index}\0{text}".encode("utf-8")
+    return hashlib.sha256(key).hexdigest()[:32]
 
 class FixedSizeChunker(ChunkingStrategy):
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
@@ -14,16 +42,19 @@ class FixedSizeChunker(ChunkingStrategy):
             if not text:
                 continue
             
+            parent_key = document_key(doc)
             start = 0
+            chunk_index = 0
             while start < len(text):
                 end = min(start + self.chunk_size, len(text))
                 chunk_text = text[start:end]
                 
                 # Create new document for chunk
-                new_id = str(uuid.uuid4())
+                new_id = make_chunk_id(parent_key, chunk_index, chunk_text)
                 metadata = doc.metadata.copy()
-                metadata["chunk_index"] = len(chunked_docs)
+                metadata["chunk_index"] = chunk_index
                 metadata["parent_id"] = doc.id
+                chunk_index += 1
                 
                 chunked_docs.append(Document(content=chunk_text, metadata=metadata, id=new_id))
                 
@@ -32,20 +63,31 @@ class FixedSizeChunker(ChunkingStrategy):
         return chunked_docs
 
 class RecursiveCharacterChunker(ChunkingStrategy):
+    """Splits on the coarsest separator present, recursing into pieces that are still too big.
+
+    Pieces are tracked as offsets into the document and merged with binary searches,
+    so each chunk is built as a single slice of the original text. Adjacent pieces are
+    merged up to `chunk_size`, consecutive chunks share up to `chunk_overlap`
+    characters of trailing pieces, and a piece with no separator left is cut into
+    fixed windows, so no chunk exceeds `chunk_size`. Runs in time linear in the text
+    length per separator level.
+    """
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, separators: Optional[List[str]] = None):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be non-negative and smaller than chunk_size")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.separators = separators or ["\n\n", "\n", " ", ""]
 
     def chunk(self, documents: List[Document]) -> List[Document]:
-        # Simple implementation of recursive splitting
-        # For a production-grade version, we might want to wrap LangChain's splitter
-        # But here is a lightweight version to keep it dependency-free for now
         chunked_docs = []
         for doc in documents:
             chunks = self._split_text(doc.content, self.separators)
+            parent_key = document_key(doc)
             for i, chunk_text in enumerate(chunks):
-                 new_id = str(uuid.uuid4())
+                 new_id = make_chunk_id(parent_key, i, chunk_text)
                  metadata = doc.metadata.copy()
                  metadata["chunk_index"] = i
                  metadata["parent_id"] = doc.id
@@ -53,41 +95,106 @@ class RecursiveCharacterChunker(ChunkingStrategy):
         return chunked_docs
 
     def _split_text(self, text: str, separators: List[str]) -> List[str]:
-        final_chunks = []
-        separator = separators[-1]
-        new_separators = []
-        
+        spans: List[Tuple[int, int]] = []
+        self._split_range(text, 0, len(text), separators, spans)
+        return [text[start:end] for start, end in spans]
+
+    def _split_range(self, text: str, start: int, end: int, separators: List[str], out: List[Tuple[int, int]]) -> None:
+        # Use the first (coarsest) separator that occurs in this range
+        separator = ""
+        remaining: List[str] = []
         for i, sep in enumerate(separators):
             if sep == "":
-                separator = sep
                 break
-            if sep in text:
+            if text.find(sep, start, end) != -1:
                 separator = sep
-                new_separators = separators[i+1:]
+                remaining = separators[i + 1:]
                 break
-        
-        # Split
-        if separator:
-            splits = text.split(separator)
-        else:
-            splits = list(text) # Split by character if no separator found (shouldn't happen with "")
-
-        # Merge
-        current_chunk = ""
-        for split in splits:
-            if len(current_chunk) + len(split) + len(separator) <= self.chunk_size:
-                current_chunk += (separator if current_chunk else "") + split
-            else:
-                if current_chunk:
-                    final_chunks.append(current_chunk)
-                current_chunk = split
-                # If the single split is too big, we need to recurse on it
-                if len(current_chunk) > self.chunk_size and new_separators:
-                    # This is a simplification; a full implementation would be more complex
-                    # For now, let's just accept it might be slightly over size or implement full recursion
-                    pass 
-        
-        if current_chunk:
-            final_chunks.append(current_chunk)
-            
-        return final_chunks
+        if not separator:
+            self._split_fixed(text, start, end, out)
+            return
+
+        # Offsets of the pieces between separators: piece i spans
+        # [bounds[i], bounds[i + 1] - sep_len). Lengths come from one C-level split.
+        # Merging works on cumulative lengths in whatever unit _measure uses
+        # (characters here, so the two coincide).
+        size, overlap = self.chunk_size, self.chunk_overlap
+        sep_len = len(separator)
+        pieces = text[start:end].split(separator)
+        bounds = list(accumulate((len(piece) + sep_len for piece in pieces), initial=start))
+        cum, sep_size = self._measure(pieces, separator, bounds)
+        del pieces
+        n = len(bounds) - 1
+
+        def skip_empty(i: int) -> int:
+            # Chunks never start with an empty piece (e.g. between doubled separators)
+            while i < n and bounds[i + 1] - sep_len == bounds[i]:
+                i += 1
+            return i
+
+        i = skip_empty(0)
+        while i < n:
+            if cum[i + 1] - sep_size - cum[i] > size:
+                # Too big on its own: recurse into it with the finer separators
+                self._split_range(text, bounds[i], bounds[i + 1] - sep_len, remaining, out)
+                i = skip_empty(i + 1)
+                continue
+
+            # Greedily merge: last piece j whose end is within chunk_size of the chunk start
+            j = bisect_right(cum, cum[i] + size + sep_size, i + 1, n + 1) - 2
+            out.append((bounds[i], bounds[j + 1] - sep_len))
+            if j == n - 1:
+                break
+
+            # Start the next chunk at the earliest piece that keeps the overlap within
+            # chunk_overlap and still leaves room for the next piece
+            chunk_end = cum[j + 1] - sep_size
+            next_end = cum[j + 2] - sep_size
+            i = bisect_left(cum, max(chunk_end - overlap, next_end - size), i, j + 1)
+            i = skip_empty(min(i, j + 1))
+
+    def _measure(self, pieces: List[str], separator: str, bounds: List[int]) -> Tuple[List[int], int]:
+        """Cumulative lengths of the pieces (each followed by a separator) and the separator length."""
+        return bounds, len(separator)
+
+    def _split_fixed(self, text: str, start: int, end: int, out: List[Tuple[int, int]]) -> None:
+        step = self.chunk_size - self.chunk_overlap
+        while start < end:
+            out.append((start, min(start + self.chunk_size, end)))
+            if start + self.chunk_size >= end:
+                break
+            start += step
+
+class TokenChunker(RecursiveCharacterChunker):
+    """Recursive chunker whose chunk_size and chunk_overlap are measured in tokens.
+
+    Token counts are computed once per split piece (memoized by the tokenizer) and
+    summed, instead of re-tokenizing every candidate chunk, so merging costs the
+    same binary searches as the character version. Pieces with no separator left
+    are cut on token boundaries.
+    """
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        separators: Optional[List[str]] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=separators)
+        self.tokenizer = tokenizer or get_tokenizer()
+
+    def _measure(self, pieces: List[str], separator: str, bounds: List[int]) -> Tuple[List[int], int]:
+        count = self.tokenizer.count
+        sep_size = count(separator)
+        return list(accumulate((count(piece) + sep_size for piece in pieces), initial=0)), sep_size
+
+    def _split_fixed(self, text: str, start: int, end: int, out: List[Tuple[int, int]]) -> None:
+        offsets = self.tokenizer.token_offsets(text[start:end])
+        step = self.chunk_size - self.chunk_overlap
+        first = 0
+        while first < len(offsets):
+            last = first + self.chunk_size
+            out.append((start + offsets[first], start + offsets[last] if last < len(offsets) else end))
+            if last >= len(offsets):
+                break
+            first += step
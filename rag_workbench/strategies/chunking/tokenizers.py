@@ -0,0 +1,105 @@
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional
+
+class Tokenizer(ABC):
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        pass
+
+    @abstractmethod
+    def token_offsets(self, text: str) -> List[int]:
+        """Character offset at which each token of text starts."""
+        pass
+
+class SimpleTokenizer(Tokenizer):
+    """Offline approximation of a BPE tokenizer.
+
+    Words count as one token per 4 characters and every punctuation mark as one
+    token; whitespace is free. Close enough to cl100k-style counts on English text
+    for budgeting chunk sizes, with no dependencies.
+    """
+    _TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+
+    def count(self, text: str) -> int:
+        return len(self._TOKEN.findall(text))
+
+    def token_offsets(self, text: str) -> List[int]:
+        return [match.start() for match in self._TOKEN.finditer(text)]
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact token counts for OpenAI models via tiktoken."""
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        try:
+            import tiktoken
+        except ImportError:
+            raise ImportError("tiktoken is not installed. Please install it with `pip install tiktoken`.")
+        self.encoding_name = encoding_name
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def __getstate__(self):
+        # Encodings are not picklable (e.g. for ParallelChunker); reload by name instead
+        return {"encoding_name": self.encoding_name}
+
+    def __setstate__(self, state):
+        self.__init__(state["encoding_name"])
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+    def token_offsets(self, text: str) -> List[int]:
+        _, offsets = self.encoding.decode_with_offsets(self.encoding.encode_ordinary(text))
+        return offsets
+
+class CachedTokenizer(Tokenizer):
+    """Memoizes token counts of short texts (words, lines) in a bounded LRU.
+
+    Split pieces repeat heavily across a corpus, so most counts become dict lookups.
+    Long texts are counted directly, since they rarely repeat and would crowd the cache.
+    """
+    def __init__(self, tokenizer: Tokenizer, maxsize: int = 100_000, max_text_length: int = 256):
+        self.tokenizer = tokenizer
+        self.maxsize = maxsize
+        self.max_text_length = max_text_length
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+
+    def count(self, text: str) -> int:
+        if len(text) > self.max_text_length:
+            return self.tokenizer.count(text)
+        cache = self._cache
+        count = cache.get(text)
+        if count is not None:
+            cache.move_to_end(text)
+            return count
+        count = self.tokenizer.count(text)
+        cache[text] = count
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return count
+
+    def token_offsets(self, text: str) -> List[int]:
+        return self.tokenizer.token_offsets(text)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        return state
+
+def get_tokenizer(name: Optional[str] = None) -> Tokenizer:
+    """Cached tokenizer by name: a tiktoken encoding (e.g. "cl100k_base") or "simple".
+
+    With no name, uses cl100k_base when tiktoken is installed and its encoding can be
+    loaded (it is downloaded on first use), and the offline SimpleTokenizer otherwise.
+    """
+    if name is None:
+        try:
+            base = TiktokenTokenizer("cl100k_base")
+        except Exception:
+            base = SimpleTokenizer()
+    elif name == "simple":
+        base = SimpleTokenizer()
+    else:
+        base = TiktokenTokenizer(name)
+    return CachedTokenizer(base)
@@ -1 +1,3 @@
-from .strategies import MockEmbeddingModel, OpenAIEmbeddingModel
+from .strategies import MockEmbeddingModel, HashEmbeddingModel, OpenAIEmbeddingModel
+from .executor import EmbeddingExecutor, RateLimiter
+from .cache import CachedEmbeddingModel, SQLiteEmbeddingStore
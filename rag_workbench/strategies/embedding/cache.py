@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from rag_workbench.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from rag_workbench.core.interfaces import EmbeddingModel
+
+class SQLiteEmbeddingStore:
+    """On-disk, size-bounded key -> vector store backed by a single SQLite file.
+
+    Vectors are stored as packed float32 blobs. Every hit and insert stamps the row
+    with an increasing access counter, and once the store exceeds `max_entries` the
+    least recently used rows are evicted (with ~10% slack so eviction is amortized).
+    """
+    def __init__(self, path: str, max_entries: Optional[int] = None):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Accessed from ingest worker threads, guarded by self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)")
+        row = self._conn.execute("SELECT COALESCE(MAX(last_used), 0), COUNT(*) FROM embeddings").fetchone()
+        self._clock, self._count = row
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        found: Dict[bytes, List[float]] = {}
+        if not keys:
+            return found
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                self._clock += 1
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(self._clock, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def _count_present(self, keys: List[bytes]) -> int:
+        """Number of `keys` already stored (primary-key lookups, not a table scan)."""
+        present = 0
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            present += self._conn.execute(
+                f"SELECT COUNT(*) FROM embeddings WHERE key IN ({placeholders})", part
+            ).fetchone()[0]
+        return present
+
+    def put_many(self, items: Dict[bytes, List[float]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            self._clock += 1
+            added = len(items) - self._count_present(list(items))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), self._clock) for key, vector in items.items()]
+            )
+            self._count += added
+            if self.max_entries is not None and self._count > self.max_entries:
+                target = int(self.max_entries * 0.9)
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (self._count - target,)
+                )
+                self._count = target
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class CachedEmbeddingModel(EmbeddingModel):
+    """Content-addressed caching decorator around any EmbeddingModel.
+
+    Vectors are keyed by sha256(model_name, text) in a persistent store, so
+    re-ingesting an unchanged corpus costs no embedding calls. `model_name` must
+    identify everything that determines the wrapped model's vectors (the builder
+    uses model type plus name or dimension), as one cache file may be shared
+    by several pipelines. Cache misses in an
+    `embed_documents` call are de-duplicated and sent to the wrapped model in one
+    batch. `embed_query` additionally goes through an in-process LRU. The async
+    methods run SQLite lookups in a worker thread and call the wrapped model's
+    async API, so a native async client stays non-blocking behind the cache.
+    """
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        model_name: str,
+        store: SQLiteEmbeddingStore,
+        lru_size: int = 1024,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.store = store
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        # Guards hits/misses, which worker threads and the event loop both update
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+        self.instrumentation.incr("embedding.cache_hits", hits)
+        self.instrumentation.incr("embedding.cache_misses", misses)
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        cached = self.store.get_many(list(dict.fromkeys(keys)))
+
+        # Embed each distinct missing text once
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            embeddings = self.model.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), embeddings))
+            self.store.put_many(fresh)
+            cached.update(fresh)
+
+        self._count(len(texts) - len(missing), len(missing))
+        return [cached[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        cached = await asyncio.to_thread(self.store.get_many, list(dict.fromkeys(keys)))
+
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            embeddings = await self.model.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), embeddings))
+            await asyncio.to_thread(self.store.put_many, fresh)
+            cached.update(fresh)
+
+        self._count(len(texts) - len(missing), len(missing))
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lru_get(key)
+        if vector is not None:
+            return vector
+
+        found = self.store.get_many([key])
+        if key in found:
+            vector = found[key]
+            self._count(1, 0)
+        else:
+            vector = self.model.embed_query(text)
+            self.store.put_many({key: vector})
+            self._count(0, 1)
+        self._lru_put(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self._lru_get(key)
+        if vector is not None:
+            return vector
+
+        found = await asyncio.to_thread(self.store.get_many, [key])
+        if key in found:
+            vector = found[key]
+            self._count(1, 0)
+        else:
+            vector = await self.model.aembed_query(text)
+            await asyncio.to_thread(self.store.put_many, {key: vector})
+            self._count(0, 1)
+        self._lru_put(key, vector)
+        return vector
+
+    def _lru_get(self, key: bytes) -> Optional[List[float]]:
+        with self._lru_lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                self._count(1, 0)
+            return vector
+
+    def _lru_put(self, key: bytes, vector: List[float]) -> None:
+        with self._lru_lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
@@ -0,0 +1,213 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple, Type
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+class RateLimiter:
+    """Thread-safe token bucket enforcing requests- and tokens-per-minute budgets.
+
+    Each budget refills continuously at budget/60 per second and may burst up to
+    one minute's worth. A limit of None disables that budget.
+    """
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._request_allowance = float(requests_per_minute or 0)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._last = clock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until one request carrying `tokens` tokens fits in both budgets."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            self._sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Like `acquire`, but waits with asyncio.sleep instead of blocking the thread."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take one request's budget and return 0.0, or return how long to wait."""
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return 0.0
+        # A single request larger than the whole budget waits for a full bucket instead of forever
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            self._refill()
+            wait = 0.0
+            if self.requests_per_minute and self._request_allowance < 1:
+                wait = max(wait, (1 - self._request_allowance) * 60.0 / self.requests_per_minute)
+            if self.tokens_per_minute and self._token_allowance < tokens:
+                wait = max(wait, (tokens - self._token_allowance) * 60.0 / self.tokens_per_minute)
+            if wait == 0.0:
+                if self.requests_per_minute:
+                    self._request_allowance -= 1
+                if self.tokens_per_minute:
+                    self._token_allowance -= tokens
+            return wait
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._last
+        self._last = now
+        if self.requests_per_minute:
+            self._request_allowance = min(
+                float(self.requests_per_minute),
+                self._request_allowance + elapsed * self.requests_per_minute / 60.0
+            )
+        if self.tokens_per_minute:
+            self._token_allowance = min(
+                float(self.tokens_per_minute),
+                self._token_allowance + elapsed * self.tokens_per_minute / 60.0
+            )
+
+class EmbeddingExecutor:
+    """Runs an embedding call over many texts in bounded, concurrent batches.
+
+    `embed_batch` is any callable that embeds one list of texts (e.g. a single
+    provider request). Inputs are split into batches bounded by item count and
+    estimated tokens, up to `max_concurrency` batches are in flight at once, each
+    request waits on the rate limiter, failed requests matching `retry_on` are
+    retried with jittered exponential backoff, and results are returned in the
+    original input order. With an `aembed_batch` coroutine function, `aembed` does
+    the same on the event loop, with at most `max_concurrency` requests in flight.
+    """
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 2048,
+        max_batch_tokens: int = 300_000,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        token_counter: Callable[[str], int] = estimate_tokens,
+        sleep: Callable[[float], None] = time.sleep,
+        aembed_batch: Optional[Callable[[List[str]], Awaitable[List[List[float]]]]] = None,
+    ):
+        if max_batch_size <= 0 or max_batch_tokens <= 0:
+            raise ValueError("Batch limits must be positive")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.embed_batch = embed_batch
+        self.aembed_batch = aembed_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.token_counter = token_counter
+        self._sleep = sleep
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute, sleep=sleep)
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        batches = self.make_batches(texts)
+        if not batches:
+            return []
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        def run(batch: Tuple[int, int, int]) -> None:
+            start, end, tokens = batch
+            embeddings = self._call_with_retries(list(texts[start:end]), tokens)
+            if len(embeddings) != end - start:
+                raise ValueError(f"Expected {end - start} embeddings, got {len(embeddings)}")
+            results[start:end] = embeddings
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            for batch in batches:
+                run(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                # list() re-raises the first batch failure
+                list(pool.map(run, batches))
+        return results
+
+    async def aembed(self, texts: Sequence[str]) -> List[List[float]]:
+        if self.aembed_batch is None:
+            raise ValueError("EmbeddingExecutor was created without an aembed_batch function")
+        batches = self.make_batches(texts)
+        if not batches:
+            return []
+        # A fresh semaphore per call: asyncio primitives are bound to the running loop
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: Tuple[int, int, int]) -> List[List[float]]:
+            start, end, tokens = batch
+            async with semaphore:
+                embeddings = await self._acall_with_retries(list(texts[start:end]), tokens)
+            if len(embeddings) != end - start:
+                raise ValueError(f"Expected {end - start} embeddings, got {len(embeddings)}")
+            return embeddings
+
+        results: List[List[float]] = []
+        for embeddings in await asyncio.gather(*(run(batch) for batch in batches)):
+            results.extend(embeddings)
+        return results
+
+    def make_batches(self, texts: Sequence[str]) -> List[Tuple[int, int, int]]:
+        """Split inputs into contiguous (start, end, estimated_tokens) ranges."""
+        batches = []
+        start, tokens = 0, 0
+        for i, text in enumerate(texts):
+            count = self.token_counter(text)
+            if i > start and (i - start >= self.max_batch_size or tokens + count > self.max_batch_tokens):
+                batches.append((start, i, tokens))
+                start, tokens = i, 0
+            tokens += count
+        if start < len(texts):
+            batches.append((start, len(texts), tokens))
+        return batches
+
+    def _call_with_retries(self, texts: List[str], tokens: int) -> List[List[float]]:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(tokens)
+            try:
+                return self.embed_batch(texts)
+            except self.retry_on:
+                if attempt >= self.max_retries:
+                    raise
+                # Full jitter: sleep uniformly up to the capped exponential backoff
+                backoff = min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+                self._sleep(random.uniform(0, backoff))
+                attempt += 1
+
+    async def _acall_with_retries(self, texts: List[str], tokens: int) -> List[List[float]]:
+        attempt = 0
+        while True:
+            await self.rate_limiter.aacquire(tokens)
+            try:
+                return await self.aembed_batch(texts)
+            except self.retry_on:
+                if attempt >= self.max_retries:
+                    raise
+                backoff = min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+                await asyncio.sleep(random.uniform(0, backoff))
+                attempt += 1
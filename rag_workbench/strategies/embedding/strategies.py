@@ -1,6 +1,10 @@
+import hashlib
+import math
 import random
-from typing import List, Optional
+import re
+from typing import Any, List, Optional
 from rag_workbench.core.interfaces import EmbeddingModel
+from rag_workbench.strategies.embedding.executor import EmbeddingExecutor
 
 class MockEmbeddingModel(EmbeddingModel):
     def __init__(self, dimension: int = 1536):
@@ -12,21 +16,108 @@ class MockEmbeddingModel(EmbeddingModel):
     def embed_query(self, text: str) -> List[float]:
         return [random.random() for _ in range(self.dimension)]
 
+class HashEmbeddingModel(EmbeddingModel):
+    """Deterministic, dependency-free embedder using signed feature hashing of words.
+
+    The same text always maps to the same vector and texts sharing words score as
+    similar, which makes it useful for benchmarks and recall checks without an API.
+    """
+    _TOKEN = re.compile(r"\w+")
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in self._TOKEN.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dimension] += 1.0 if (digest >> 63) else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
 class OpenAIEmbeddingModel(EmbeddingModel):
-    def __init__(self, api_key: str, model_name: str = "text-embedding-3-small"):
-        try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
-        except ImportError:
-            raise ImportError("OpenAI library is not installed. Please install it with `pip install openai`.")
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: str = "text-embedding-3-small",
+        client: Optional[Any] = None,
+        batch_size: int = 2048,
+        max_batch_tokens: int = 300_000,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        async_client: Optional[Any] = None,
+    ):
+        # A pre-built client (e.g. a local fake in tests) skips the OpenAI import entirely
+        retry_on = (Exception,)
+        self._api_key = api_key
+        # Without a caller-supplied sync client we own both clients and create the
+        # AsyncOpenAI one on first async use
+        self._create_async_client = client is None and async_client is None
+        if client is None:
+            try:
+                import openai
+                from openai import OpenAI
+            except ImportError:
+                raise ImportError("OpenAI library is not installed. Please install it with `pip install openai`.")
+            client = OpenAI(api_key=api_key)
+            # Only transient failures are worth retrying; bad requests should fail fast
+            retry_on = (
+                openai.RateLimitError,
+                openai.APIConnectionError,
+                openai.APITimeoutError,
+                openai.InternalServerError,
+            )
+        self.client = client
+        self.async_client = async_client
         self.model_name = model_name
+        self.executor = EmbeddingExecutor(
+            self._embed_batch,
+            aembed_batch=self._aembed_batch,
+            max_batch_size=batch_size,
+            max_batch_tokens=max_batch_tokens,
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_retries=max_retries,
+            retry_on=retry_on,
+        )
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        # OpenAI batch limit is usually 2048, might need batching logic for large lists
-        # For now, simple implementation
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         response = self.client.embeddings.create(input=texts, model=self.model_name)
-        return [data.embedding for data in response.data]
+        # The API reports an index per item; don't rely on response ordering
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = await self.async_client.embeddings.create(input=texts, model=self.model_name)
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # OpenAI caps a request at 2048 inputs, so the executor splits and parallelizes
+        return self.executor.embed(texts)
 
     def embed_query(self, text: str) -> List[float]:
-        response = self.client.embeddings.create(input=[text], model=self.model_name)
-        return response.data[0].embedding
+        return self.executor.embed([text])[0]
+
+    def _has_async_client(self) -> bool:
+        if self.async_client is None and self._create_async_client:
+            from openai import AsyncOpenAI
+            self.async_client = AsyncOpenAI(api_key=self._api_key)
+        return self.async_client is not None
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not self._has_async_client():
+            # Only a sync client was supplied; fall back to a worker thread
+            return await super().aembed_documents(texts)
+        return await self.executor.aembed(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if not self._has_async_client():
+            return await super().aembed_query(text)
+        return (await self.executor.aembed([text]))[0]
@@ -0,0 +1,2 @@
+from .bm25 import BM25Index, tokenize
+from .strategies import HybridRetriever
@@ -0,0 +1,306 @@
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Identifiers such as error codes, versions or paths are kept whole (so an exact
+# "err-4021" matches strongly) and also split into their parts
+_TOKEN = re.compile(r"\w+(?:[-.:/]\w+)*")
+_PART = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        if not token.isalnum():
+            parts = _PART.findall(token)
+            if len(parts) > 1:
+                tokens.extend(parts)
+    return tokens
+
+class _Postings:
+    """One term's posting list: ascending document numbers with term frequencies."""
+    __slots__ = ("docs", "tfs", "max_tf", "min_length")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.tfs = array("I")
+        # For the per-term score upper bound: the best case is the highest tf in the
+        # shortest document (bounds stay valid, if loose, after deletions)
+        self.max_tf = 0
+        self.min_length = 0
+
+class BM25Index:
+    """Incremental Okapi BM25 inverted index with MaxScore top-k evaluation.
+
+    Documents get increasing internal numbers, so every posting list is a pair of
+    append-only arrays (doc numbers, term frequencies) that stay sorted without
+    ever being rebuilt. Deletes and upserts tombstone the old number; dead entries
+    are skipped at query time and dropped by `compact` (run automatically once
+    they make up half of the index). Like Lucene, collection statistics (document
+    count, frequencies, average length) include tombstoned documents until then.
+
+    `search` runs document-at-a-time MaxScore: terms are ordered by their score
+    upper bound, and the low-impact terms whose bounds together cannot lift a
+    document into the current top k are never iterated, only probed by binary
+    search for documents the other terms already found. Common words therefore
+    cost little once the top-k threshold has risen.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, _Postings] = {}
+        # Document number -> ID (None once deleted) and length; ID -> live number
+        self._ids: List[Optional[str]] = []
+        self._lengths = array("I")
+        self._numbers: Dict[str, int] = {}
+        # Summed over every numbered document, tombstoned ones included
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._numbers
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / len(self._ids) if self._ids else 0.0
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any earlier version with the same ID."""
+        self.add_many([(doc_id, text)])
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        with self._lock:
+            for doc_id, text in items:
+                if doc_id in self._numbers:
+                    self._remove(doc_id)
+                counts: Dict[str, int] = {}
+                for token in tokenize(text):
+                    counts[token] = counts.get(token, 0) + 1
+                number = len(self._ids)
+                length = sum(counts.values())
+                self._ids.append(doc_id)
+                self._lengths.append(length)
+                self._numbers[doc_id] = number
+                self._total_length += length
+                for term, tf in counts.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = _Postings()
+                        postings.min_length = length
+                    postings.docs.append(number)
+                    postings.tfs.append(tf)
+                    postings.max_tf = max(postings.max_tf, tf)
+                    postings.min_length = min(postings.min_length, length)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self._numbers:
+                    self._remove(doc_id)
+            if len(self._ids) > 1024 and len(self._numbers) * 2 < len(self._ids):
+                self.compact()
+
+    def _remove(self, doc_id: str) -> None:
+        self._ids[self._numbers.pop(doc_id)] = None
+
+    def compact(self) -> None:
+        """Renumber live documents and drop tombstoned postings."""
+        with self._lock:
+            renumber = array("l", [-1]) * len(self._ids)
+            ids: List[Optional[str]] = []
+            lengths = array("I")
+            for number, doc_id in enumerate(self._ids):
+                if doc_id is not None:
+                    renumber[number] = len(ids)
+                    ids.append(doc_id)
+                    lengths.append(self._lengths[number])
+            for term in list(self._postings):
+                old = self._postings[term]
+                new = _Postings()
+                new.max_tf, new.min_length = old.max_tf, old.min_length
+                for number, tf in zip(old.docs, old.tfs):
+                    if renumber[number] >= 0:
+                        new.docs.append(renumber[number])
+                        new.tfs.append(tf)
+                if new.docs:
+                    self._postings[term] = new
+                else:
+                    del self._postings[term]
+            self._ids = ids
+            self._lengths = lengths
+            self._total_length = sum(lengths)
+            self._numbers = {doc_id: number for number, doc_id in enumerate(ids)}
+
+    def _idf(self, postings: _Postings) -> float:
+        df = len(postings.docs)
+        return math.log(1.0 + (len(self._ids) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (document ID, BM25 score) pairs for a query, best first."""
+        with self._lock:
+            if k <= 0 or not self._numbers:
+                return []
+            k1, b = self.k1, self.b
+            average = self.average_length or 1.0
+            # Query terms weighted by how often they occur in the query
+            weights: Dict[str, int] = {}
+            for token in tokenize(query):
+                if token in self._postings:
+                    weights[token] = weights.get(token, 0) + 1
+            if not weights:
+                return []
+
+            terms = []
+            for term, weight in weights.items():
+                postings = self._postings[term]
+                idf = self._idf(postings) * weight
+                norm = k1 * (1 - b + b * postings.min_length / average)
+                upper = idf * postings.max_tf * (k1 + 1) / (postings.max_tf + norm)
+                terms.append((upper, idf, postings))
+            # Ascending upper bound; prefix[i] = sum of the bounds of terms[0..i]
+            terms.sort(key=lambda term: term[0])
+            prefix = []
+            running = 0.0
+            for upper, _, _ in terms:
+                running += upper
+                prefix.append(running)
+
+            ids, lengths = self._ids, self._lengths
+            heap: List[Tuple[float, int]] = []
+            threshold = 0.0
+            # Terms before `first_essential` are non-essential: together they cannot beat the threshold
+            first_essential = 0
+            cursors = [0] * len(terms)
+            while first_essential < len(terms):
+                # Next candidate: the smallest current document among the essential terms
+                candidate = None
+                for i in range(first_essential, len(terms)):
+                    docs = terms[i][2].docs
+                    if cursors[i] < len(docs) and (candidate is None or docs[cursors[i]] < candidate):
+                        candidate = docs[cursors[i]]
+                if candidate is None:
+                    break
+                norm = k1 * (1 - b + b * lengths[candidate] / average)
+                score = 0.0
+                for i in range(first_essential, len(terms)):
+                    postings = terms[i][2]
+                    if cursors[i] < len(postings.docs) and postings.docs[cursors[i]] == candidate:
+                        tf = postings.tfs[cursors[i]]
+                        score += terms[i][1] * tf * (k1 + 1) / (tf + norm)
+                        cursors[i] += 1
+                if ids[candidate] is None:
+                    continue
+                # Probe non-essential terms, strongest first, while they can still matter
+                for i in range(first_essential - 1, -1, -1):
+                    if len(heap) == k and score + prefix[i] <= threshold:
+                        break
+                    postings = terms[i][2]
+                    position = bisect.bisect_left(postings.docs, candidate, cursors[i])
+                    cursors[i] = position
+                    if position < len(postings.docs) and postings.docs[position] == candidate:
+                        tf = postings.tfs[position]
+                        score += terms[i][1] * tf * (k1 + 1) / (tf + norm)
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, -candidate))
+                elif score > threshold:
+                    heapq.heapreplace(heap, (score, -candidate))
+                else:
+                    continue
+                if len(heap) == k:
+                    threshold = heap[0][0]
+                    while first_essential < len(terms) and prefix[first_essential] <= threshold:
+                        first_essential += 1
+            return [(ids[-negative], score) for score, negative in sorted(heap, reverse=True)]
+
+    def save(self, path: str) -> None:
+        """Write a compacted copy of the index to a directory.
+
+        Data files are named by a generation number that bm25.json refers to, and
+        a save writes the next generation before replacing bm25.json, so a crash
+        mid-save leaves the previous index loadable. Every save rewrites the whole
+        index, so its cost grows with the index, not with the change since the
+        last save.
+        """
+        with self._lock:
+            self.compact()
+            os.makedirs(path, exist_ok=True)
+            meta_path = os.path.join(path, "bm25.json")
+            previous = {}
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    previous = json.load(f)
+            generation = previous.get("generation", 0) + 1
+            postings_file, lengths_file = f"postings.{generation}.bin", f"lengths.{generation}.bin"
+            terms = list(self._postings)
+            with open(os.path.join(path, postings_file), "wb") as f:
+                for term in terms:
+                    self._postings[term].docs.tofile(f)
+                for term in terms:
+                    self._postings[term].tfs.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(os.path.join(path, lengths_file), "wb") as f:
+                self._lengths.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+            meta = {
+                "generation": generation,
+                "postings": postings_file,
+                "lengths": lengths_file,
+                "k1": self.k1,
+                "b": self.b,
+                "ids": self._ids,
+                "terms": terms,
+                "counts": [len(self._postings[term].docs) for term in terms],
+                "max_tf": [self._postings[term].max_tf for term in terms],
+                "min_length": [self._postings[term].min_length for term in terms],
+            }
+            # Written last: bm25.json is the commit point for the new generation
+            tmp = os.path.join(path, "bm25.json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, meta_path)
+            if previous:
+                for name in (previous.get("postings", "postings.bin"), previous.get("lengths", "lengths.bin")):
+                    if name not in (postings_file, lengths_file):
+                        try:
+                            os.remove(os.path.join(path, name))
+                        except FileNotFoundError:
+                            pass
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(os.path.join(path, "bm25.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(k1=meta["k1"], b=meta["b"])
+        total = sum(meta["counts"])
+        docs, tfs = array("I"), array("I")
+        # Indexes saved before generations were introduced use fixed file names
+        with open(os.path.join(path, meta.get("postings", "postings.bin")), "rb") as f:
+            docs.fromfile(f, total)
+            tfs.fromfile(f, total)
+        with open(os.path.join(path, meta.get("lengths", "lengths.bin")), "rb") as f:
+            index._lengths.fromfile(f, len(meta["ids"]))
+        start = 0
+        for term, count, max_tf, min_length in zip(meta["terms"], meta["counts"], meta["max_tf"], meta["min_length"]):
+            postings = _Postings()
+            postings.docs = docs[start:start + count]
+            postings.tfs = tfs[start:start + count]
+            postings.max_tf, postings.min_length = max_tf, min_length
+            index._postings[term] = postings
+            start += count
+        index._ids = meta["ids"]
+        index._numbers = {doc_id: number for number, doc_id in enumerate(index._ids)}
+        index._total_length = sum(index._lengths)
+        return index
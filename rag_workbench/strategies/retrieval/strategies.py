@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from rag_workbench.core.interfaces import Document, EmbeddingModel, RetrievalStrategy, VectorStore
+from rag_workbench.strategies.retrieval.bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+class HybridRetriever(RetrievalStrategy):
+    """Fuses dense vector search with BM25 keyword search.
+
+    Embeddings are good at paraphrase but blur exact tokens (IDs, error codes,
+    version strings, rare names); BM25 ranks those precisely. Each query runs both
+    searches for `candidates` results and fuses the two rankings:
+
+    - "rrf": reciprocal rank fusion, score = sum of 1 / (rrf_k + rank). Needs no
+      score calibration, so it is the default.
+    - "weighted": min-max normalized scores, combined as
+      vector_weight * vector + (1 - vector_weight) * bm25.
+
+    The BM25 index is fed by the pipeline as chunks are stored and deleted
+    (`index_documents` / `remove_documents`), so it stays in step with the vector
+    store; with a `path`, it is saved there after every pipeline ingest or delete
+    (`persist`) so it survives restarts alongside a persisted store. Each save
+    rewrites the whole index, so frequent small ingests into a large index pay
+    O(index) per call; batch them where possible. Documents
+    found only by BM25 are fetched with `VectorStore.get_documents`.
+    """
+    def __init__(
+        self,
+        index: Optional[BM25Index] = None,
+        fusion: str = "rrf",
+        rrf_k: int = 60,
+        vector_weight: float = 0.5,
+        candidates: int = 50,
+        embedding_model: Optional[EmbeddingModel] = None,
+        vector_store: Optional[VectorStore] = None,
+        path: Optional[str] = None,
+    ):
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        if not 0.0 <= vector_weight <= 1.0:
+            raise ValueError("vector_weight must be between 0 and 1")
+        self.index = index if index is not None else BM25Index()
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.vector_weight = vector_weight
+        self.candidates = candidates
+        self.embedding_model = embedding_model
+        self.vector_store = vector_store
+        self.path = path
+
+    def bind(self, embedding_model: EmbeddingModel, vector_store: VectorStore) -> None:
+        self.embedding_model = embedding_model
+        self.vector_store = vector_store
+        if len(self.index) == 0 and hasattr(vector_store, "__len__") and len(vector_store) > 0:
+            logger.warning(
+                f"The vector store holds {len(vector_store)} chunks but the BM25 index is empty; "
+                "keyword matches are missing until those chunks are re-ingested."
+            )
+
+    def index_documents(self, documents: List[Document]) -> None:
+        self.index.add_many((doc.id, doc.content) for doc in documents if doc.id is not None)
+
+    def remove_documents(self, ids: List[str]) -> None:
+        self.index.delete(ids)
+
+    def persist(self) -> None:
+        if self.path:
+            self.index.save(self.path)
+
+    def save(self, path: str) -> None:
+        """Persist the BM25 index (the vector store is saved separately)."""
+        self.index.save(path)
+
+    def retrieve(self, query: str, k: int = 4) -> List[Document]:
+        self._check_bound()
+        embedding = self.embedding_model.embed_query(query)
+        return self._retrieve_with_embeddings([query], [embedding], k)[0]
+
+    def retrieve_batch(self, queries: List[str], k: int = 4) -> List[List[Document]]:
+        if not queries:
+            return []
+        self._check_bound()
+        # One embedding call and one (matrix-matrix) store search for the whole batch
+        embeddings = self.embedding_model.embed_documents(queries)
+        return self._retrieve_with_embeddings(queries, embeddings, k)
+
+    async def aretrieve(self, query: str, k: int = 4) -> List[Document]:
+        self._check_bound()
+        embedding = await self.embedding_model.aembed_query(query)
+        return (await asyncio.to_thread(self._retrieve_with_embeddings, [query], [embedding], k))[0]
+
+    async def aretrieve_batch(self, queries: List[str], k: int = 4) -> List[List[Document]]:
+        if not queries:
+            return []
+        self._check_bound()
+        embeddings = await self.embedding_model.aembed_documents(queries)
+        return await asyncio.to_thread(self._retrieve_with_embeddings, queries, embeddings, k)
+
+    def _check_bound(self) -> None:
+        if self.embedding_model is None or self.vector_store is None:
+            raise ValueError("HybridRetriever needs an embedding model and vector store; pass them or use it in a RAGPipeline")
+
+    def _retrieve_with_embeddings(self, queries: List[str], embeddings, k: int) -> List[List[Document]]:
+        if k <= 0:
+            return [[] for _ in queries]
+        depth = max(k, self.candidates)
+        store = self.vector_store
+        search_with_scores = getattr(store, "search_batch_with_scores", None)
+        if search_with_scores is not None:
+            vector_hits = search_with_scores(embeddings, k=depth)
+        else:
+            vector_hits = [[(doc, None) for doc in docs] for docs in store.search_batch(embeddings, k=depth)]
+        return [
+            self._fuse(hits, self.index.search(query, depth), k)
+            for query, hits in zip(queries, vector_hits)
+        ]
+
+    def _fuse(
+        self,
+        vector_hits: List[Tuple[Document, Optional[float]]],
+        lexical_hits: List[Tuple[str, float]],
+        k: int,
+    ) -> List[Document]:
+        documents: Dict[str, Document] = {}
+        vector_ranking = []
+        for doc, score in vector_hits:
+            key = doc.id if doc.id is not None else f"\0{len(documents)}"
+            documents[key] = doc
+            vector_ranking.append((key, score))
+        lexical_ranking = list(lexical_hits)
+
+        fused: Dict[str, float] = {}
+        if self.fusion == "rrf":
+            for ranking in (vector_ranking, lexical_ranking):
+                for rank, (key, _) in enumerate(ranking):
+                    fused[key] = fused.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        else:
+            for ranking, weight in (
+                (vector_ranking, self.vector_weight),
+                (lexical_ranking, 1.0 - self.vector_weight),
+            ):
+                for key, score in self._normalize(ranking):
+                    fused[key] = fused.get(key, 0.0) + weight * score
+
+        top = sorted(fused, key=fused.get, reverse=True)[:k]
+        missing = [key for key in top if key not in documents]
+        if missing:
+            for doc in self.vector_store.get_documents(missing):
+                documents[doc.id] = doc
+        # A BM25 hit the store no longer has (deleted concurrently) is dropped
+        return [documents[key] for key in top if key in documents]
+
+    @staticmethod
+    def _normalize(ranking: List[Tuple[str, Optional[float]]]) -> List[Tuple[str, float]]:
+        """Min-max scale scores to [0, 1]; stores that return no scores are scored by rank."""
+        if not ranking:
+            return []
+        if ranking[0][1] is None:
+            return [(key, 1.0 - rank / len(ranking)) for rank, (key, _) in enumerate(ranking)]
+        scores = [score for _, score in ranking]
+        low, high = min(scores), max(scores)
+        if high == low:
+            return [(key, 1.0) for key, _ in ranking]
+        return [(key, (score - low) / (high - low)) for key, score in ranking]
@@ -1 +1,6 @@
-from .strategies import ChromaDBVectorStore, InMemoryVectorStore
+from .strategies import ChromaDBVectorStore, InMemoryVectorStore, NumpyVectorStore
+from .ann import IVFVectorStore, FaissVectorStore
+from .mapped import MappedVectorStore
+from .quantized import QuantizedVectorStore
+from .sharded import ShardedVectorStore, ProcessShard
+from .chunk_store import ChunkStore
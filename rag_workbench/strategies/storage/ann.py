@@ -0,0 +1,410 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from rag_workbench.core.interfaces import VectorStore, Document
+from rag_workbench.strategies.storage.filters import MetadataIndex, matches, overfetch, parse_filter
+from rag_workbench.strategies.storage.strategies import NumpyVectorStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class IVFVectorStore(NumpyVectorStore):
+    """Pure-NumPy inverted-file (IVF) approximate nearest neighbour store.
+
+    Vectors are clustered into `nlist` cells by spherical k-means, trained once the
+    store holds `train_size` vectors (or on an explicit `train()`). A query scores the
+    centroids, then only the rows in the `nprobe` closest cells; raising `nprobe`
+    trades latency for recall. Until the index is trained, search is exact.
+    """
+    def __init__(
+        self,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_size: Optional[int] = None,
+        kmeans_iterations: int = 20,
+        seed: int = 0,
+        dtype: str = "float32",
+        initial_capacity: int = 0,
+    ):
+        super().__init__(dtype=dtype, initial_capacity=initial_capacity)
+        if nlist <= 0 or nprobe <= 0:
+            raise ValueError("nlist and nprobe must be positive")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        # ~39 points per centroid is the usual minimum for stable k-means
+        self.train_size = train_size or 39 * nlist
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self.centroids = None
+        self._assign = np.empty(0, dtype=np.int32)
+        self._list_order = None
+        self._list_offsets = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, sample_size: Optional[int] = None) -> None:
+        """Train centroids on the first `sample_size` stored vectors and assign all rows."""
+        if self._count == 0:
+            raise ValueError("Cannot train an IVF index on an empty store")
+        sample = self.vectors[:min(sample_size or self.train_size, self._count)].astype(np.float32)
+        self.centroids = self._kmeans(sample, min(self.nlist, len(sample)))
+        self._assign = np.empty(self._matrix.shape[0], dtype=np.int32)
+        self._assign_rows(np.arange(self._count))
+
+    def _kmeans(self, sample, nlist: int):
+        rng = np.random.default_rng(self.seed)
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty cells with random points so every cell stays in use
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+            centroids = self._normalize(sums)
+        return centroids
+
+    def _assign_rows(self, rows) -> None:
+        if len(self._assign) < self._matrix.shape[0]:
+            assign = np.empty(self._matrix.shape[0], dtype=np.int32)
+            assign[:len(self._assign)] = self._assign
+            self._assign = assign
+        for start in range(0, len(rows), self._SCORE_BLOCK):
+            block = rows[start:start + self._SCORE_BLOCK]
+            vectors = self._matrix[block].astype(np.float32)
+            self._assign[block] = np.argmax(vectors @ self.centroids.T, axis=1)
+        self._list_order = None
+
+    def _on_rows_written(self, rows) -> None:
+        if self.is_trained:
+            self._assign_rows(rows)
+        elif self._count >= self.train_size:
+            self.train()
+
+    def _move_row(self, src: int, dst: int) -> None:
+        super()._move_row(src, dst)
+        if self.is_trained:
+            self._assign[dst] = self._assign[src]
+            self._list_order = None
+
+    def delete(self, ids: List[str]) -> None:
+        super().delete(ids)
+        self._list_order = None
+
+    def _build_lists(self) -> None:
+        # Inverted lists as one row permutation grouped by cell plus per-cell offsets (CSR layout)
+        assign = self._assign[:self._count]
+        self._list_order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=len(self.centroids))
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def _search_batch_with_scores(self, query_embeddings, k: int) -> List[List[Tuple[Document, float]]]:
+        if not self.is_trained:
+            return super()._search_batch_with_scores(query_embeddings, k)
+        if len(query_embeddings) == 0:
+            return []
+        if self._count == 0 or k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        if self._list_order is None:
+            self._build_lists()
+
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        nprobe = min(self.nprobe, len(self.centroids))
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+
+        results = []
+        for query, cells in zip(queries, probes):
+            candidates = np.concatenate([
+                self._list_order[self._list_offsets[c]:self._list_offsets[c + 1]] for c in cells
+            ])
+            if len(candidates) == 0:
+                results.append([])
+                continue
+            scores = self._matrix[candidates].astype(np.float32) @ query
+            top = self._top_k(scores[None, :], k)[0]
+            results.append([(self.documents[candidates[i]], float(scores[i])) for i in top])
+        return results
+
+    def _save_state(self, path: str) -> None:
+        super()._save_state(path)
+        if self.is_trained:
+            np.save(os.path.join(path, "centroids.npy"), self.centroids)
+            np.save(os.path.join(path, "assignments.npy"), self._assign[:self._count])
+
+    def _config(self) -> dict:
+        config = super()._config()
+        config.update(
+            nlist=self.nlist,
+            nprobe=self.nprobe,
+            train_size=self.train_size,
+            kmeans_iterations=self.kmeans_iterations,
+            seed=self.seed
+        )
+        return config
+
+    def _load_state(self, path: str) -> None:
+        centroids_path = os.path.join(path, "centroids.npy")
+        if not os.path.exists(centroids_path):
+            return
+        self.centroids = np.load(centroids_path)
+        self._assign = np.empty(self._matrix.shape[0], dtype=np.int32)
+        self._assign[:self._count] = np.load(os.path.join(path, "assignments.npy"))
+        self._list_order = None
+
+class FaissVectorStore(VectorStore):
+    """FAISS-backed ANN store (HNSW by default, or IVF) over normalized vectors.
+
+    Deletes and upserts tombstone the old FAISS entry, since HNSW indexes cannot
+    remove vectors; searches over-fetch to make up for tombstones, and `save`
+    writes the index together with the live documents.
+    """
+    # Filters estimated to match at most this fraction of documents are applied
+    # inside FAISS; broader ones filter over-fetched results
+    _PREFILTER_SELECTIVITY = 0.2
+
+    def __init__(
+        self,
+        index_type: str = "hnsw",
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        ef_construction: int = 200,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_size: Optional[int] = None,
+    ):
+        try:
+            import faiss
+        except ImportError:
+            raise ImportError("FAISS is not installed. Please install it with `pip install faiss-cpu`.")
+        if np is None:
+            raise ImportError("NumPy is not installed. Please install it with `pip install numpy`.")
+        if index_type not in ("hnsw", "ivf"):
+            raise ValueError(f"Unsupported FAISS index type: {index_type}")
+        self._faiss = faiss
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.ef_construction = ef_construction
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or 39 * nlist
+        self.index = None
+        # FAISS position -> document (None once deleted), and live document ID -> position
+        self._documents: List[Optional[Document]] = []
+        self._positions = {}
+        self._deleted = 0
+        # Built on the first filtered search, then kept up to date
+        self._filter_index: Optional[MetadataIndex] = None
+        # Vectors held back until an IVF index has enough data to train on
+        self._pending: List = []
+
+    def __len__(self) -> int:
+        return len(self._documents) - self._deleted
+
+    def _create_index(self, dimension: int, nlist: Optional[int] = None):
+        faiss = self._faiss
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+            index.hnsw.efSearch = self.ef_search
+        else:
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist or self.nlist, faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = self.nprobe
+        return index
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        if len(documents) != len(embeddings):
+            raise ValueError("Number of documents and embeddings must match")
+        if not documents:
+            return
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self._faiss.normalize_L2(vectors)
+        if self.index is None:
+            self.index = self._create_index(vectors.shape[1])
+
+        self.delete([doc.id for doc in documents if doc.id is not None])
+        for doc in documents:
+            if doc.id is not None:
+                self._positions[doc.id] = len(self._documents)
+            if self._filter_index is not None:
+                self._filter_index.add(len(self._documents), doc.metadata)
+            self._documents.append(doc)
+
+        if self.index.is_trained:
+            self.index.add(vectors)
+            return
+        self._pending.append(vectors)
+        if sum(len(v) for v in self._pending) >= self.train_size:
+            self.train()
+
+    def train(self) -> None:
+        """Train an IVF index on the vectors added so far (no-op for HNSW)."""
+        if not self._pending:
+            return
+        pending = np.concatenate(self._pending)
+        sample = pending[:self.train_size]
+        if self.index_type == "ivf" and len(sample) < self.index.nlist:
+            # A search or save before train_size vectors arrived: fewer cells, like IVFVectorStore
+            self.index = self._create_index(pending.shape[1], nlist=len(sample))
+        self.index.train(sample)
+        self.index.add(pending)
+        self._pending = []
+
+    def delete(self, ids: List[str]) -> None:
+        for doc_id in ids:
+            position = self._positions.pop(doc_id, None)
+            if position is not None:
+                if self._filter_index is not None:
+                    self._filter_index.remove(position, self._documents[position].metadata)
+                self._documents[position] = None
+                self._deleted += 1
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        return [self._documents[self._positions[doc_id]] for doc_id in ids if doc_id in self._positions]
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return self.search_batch([query_embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in results]
+            for results in self.search_batch_with_scores(query_embeddings, k=k, where=where)
+        ]
+
+    def search_with_scores(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        return self.search_batch_with_scores([query_embedding], k=k, where=where)[0]
+
+    def search_batch_with_scores(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search, optionally with a metadata filter.
+
+        Selective filters are pushed into FAISS as an ID selector over the matching
+        positions; broad ones over-fetch and drop non-matching results.
+        """
+        condition = parse_filter(where) if where else None
+        if len(query_embeddings) == 0:
+            return []
+        if self.index is None or len(self) == 0 or k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        if not self.index.is_trained:
+            # Too little data to train IVF yet; train on what we have
+            self.train()
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        self._faiss.normalize_L2(queries)
+        # Over-fetch in proportion to tombstones so deleted entries don't starve results
+        fetch = min(len(self._documents), k + int(k * self._deleted / max(len(self), 1)) + 1)
+        if condition is None:
+            return self._search(queries, fetch, k)
+
+        index = self._metadata_index()
+        estimate = index.estimate(condition)
+        if estimate <= self._PREFILTER_SELECTIVITY * len(index):
+            positions = np.fromiter(sorted(index.rows(condition)), dtype=np.int64)
+            if len(positions) == 0:
+                return [[] for _ in range(len(queries))]
+            return self._search(queries, min(k, len(positions)), k, params=self._search_params(positions))
+
+        fetch = overfetch(fetch, estimate / max(len(index), 1), len(self._documents))
+        while True:
+            results = self._search(queries, fetch, fetch)
+            filtered = [
+                [(doc, score) for doc, score in hits if matches(condition, doc.metadata)][:k]
+                for hits in results
+            ]
+            if fetch >= len(self._documents) or all(len(hits) >= k for hits in filtered):
+                return filtered
+            fetch = min(len(self._documents), fetch * 2)
+
+    def _search(self, queries, fetch: int, k: int, params=None) -> List[List[Tuple[Document, float]]]:
+        if params is None:
+            scores, positions = self.index.search(queries, fetch)
+        else:
+            scores, positions = self.index.search(queries, fetch, params=params)
+        results = []
+        for row_scores, row_positions in zip(scores, positions):
+            hits = []
+            for score, position in zip(row_scores, row_positions):
+                doc = self._documents[position] if position >= 0 else None
+                if doc is not None:
+                    hits.append((doc, float(score)))
+                    if len(hits) == k:
+                        break
+            results.append(hits)
+        return results
+
+    def _search_params(self, positions):
+        faiss = self._faiss
+        selector = faiss.IDSelectorBatch(positions)
+        if self.index_type == "hnsw":
+            # A wider beam keeps recall up when most of the graph is filtered out
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=max(self.ef_search, 4 * len(positions)))
+        return faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+
+    def _metadata_index(self) -> MetadataIndex:
+        # Keyed by FAISS position; positions are never reused, so only adds and deletes touch it
+        if self._filter_index is None:
+            index = MetadataIndex()
+            for position, doc in enumerate(self._documents):
+                if doc is not None:
+                    index.add(position, doc.metadata)
+            self._filter_index = index
+        return self._filter_index
+
+    def save(self, path: str) -> None:
+        """Write the FAISS index and its documents to a directory."""
+        os.makedirs(path, exist_ok=True)
+        self.train()
+        if self.index is not None:
+            self._faiss.write_index(self.index, os.path.join(path, "index.faiss"))
+        with open(os.path.join(path, "documents.jsonl"), "w", encoding="utf-8") as f:
+            for doc in self._documents:
+                record = None if doc is None else {"id": doc.id, "content": doc.content, "metadata": doc.metadata}
+                f.write(json.dumps(record) + "\n")
+        with open(os.path.join(path, "store.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "index_type": self.index_type,
+                "hnsw_m": self.hnsw_m,
+                "ef_search": self.ef_search,
+                "ef_construction": self.ef_construction,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "train_size": self.train_size
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "FaissVectorStore":
+        with open(os.path.join(path, "store.json"), "r", encoding="utf-8") as f:
+            store = cls(**json.load(f))
+        index_path = os.path.join(path, "index.faiss")
+        if os.path.exists(index_path):
+            store.index = store._faiss.read_index(index_path)
+            # Search-time knobs are not persisted by FAISS for every index type
+            if store.index_type == "hnsw":
+                store.index.hnsw.efSearch = store.ef_search
+            else:
+                store.index.nprobe = store.nprobe
+        with open(os.path.join(path, "documents.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                doc = None if record is None else Document(**record)
+                if doc is None:
+                    store._deleted += 1
+                elif doc.id is not None:
+                    store._positions[doc.id] = len(store._documents)
+                store._documents.append(doc)
+        return store
@@ -0,0 +1,213 @@
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional
+from rag_workbench.core.interfaces import Document
+
+# Metadata keys the chunkers add to every chunk; stored in arrays instead of dicts
+_CHUNK_INDEX = "chunk_index"
+_PARENT_ID = "parent_id"
+_MISSING = object()
+
+class ChunkStore(Sequence):
+    """Compact, list-like storage for many chunk Documents.
+
+    Instead of one Document (plus a copied metadata dict) per chunk, texts and
+    external IDs live in one UTF-8 buffer addressed by offset arrays, so a row is
+    an integer position with no per-row Python objects; metadata shared by all
+    chunks of a parent document is stored once, referenced by index and
+    reference-counted (freed records are reused), chunk_index lives in an int
+    array, and anything chunk-specific beyond that is kept in a sparse override
+    dict. Indexing materializes a fresh Document view, so only returned results cost
+    full objects. Supports the list operations the vector stores need: append,
+    item assignment, swap-style `move` and `pop`.
+    """
+    def __init__(self, documents: Iterable[Document] = ()):
+        self._text = bytearray()
+        self._starts = array("q")
+        self._ends = array("q")
+        # ID bytes in the same buffer as the texts; start -1 means no ID
+        self._id_starts = array("q")
+        self._id_ends = array("q")
+        self._parent_rows = array("l")
+        self._chunk_indexes = array("l")
+        self._parents: List[Optional[Dict[str, Any]]] = []
+        self._parent_refs = array("l")
+        self._free_parents: List[int] = []
+        self._parent_lookup: Dict[Any, int] = {}
+        self._overrides: Dict[int, Dict[str, Any]] = {}
+        self._garbage = 0
+        self.extend(documents)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        content = self._text[self._starts[index]:self._ends[index]].decode("utf-8")
+        return Document(content=content, metadata=self.metadata_at(index), id=self.id_at(index))
+
+    def id_at(self, index: int) -> Optional[str]:
+        start = self._id_starts[index]
+        if start < 0:
+            return None
+        return self._text[start:self._id_ends[index]].decode("utf-8")
+
+    @property
+    def parent_count(self) -> int:
+        """Parent metadata records currently referenced by some row."""
+        return len(self._parents) - len(self._free_parents)
+
+    def metadata_at(self, index: int) -> Dict[str, Any]:
+        """Metadata of one row, without decoding its text."""
+        parent = self._parents[self._parent_rows[index]]
+        metadata = dict(parent["metadata"])
+        if parent["has_parent_id"]:
+            metadata[_PARENT_ID] = parent["parent_id"]
+        chunk_index = self._chunk_indexes[index]
+        if chunk_index >= 0:
+            metadata[_CHUNK_INDEX] = chunk_index
+        override = self._overrides.get(index)
+        if override:
+            metadata.update(override)
+        return metadata
+
+    def append(self, doc: Document) -> None:
+        for row_array in (self._starts, self._ends, self._id_starts, self._id_ends, self._chunk_indexes):
+            row_array.append(-1)
+        self._parent_rows.append(-1)
+        self._write(len(self._starts) - 1, doc)
+
+    def extend(self, documents: Iterable[Document]) -> None:
+        for doc in documents:
+            self.append(doc)
+
+    def __setitem__(self, index: int, doc: Document) -> None:
+        self._discard(index)
+        self._overrides.pop(index, None)
+        self._write(index, doc)
+        self._maybe_compact()
+
+    def move(self, src: int, dst: int) -> None:
+        """Overwrite row dst with row src, without materializing the Document."""
+        self._discard(dst)
+        for row_array in (self._starts, self._ends, self._id_starts, self._id_ends, self._chunk_indexes):
+            row_array[dst] = row_array[src]
+        self._parent_rows[dst] = self._parent_rows[src]
+        self._parent_refs[self._parent_rows[src]] += 1
+        override = self._overrides.get(src)
+        if override is not None:
+            self._overrides[dst] = override
+        else:
+            self._overrides.pop(dst, None)
+        # src still points at the same bytes until it is popped; don't count them twice
+        self._garbage -= self._row_bytes(src)
+
+    def pop(self) -> None:
+        """Remove the last row (callers move rows into deleted slots first)."""
+        index = len(self._starts) - 1
+        self._discard(index)
+        for row_array in (self._starts, self._ends, self._id_starts, self._id_ends, self._parent_rows, self._chunk_indexes):
+            row_array.pop()
+        self._overrides.pop(index, None)
+        self._maybe_compact()
+
+    def _row_bytes(self, index: int) -> int:
+        size = self._ends[index] - self._starts[index]
+        if self._id_starts[index] >= 0:
+            size += self._id_ends[index] - self._id_starts[index]
+        return size
+
+    def _discard(self, index: int) -> None:
+        """Account for a row's bytes and parent reference before it is overwritten or removed."""
+        self._garbage += self._row_bytes(index)
+        self._release_parent(self._parent_rows[index])
+
+    def _write(self, index: int, doc: Document) -> None:
+        encoded = doc.content.encode("utf-8")
+        self._starts[index] = len(self._text)
+        self._text += encoded
+        self._ends[index] = len(self._text)
+        if doc.id is None:
+            self._id_starts[index] = self._id_ends[index] = -1
+        else:
+            self._id_starts[index] = len(self._text)
+            self._text += doc.id.encode("utf-8")
+            self._id_ends[index] = len(self._text)
+
+        metadata = doc.metadata
+        chunk_index = metadata.get(_CHUNK_INDEX, _MISSING)
+        if type(chunk_index) is int and chunk_index >= 0:
+            self._chunk_indexes[index] = chunk_index
+        else:
+            self._chunk_indexes[index] = -1
+            if chunk_index is not _MISSING:
+                self._overrides[index] = {_CHUNK_INDEX: chunk_index}
+        row = self._parent_index(metadata)
+        self._parent_rows[index] = row
+        self._parent_refs[row] += 1
+
+    def _parent_index(self, metadata: Dict[str, Any]) -> int:
+        parent_id = metadata.get(_PARENT_ID, _MISSING)
+        shared = {k: v for k, v in metadata.items() if k != _CHUNK_INDEX and k != _PARENT_ID}
+        # Chunks of one document arrive together and share metadata, so check the
+        # entry for this parent first; anything else gets its own parent record
+        key = None if parent_id is _MISSING else parent_id
+        try:
+            row = self._parent_lookup.get(key)
+        except TypeError:
+            row, key = None, _MISSING
+        if row is not None:
+            parent = self._parents[row]
+            if parent["metadata"] == shared and parent["has_parent_id"] == (parent_id is not _MISSING):
+                return row
+        parent = {
+            "metadata": shared,
+            "parent_id": None if parent_id is _MISSING else parent_id,
+            "has_parent_id": parent_id is not _MISSING,
+        }
+        if self._free_parents:
+            row = self._free_parents.pop()
+            self._parents[row] = parent
+        else:
+            row = len(self._parents)
+            self._parents.append(parent)
+            self._parent_refs.append(0)
+        if key is not _MISSING:
+            self._parent_lookup[key] = row
+        return row
+
+    def _release_parent(self, row: int) -> None:
+        """Drop one reference to a parent record, freeing it when no row uses it."""
+        self._parent_refs[row] -= 1
+        if self._parent_refs[row]:
+            return
+        parent = self._parents[row]
+        key = parent["parent_id"] if parent["has_parent_id"] else None
+        try:
+            if self._parent_lookup.get(key) == row:
+                del self._parent_lookup[key]
+        except TypeError:
+            pass
+        self._parents[row] = None
+        self._free_parents.append(row)
+
+    def _maybe_compact(self) -> None:
+        # Rewrite the text buffer once more than half of it belongs to replaced/deleted rows
+        if self._garbage <= 4096 or self._garbage * 2 <= len(self._text):
+            return
+        text = bytearray()
+        for i in range(len(self._starts)):
+            for starts, ends in ((self._starts, self._ends), (self._id_starts, self._id_ends)):
+                start, end = starts[i], ends[i]
+                if start < 0:
+                    continue
+                starts[i] = len(text)
+                text += self._text[start:end]
+                ends[i] = len(text)
+        self._text = text
+        self._garbage = 0
@@ -0,0 +1,250 @@
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Metadata filters use the same syntax as Chroma `where` clauses, so they can be passed
+# straight through to Chroma and evaluated locally by the in-memory stores:
+#
+#   {"source": "wiki"}                                  equality (shorthand)
+#   {"source": {"$eq": "wiki"}}                         equality
+#   {"tenant": {"$in": ["a", "b"]}}                     membership
+#   {"year": {"$gte": 2020, "$lt": 2024}}               range ($gt, $gte, $lt, $lte)
+#   {"$and": [...]}, {"$or": [...]}                     boolean combinations
+#
+# A dict with several fields is an implicit $and. Filters are parsed into tuples:
+#   ("eq", field, value), ("in", field, values),
+#   ("range", field, low, low_inclusive, high, high_inclusive),
+#   ("and", children), ("or", children)
+
+_RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+_SCALAR_TYPES = (str, int, float, bool)
+_MISSING = object()
+
+def parse_filter(where: Dict[str, Any]) -> Tuple:
+    """Validate a filter expression and parse it into a condition tree."""
+    if not isinstance(where, dict) or not where:
+        raise ValueError("A metadata filter must be a non-empty dict")
+    conditions = []
+    for key, value in where.items():
+        if key in ("$and", "$or"):
+            if not isinstance(value, (list, tuple)) or not value:
+                raise ValueError(f"{key} expects a non-empty list of filters")
+            children = [parse_filter(child) for child in value]
+            conditions.append(children[0] if len(children) == 1 else (key[1:], children))
+        elif key.startswith("$"):
+            raise ValueError(f"Unsupported filter operator: {key}")
+        else:
+            conditions.append(_parse_field(key, value))
+    return conditions[0] if len(conditions) == 1 else ("and", conditions)
+
+def _parse_field(field: str, condition: Any) -> Tuple:
+    if not isinstance(condition, dict):
+        return ("eq", field, _scalar(condition))
+    if not condition:
+        raise ValueError(f"Empty condition for field {field!r}")
+    if "$eq" in condition or "$in" in condition:
+        if len(condition) != 1:
+            raise ValueError(f"$eq and $in cannot be combined with other operators (field {field!r})")
+        if "$eq" in condition:
+            return ("eq", field, _scalar(condition["$eq"]))
+        values = condition["$in"]
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            raise ValueError(f"$in expects a list of values (field {field!r})")
+        return ("in", field, frozenset(_scalar(v) for v in values))
+    low = high = None
+    low_inclusive = high_inclusive = False
+    for operator, bound in condition.items():
+        if operator not in _RANGE_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        if isinstance(bound, bool) or not isinstance(bound, (int, float, str)):
+            raise ValueError(f"{operator} expects a number or string (field {field!r})")
+        if operator in ("$gt", "$gte"):
+            low, low_inclusive = bound, operator == "$gte"
+        else:
+            high, high_inclusive = bound, operator == "$lte"
+    if low is not None and high is not None and isinstance(low, str) != isinstance(high, str):
+        raise ValueError(f"Range bounds for field {field!r} must both be numbers or both strings")
+    return ("range", field, low, low_inclusive, high, high_inclusive)
+
+def _scalar(value: Any) -> Any:
+    if not isinstance(value, _SCALAR_TYPES):
+        raise ValueError(f"Filter values must be str, int, float or bool, got {type(value).__name__}")
+    return value
+
+def matches(condition: Tuple, metadata: Dict[str, Any]) -> bool:
+    """Whether a document's metadata satisfies a parsed filter."""
+    kind = condition[0]
+    if kind == "and":
+        return all(matches(child, metadata) for child in condition[1])
+    if kind == "or":
+        return any(matches(child, metadata) for child in condition[1])
+    value = metadata.get(condition[1], _MISSING)
+    if value is _MISSING:
+        return False
+    if kind == "eq":
+        return value == condition[2]
+    if kind == "in":
+        try:
+            return value in condition[2]
+        except TypeError:
+            return False
+    return _in_range(value, *condition[2:])
+
+def _sort_class(value: Any) -> Optional[type]:
+    """Values comparable in a range query: numbers with numbers, strings with strings."""
+    if isinstance(value, str):
+        return str
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float
+    return None
+
+def _in_range(value, low, low_inclusive, high, high_inclusive) -> bool:
+    bound = low if low is not None else high
+    if _sort_class(value) is not _sort_class(bound):
+        return False
+    if low is not None and (value < low or (value == low and not low_inclusive)):
+        return False
+    if high is not None and (value > high or (value == high and not high_inclusive)):
+        return False
+    return True
+
+def to_chroma_where(where: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite a filter into the strict form Chroma accepts (one field or operator per dict)."""
+    return _chroma_clause(parse_filter(where))
+
+def _chroma_clause(condition: Tuple) -> Dict[str, Any]:
+    kind = condition[0]
+    if kind in ("and", "or"):
+        return {f"${kind}": [_chroma_clause(child) for child in condition[1]]}
+    field = condition[1]
+    if kind == "eq":
+        return {field: {"$eq": condition[2]}}
+    if kind == "in":
+        return {field: {"$in": sorted(condition[2], key=repr)}}
+    low, low_inclusive, high, high_inclusive = condition[2:]
+    bounds = []
+    if low is not None:
+        bounds.append({field: {"$gte" if low_inclusive else "$gt": low}})
+    if high is not None:
+        bounds.append({field: {"$lte" if high_inclusive else "$lt": high}})
+    return bounds[0] if len(bounds) == 1 else {"$and": bounds}
+
+class MetadataIndex:
+    """Inverted indexes over metadata fields: field -> value -> set of row numbers.
+
+    Answers eq/in lookups directly and range lookups by bisecting a sorted list of
+    each field's distinct values (numbers and strings kept apart). Rows are the
+    owning store's row positions; the store reports every add, removal and move.
+    Unhashable metadata values are not indexed and never match.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        # field -> sort class -> sorted distinct values, rebuilt lazily after changes
+        self._sorted: Dict[str, Dict[type, List[Any]]] = {}
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def add(self, row: int, metadata: Dict[str, Any]) -> None:
+        for field, value in metadata.items():
+            try:
+                postings = self._postings.setdefault(field, {}).setdefault(value, set())
+            except TypeError:
+                continue
+            if not postings:
+                self._sorted.pop(field, None)
+            postings.add(row)
+        self._rows += 1
+
+    def remove(self, row: int, metadata: Dict[str, Any]) -> None:
+        for field, value in metadata.items():
+            values = self._postings.get(field)
+            try:
+                postings = values.get(value) if values is not None else None
+            except TypeError:
+                continue
+            if postings is None:
+                continue
+            postings.discard(row)
+            if not postings:
+                del values[value]
+                self._sorted.pop(field, None)
+        self._rows -= 1
+
+    def move(self, src: int, dst: int, metadata: Dict[str, Any]) -> None:
+        """Re-point row src (with this metadata) to dst; dst must have been removed first."""
+        for field, value in metadata.items():
+            try:
+                postings = self._postings.get(field, {}).get(value)
+            except TypeError:
+                continue
+            if postings is not None:
+                postings.discard(src)
+                postings.add(dst)
+
+    def estimate(self, condition: Tuple) -> int:
+        """Upper bound on the number of matching rows, from posting list sizes alone."""
+        kind = condition[0]
+        if kind == "and":
+            return min(self.estimate(child) for child in condition[1])
+        if kind == "or":
+            return min(self._rows, sum(self.estimate(child) for child in condition[1]))
+        values = self._postings.get(condition[1], {})
+        if kind == "eq":
+            return len(values.get(condition[2], ()))
+        if kind == "in":
+            return sum(len(values.get(value, ())) for value in condition[2])
+        return sum(len(values[value]) for value in self._range_values(condition))
+
+    def rows(self, condition: Tuple) -> Set[int]:
+        """Exact set of rows matching a parsed filter."""
+        kind = condition[0]
+        if kind == "and":
+            # Intersect starting from the most selective child
+            children = sorted(condition[1], key=self.estimate)
+            result = self.rows(children[0])
+            for child in children[1:]:
+                if not result:
+                    break
+                result = result & self.rows(child)
+            return result
+        if kind == "or":
+            result = set()
+            for child in condition[1]:
+                result |= self.rows(child)
+            return result
+        values = self._postings.get(condition[1], {})
+        if kind == "eq":
+            return set(values.get(condition[2], ()))
+        if kind == "in":
+            return set().union(*(values.get(value, ()) for value in condition[2]))
+        return set().union(*(values[value] for value in self._range_values(condition)))
+
+    def _range_values(self, condition: Tuple) -> Iterable[Any]:
+        _, field, low, low_inclusive, high, high_inclusive = condition
+        values = self._postings.get(field)
+        if not values:
+            return []
+        by_class = self._sorted.get(field)
+        if by_class is None:
+            by_class = {}
+            for value in values:
+                sort_class = _sort_class(value)
+                if sort_class is not None:
+                    by_class.setdefault(sort_class, []).append(value)
+            for ordered in by_class.values():
+                ordered.sort()
+            self._sorted[field] = by_class
+        ordered = by_class.get(_sort_class(low if low is not None else high), [])
+        start = 0
+        if low is not None:
+            start = (bisect.bisect_left if low_inclusive else bisect.bisect_right)(ordered, low)
+        end = len(ordered)
+        if high is not None:
+            end = (bisect.bisect_right if high_inclusive else bisect.bisect_left)(ordered, high)
+        return ordered[start:end]
+
+def overfetch(k: int, selectivity: float, total: int) -> int:
+    """How many unfiltered results to fetch so ~k survive a filter of this selectivity."""
+    return min(total, k + int(math.ceil(2 * k / max(selectivity, 1e-9))))
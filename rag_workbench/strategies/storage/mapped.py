@@ -0,0 +1,172 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from rag_workbench.core.interfaces import Document
+from rag_workbench.strategies.storage.persistence import HEADER, StoreReader, StoreWriter, read_header, write_store
+from rag_workbench.strategies.storage.strategies import NumpyVectorStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class MappedVectorStore(NumpyVectorStore):
+    """NumpyVectorStore served directly from a memory-mapped store directory.
+
+    Opening is near-instant regardless of index size: vectors are mapped rather than
+    read, and documents are decoded lazily when they appear in results. Worker
+    processes opening the same directory read-only share its pages. A store opened
+    with `writable=True` persists every add/delete as a crash-safe append; upserts
+    and deletes tombstone the old rows (use `save` to write a compacted copy). Only
+    one writable store may have a directory open at a time.
+    """
+    def __init__(self, path: str, writable: bool = False, dtype: str = "float32"):
+        if os.path.exists(os.path.join(path, HEADER)):
+            dtype = read_header(path)["dtype"]
+        elif not writable:
+            raise FileNotFoundError(f"No vector store found at {path}")
+        super().__init__(dtype=dtype)
+        self.path = path
+        self.writable = writable
+        self._writer: Optional[StoreWriter] = None
+        self._reader: Optional[StoreReader] = None
+        self._deleted = None
+        if os.path.exists(os.path.join(path, HEADER)):
+            if writable:
+                self._writer = StoreWriter(path)
+            self.refresh()
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False, dtype: str = "float32") -> "MappedVectorStore":
+        return cls(path, writable=writable, dtype=dtype)
+
+    def refresh(self) -> None:
+        """Re-map the directory to pick up appends committed by a writer."""
+        reader = StoreReader(self.path)
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = reader
+        self._matrix = reader.vectors if reader.count else None
+        self._count = reader.count
+        self.documents = reader.records
+        self._deleted = None
+        if len(reader.deleted_rows):
+            self._deleted = np.zeros(reader.count, dtype=bool)
+            self._deleted[reader.deleted_rows] = True
+        self._reset_row_index()
+        self._filter_index = None
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _reset_row_index(self) -> None:
+        # Rows are derived from disk on first use (see _rows)
+        self._id_rows: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self._count - (int(self._deleted.sum()) if self._deleted is not None else 0)
+
+    @property
+    def _rows(self) -> Dict[str, int]:
+        # Built on first use only; readers that just search never decode every record
+        if self._id_rows is None:
+            self._id_rows = {}
+            for row in range(self._count):
+                if self._deleted is not None and self._deleted[row]:
+                    continue
+                doc_id = self.documents[row].id
+                if doc_id is not None:
+                    self._id_rows[doc_id] = row
+        return self._id_rows
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        if not self.writable:
+            raise ValueError("MappedVectorStore was opened read-only")
+        if len(documents) != len(embeddings):
+            raise ValueError("Number of documents and embeddings must match")
+        if not documents:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a 2D array-like of shape (n, dimension)")
+        if self._writer is None:
+            self._writer = StoreWriter(self.path, dimension=vectors.shape[1], dtype=self.dtype.name)
+        if vectors.shape[1] != self._writer.header["dimension"]:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match store dimension {self._writer.header['dimension']}"
+            )
+
+        # Last occurrence of an ID within the batch wins; stored rows with that ID are tombstoned
+        keep = {}
+        for i, doc in enumerate(documents):
+            keep[doc.id if doc.id is not None else ("", i)] = i
+        positions = sorted(keep.values())
+        rows = self._rows
+        deleted_rows = [rows[documents[i].id] for i in positions if documents[i].id in rows]
+        self._append(self._normalize(vectors[positions]), [documents[i] for i in positions], deleted_rows)
+
+    def delete(self, ids: List[str]) -> None:
+        if not self.writable:
+            raise ValueError("MappedVectorStore was opened read-only")
+        rows = self._rows
+        deleted_rows = sorted({rows[doc_id] for doc_id in ids if doc_id in rows})
+        if deleted_rows:
+            self._append(np.empty((0, self._writer.header["dimension"])), [], deleted_rows)
+
+    def _append(self, vectors, documents: List[Document], deleted_rows: List[int]) -> None:
+        index = self._id_rows
+        filter_index = self._filter_index
+        start = self._count
+        self._writer.append(vectors, documents, deleted_rows=deleted_rows)
+        self.refresh()
+        if filter_index is not None:
+            for row in deleted_rows:
+                filter_index.remove(row, self._metadata(row))
+            for offset, doc in enumerate(documents):
+                filter_index.add(start + offset, doc.metadata)
+            self._filter_index = filter_index
+        # Keep an already-built ID index current instead of rebuilding it from disk
+        if index is not None:
+            for row in deleted_rows:
+                index.pop(self.documents[row].id, None)
+            for offset, doc in enumerate(documents):
+                if doc.id is not None:
+                    index[doc.id] = start + offset
+            self._id_rows = index
+
+    def _metadata(self, row: int) -> Dict:
+        return self.documents[row].metadata
+
+    def _metadata_index(self):
+        if self._filter_index is None:
+            # Tombstoned rows are left out, so pre-filtered searches never score them
+            super()._metadata_index()
+            if self._deleted is not None:
+                for row in np.flatnonzero(self._deleted):
+                    self._filter_index.remove(int(row), self._metadata(int(row)))
+        return self._filter_index
+
+    def _score(self, queries):
+        scores = super()._score(queries)
+        if self._deleted is not None:
+            scores[:, self._deleted] = -np.inf
+        return scores
+
+    def _search_batch_with_scores(self, query_embeddings, k: int) -> List[List[Tuple[Document, float]]]:
+        results = super()._search_batch_with_scores(query_embeddings, k)
+        if self._deleted is None:
+            return results
+        return [[(doc, score) for doc, score in hits if score != -np.inf] for hits in results]
+
+    def save(self, path: str) -> None:
+        """Write a compacted copy (tombstoned rows dropped) to another directory."""
+        if os.path.abspath(path) == os.path.abspath(self.path):
+            raise ValueError("Cannot save a MappedVectorStore over its own directory")
+        live = np.arange(self._count)
+        if self._deleted is not None:
+            live = np.flatnonzero(~self._deleted)
+        vectors = self._matrix[live] if self._matrix is not None else np.empty((0, 0), dtype=self.dtype)
+        write_store(path, vectors, [self.documents[i] for i in live], dtype=self.dtype.name, extra=self._save_state)
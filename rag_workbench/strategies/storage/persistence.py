@@ -0,0 +1,262 @@
+"""On-disk format shared by the NumPy-backed vector stores.
+
+A store directory holds:
+
+    header.json   {"version", "dimension", "dtype", "count", "deleted"} - the commit point
+    vectors.bin   count x dimension raw vectors (row-major, little-endian)
+    records.bin   concatenated UTF-8 JSON records ({"id", "content", "metadata"})
+    offsets.bin   int64 byte offsets into records.bin, count + 1 entries
+    deleted.bin   int64 row numbers of tombstoned rows, `deleted` entries
+
+Appends write past the committed end of every file, fsync them, then atomically
+replace header.json. Readers only trust what the header covers, so a crash
+mid-append leaves the previous state intact and the next append truncates the
+partial tail. Whole-store writes (`write_store`) build a sibling directory and
+swap it into place, so a crash mid-save leaves the previously saved store intact.
+A writer holds an exclusive lock on the directory for as long as it is open, so a
+second writer fails fast instead of interleaving appends. Vectors are memory-mapped,
+so any number of processes can open the same directory read-only and share one copy
+in the page cache.
+"""
+import json
+import mmap
+import os
+import shutil
+from typing import Callable, Optional, Sequence
+from rag_workbench.core.interfaces import Document
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+FORMAT_VERSION = 1
+HEADER = "header.json"
+VECTORS = "vectors.bin"
+RECORDS = "records.bin"
+OFFSETS = "offsets.bin"
+DELETED = "deleted.bin"
+
+def _fsync_write(path: str, data: bytes, offset: int) -> None:
+    # Open without truncation, cut any uncommitted tail, then append
+    mode = "r+b" if os.path.exists(path) else "w+b"
+    with open(path, mode) as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_header(path: str) -> dict:
+    with open(os.path.join(path, HEADER), "r", encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported vector store format version: {header.get('version')}")
+    return header
+
+def _fsync_directory(path: str) -> None:
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path, os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def write_header(path: str, header: dict) -> None:
+    tmp_path = os.path.join(path, HEADER + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(header, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(path, HEADER))
+    # Persist the rename itself
+    _fsync_directory(path)
+
+def _lock_directory(path: str) -> Optional[int]:
+    """Take an exclusive, non-blocking lock on `path`; returns the descriptor holding it."""
+    if fcntl is None:
+        return None
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        raise RuntimeError(f"Vector store at {path} is already open for writing") from None
+    return fd
+
+def encode_record(doc: Document) -> bytes:
+    return json.dumps({"id": doc.id, "content": doc.content, "metadata": doc.metadata}).encode("utf-8")
+
+class StoreWriter:
+    """Crash-safe appender for a store directory.
+
+    Holds an exclusive lock on the directory until `close`; opening a second writer
+    on the same directory raises RuntimeError.
+    """
+    def __init__(self, path: str, dimension: Optional[int] = None, dtype: str = "float32"):
+        if np is None:
+            raise ImportError("NumPy is not installed. Please install it with `pip install numpy`.")
+        self.path = path
+        exists = os.path.exists(os.path.join(path, HEADER))
+        if not exists:
+            if dimension is None:
+                raise ValueError("dimension is required to create a new store")
+            os.makedirs(path, exist_ok=True)
+        self._lock = _lock_directory(path)
+        if exists:
+            self.header = read_header(path)
+        else:
+            self.header = {"version": FORMAT_VERSION, "dimension": dimension, "dtype": dtype, "count": 0, "deleted": 0}
+            _fsync_write(os.path.join(path, OFFSETS), np.zeros(1, dtype="<i8").tobytes(), 0)
+            write_header(path, self.header)
+        self.dtype = np.dtype(self.header["dtype"]).newbyteorder("<")
+
+    def _records_end(self) -> int:
+        with open(os.path.join(self.path, OFFSETS), "rb") as f:
+            f.seek(self.header["count"] * 8)
+            return int(np.frombuffer(f.read(8), dtype="<i8")[0])
+
+    def append(self, vectors, documents: Sequence[Document], deleted_rows: Sequence[int] = ()) -> None:
+        """Append rows and tombstones, then commit them with a single header update."""
+        count, dimension = self.header["count"], self.header["dimension"]
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype).reshape(-1, dimension)
+        if len(vectors) != len(documents):
+            raise ValueError("Number of documents and vectors must match")
+
+        if len(documents):
+            records_end = self._records_end()
+            records = [encode_record(doc) for doc in documents]
+            offsets = records_end + np.cumsum([len(r) for r in records], dtype=np.int64)
+            _fsync_write(os.path.join(self.path, VECTORS), vectors.tobytes(), count * dimension * self.dtype.itemsize)
+            _fsync_write(os.path.join(self.path, RECORDS), b"".join(records), records_end)
+            _fsync_write(os.path.join(self.path, OFFSETS), offsets.astype("<i8").tobytes(), (count + 1) * 8)
+        if len(deleted_rows):
+            _fsync_write(
+                os.path.join(self.path, DELETED),
+                np.asarray(deleted_rows, dtype="<i8").tobytes(),
+                self.header["deleted"] * 8
+            )
+
+        header = dict(self.header, count=count + len(documents), deleted=self.header["deleted"] + len(deleted_rows))
+        write_header(self.path, header)
+        self.header = header
+
+    def close(self) -> None:
+        """Release the directory lock."""
+        if self._lock is not None:
+            os.close(self._lock)
+            self._lock = None
+
+# Rows per append when writing a whole store
+WRITE_BLOCK = 65536
+
+def write_store(
+    path: str,
+    vectors,
+    documents: Sequence[Document],
+    dtype: str = "float32",
+    extra: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Write a fresh store directory, replacing any previous one.
+
+    `vectors` is a 2D array or anything with a `shape` whose row slices are arrays
+    (e.g. a view that reads rows from disk); it is written WRITE_BLOCK rows at a
+    time, so it is never materialized whole. `extra`, if given, writes additional
+    files (store config, trained state) into the new directory.
+
+    Everything is written to a sibling staging directory that then replaces
+    `path`, so a crash mid-save never touches the previous store. A crash between
+    the two renames of the swap leaves the previous store at `<path>.old`.
+    """
+    path = os.path.abspath(path)
+    staging, old = f"{path}.tmp", f"{path}.old"
+    for leftover in (staging, old):
+        if os.path.isdir(leftover):
+            shutil.rmtree(leftover)
+    os.makedirs(staging)
+    try:
+        dimension = vectors.shape[1] if len(vectors.shape) == 2 and vectors.shape[1] else 0
+        writer = StoreWriter(staging, dimension=dimension, dtype=dtype)
+        try:
+            for start in range(0, len(documents), WRITE_BLOCK):
+                end = min(start + WRITE_BLOCK, len(documents))
+                writer.append(vectors[start:end], [documents[i] for i in range(start, end)])
+        finally:
+            writer.close()
+        if extra is not None:
+            extra(staging)
+        if os.path.exists(path):
+            os.replace(path, old)
+        os.replace(staging, path)
+        _fsync_directory(os.path.dirname(path))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+class RecordReader(Sequence):
+    """Lazy, memory-mapped sequence of the Documents stored in records.bin."""
+    def __init__(self, path: str, count: int):
+        self.count = count
+        self.offsets = np.memmap(os.path.join(path, OFFSETS), dtype="<i8", mode="r", shape=(count + 1,))
+        self._file = None
+        self._mmap = None
+        end = int(self.offsets[count])
+        if end > 0:
+            self._file = open(os.path.join(path, RECORDS), "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), end, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("record index out of range")
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return Document(**json.loads(self._mmap[start:end]))
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+class StoreReader:
+    """Read-only, zero-copy view of a committed store directory."""
+    def __init__(self, path: str):
+        if np is None:
+            raise ImportError("NumPy is not installed. Please install it with `pip install numpy`.")
+        self.path = path
+        self.header = read_header(path)
+        self.count = self.header["count"]
+        self.dimension = self.header["dimension"]
+        self.dtype = np.dtype(self.header["dtype"]).newbyteorder("<")
+        if self.count:
+            self.vectors = np.memmap(
+                os.path.join(path, VECTORS), dtype=self.dtype, mode="r", shape=(self.count, self.dimension)
+            )
+        else:
+            self.vectors = np.empty((0, self.dimension), dtype=self.dtype)
+        self.records = RecordReader(path, self.count)
+        if self.header["deleted"]:
+            self.deleted_rows = np.fromfile(os.path.join(path, DELETED), dtype="<i8", count=self.header["deleted"])
+        else:
+            self.deleted_rows = np.empty(0, dtype=np.int64)
+
+    def live_rows(self):
+        """Row numbers that are not tombstoned."""
+        mask = np.ones(self.count, dtype=bool)
+        mask[self.deleted_rows] = False
+        return np.flatnonzero(mask)
+
+    def close(self) -> None:
+        self.records.close()
@@ -0,0 +1,321 @@
+import os
+import tempfile
+from typing import List, Optional, Tuple
+from rag_workbench.core.interfaces import Document
+from rag_workbench.strategies.storage.persistence import write_store
+from rag_workbench.strategies.storage.strategies import NumpyVectorStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# PQ centroids per sub-space; codes are one byte each
+_PQ_CENTROIDS = 256
+
+class _RawRows:
+    """Row-sliceable view of a quantized store's full-precision vectors, read from disk per slice."""
+    def __init__(self, store: "QuantizedVectorStore"):
+        self.store = store
+        self.shape = (store._count, store._dimension or 0)
+
+    def __getitem__(self, rows: slice):
+        return self.store._raw(np.arange(*rows.indices(self.shape[0])))
+
+class QuantizedVectorStore(NumpyVectorStore):
+    """NumPy store that keeps compressed vector codes in RAM and full vectors on disk.
+
+    Two quantizers, both trained on the first `train_size` vectors ingested:
+
+    - "int8": per-dimension scalar quantization to one signed byte (4x smaller
+      than float32).
+    - "pq": product quantization. The vector is split into `pq_subvectors` parts,
+      each replaced by the index of its nearest of 256 k-means centroids, so a
+      vector costs `pq_subvectors` bytes (32x smaller at the default d / 8).
+
+    Search uses asymmetric distance computation (ADC): the query stays in float32
+    and is scored directly against the codes (a rescaled dot product for int8, a
+    per-query lookup table for PQ). With `rerank_factor` > 0, the best
+    k * rerank_factor candidates are then re-scored exactly from the full-precision
+    vectors, which live in an append-only file on disk (`raw_path`, or an unnamed
+    temporary file) and are read only for those candidates. Upserts append a new
+    full-precision row and leave the old one unused until the store is saved and
+    loaded again. Until the quantizer is trained, search is exact.
+    """
+    # Codes decoded per step of ADC scoring; small enough for the float copy to stay in cache
+    _ADC_BLOCK = 4096
+
+    def __init__(
+        self,
+        quantization: str = "int8",
+        pq_subvectors: Optional[int] = None,
+        train_size: Optional[int] = None,
+        rerank_factor: int = 4,
+        raw_path: Optional[str] = None,
+        kmeans_iterations: int = 20,
+        seed: int = 0,
+        initial_capacity: int = 0,
+    ):
+        super().__init__(dtype="float32", initial_capacity=initial_capacity)
+        if quantization not in ("int8", "pq"):
+            raise ValueError(f"Unknown quantization: {quantization}")
+        if rerank_factor < 0:
+            raise ValueError("rerank_factor must not be negative")
+        self.quantization = quantization
+        self.pq_subvectors = pq_subvectors
+        # PQ needs enough points per centroid for stable k-means; int8 only needs value ranges
+        self.train_size = train_size or (39 * _PQ_CENTROIDS if quantization == "pq" else 1024)
+        self.rerank_factor = rerank_factor
+        self.raw_path = raw_path
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self._dimension: Optional[int] = None
+        # int8: per-dimension offset and step; PQ: centroids of shape (m, 256, d / m)
+        self.codebook = None
+        # Row -> record in the full-precision file (rows move on delete, records don't)
+        self._slots = np.empty(0, dtype=np.uint32)
+        self._raw_file = None
+        self._raw_count = 0
+        self._raw_map = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebook is not None
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._dimension
+
+    @property
+    def vectors(self):
+        """Full-precision (normalized) vectors, read back from disk."""
+        if self._dimension is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._raw(np.arange(self._count))
+
+    @property
+    def codes(self):
+        """View of the in-memory codes, without the unused capacity."""
+        return self._matrix[:self._count]
+
+    def train(self, sample_size: Optional[int] = None) -> None:
+        """Train the quantizer on a sample of the stored vectors and encode every row."""
+        if self._count == 0:
+            raise ValueError("Cannot train a quantizer on an empty store")
+        rng = np.random.default_rng(self.seed)
+        size = min(sample_size or self.train_size, self._count)
+        sample = self._raw(np.sort(rng.choice(self._count, size, replace=False)))
+        if self.quantization == "int8":
+            low = sample.min(axis=0)
+            step = (sample.max(axis=0) - low) / 255.0
+            step[step == 0] = 1.0
+            self.codebook = (low.astype(np.float32), step.astype(np.float32))
+        else:
+            m = self._code_width()
+            parts = sample.reshape(len(sample), m, -1)
+            self.codebook = np.stack([self._kmeans(parts[:, j], rng) for j in range(m)])
+        for start in range(0, self._count, self._SCORE_BLOCK):
+            rows = np.arange(start, min(start + self._SCORE_BLOCK, self._count))
+            self._matrix[rows] = self._encode(self._raw(rows))
+
+    def _kmeans(self, sample, rng):
+        """Euclidean k-means with 256 centroids (fewer points than that: all of them)."""
+        count = min(_PQ_CENTROIDS, len(sample))
+        centroids = np.zeros((_PQ_CENTROIDS, sample.shape[1]), dtype=np.float32)
+        centroids[:count] = sample[rng.choice(len(sample), count, replace=False)]
+        for _ in range(self.kmeans_iterations):
+            labels = self._nearest(sample, centroids[:count])
+            sums = np.zeros((count, sample.shape[1]), dtype=np.float32)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=count)
+            empty = counts == 0
+            counts[empty] = 1
+            updated = sums / counts[:, None]
+            # Re-seed empty clusters with random points so every code stays in use
+            updated[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids[:count] = updated
+        return centroids
+
+    @staticmethod
+    def _nearest(points, centroids):
+        distances = (centroids * centroids).sum(axis=1) - 2 * points @ centroids.T
+        return np.argmin(distances, axis=1)
+
+    def _code_width(self) -> int:
+        if self.quantization == "int8":
+            return self._dimension
+        if self.pq_subvectors is None:
+            # Largest divisor of the dimension up to d / 8 (one byte per 8 floats)
+            self.pq_subvectors = next(m for m in range(max(1, self._dimension // 8), 0, -1) if self._dimension % m == 0)
+        if self._dimension % self.pq_subvectors:
+            raise ValueError(f"pq_subvectors={self.pq_subvectors} must divide the dimension {self._dimension}")
+        return self.pq_subvectors
+
+    def _encode(self, vectors):
+        if self.quantization == "int8":
+            low, step = self.codebook
+            return (np.clip(np.rint((vectors - low) / step), 0, 255) - 128).astype(np.int8)
+        parts = vectors.reshape(len(vectors), len(self.codebook), -1)
+        codes = np.empty((len(vectors), len(self.codebook)), dtype=np.uint8)
+        for j, centroids in enumerate(self.codebook):
+            codes[:, j] = self._nearest(parts[:, j], centroids)
+        return codes
+
+    def _reserve(self, required: int, dimension: int) -> None:
+        if self._dimension is None:
+            self._dimension = dimension
+        if self._matrix is not None and required <= self._matrix.shape[0]:
+            return
+        capacity = max(required, self.initial_capacity, self._MIN_CAPACITY)
+        if self._matrix is not None:
+            capacity = max(capacity, int(self._matrix.shape[0] * self._GROWTH_FACTOR))
+        dtype = np.int8 if self.quantization == "int8" else np.uint8
+        codes = np.zeros((capacity, self._code_width()), dtype=dtype)
+        slots = np.empty(capacity, dtype=np.uint32)
+        if self._matrix is not None:
+            codes[:self._count] = self._matrix[:self._count]
+            slots[:self._count] = self._slots[:self._count]
+        self._matrix = codes
+        self._slots = slots
+
+    def _write_rows(self, rows, vectors) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self._raw_file is None:
+            self._raw_file = open(self.raw_path, "w+b") if self.raw_path else tempfile.TemporaryFile()
+        self._raw_file.seek(self._raw_count * self._dimension * 4)
+        vectors.tofile(self._raw_file)
+        self._slots[rows] = np.arange(self._raw_count, self._raw_count + len(vectors))
+        self._raw_count += len(vectors)
+        self._raw_map = None
+        if self.is_trained:
+            self._matrix[rows] = self._encode(vectors)
+
+    def _on_rows_written(self, rows) -> None:
+        if not self.is_trained and self._count >= self.train_size:
+            self.train()
+
+    def _move_row(self, src: int, dst: int) -> None:
+        super()._move_row(src, dst)
+        self._slots[dst] = self._slots[src]
+
+    def _raw(self, rows):
+        """Full-precision vectors for the given rows, read through a memory map."""
+        if self._raw_map is None:
+            self._raw_file.flush()
+            self._raw_map = np.memmap(self._raw_file, dtype=np.float32, mode="r", shape=(self._raw_count, self._dimension))
+        return np.asarray(self._raw_map[self._slots[rows]])
+
+    def _search_batch_with_scores(self, query_embeddings, k: int) -> List[List[Tuple[Document, float]]]:
+        return self._search_rows(query_embeddings, None, k)
+
+    def _search_rows(self, query_embeddings, rows, k: int) -> List[List[Tuple[Document, float]]]:
+        """ADC search over all rows (rows=None) or the given ones, then the optional exact re-rank."""
+        if len(query_embeddings) == 0:
+            return []
+        count = self._count if rows is None else len(rows)
+        if count == 0 or k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2:
+            raise ValueError("Query embeddings must be a 2D array-like of shape (m, dimension)")
+        queries = self._normalize(queries)
+        if rows is None:
+            rows = np.arange(self._count)
+        if not self.is_trained:
+            scores = queries @ self._raw(rows).T
+            top = self._top_k(scores, k)
+            return [
+                [(self.documents[rows[i]], float(row_scores[i])) for i in row_top]
+                for row_scores, row_top in zip(scores, top)
+            ]
+
+        scores = self._adc_scores(queries, rows)
+        fetch = k * self.rerank_factor if self.rerank_factor else k
+        top = self._top_k(scores, min(fetch, count))
+        results = []
+        for query, row_scores, row_top in zip(queries, scores, top):
+            candidates = rows[row_top]
+            if self.rerank_factor:
+                exact = self._raw(candidates) @ query
+                order = np.argsort(-exact, kind="stable")[:k]
+                results.append([(self.documents[candidates[i]], float(exact[i])) for i in order])
+            else:
+                results.append([(self.documents[row], float(row_scores[i])) for row, i in zip(candidates, row_top)])
+        return results
+
+    def _adc_scores(self, queries, rows):
+        """Approximate scores of shape (num_queries, len(rows)) computed from the codes."""
+        scores = np.empty((len(queries), len(rows)), dtype=np.float32)
+        contiguous = len(rows) == self._count
+        if self.quantization == "int8":
+            # q . x ~= q . (low + (code + 128) * step) = (q * step) . code + constant
+            low, step = self.codebook
+            scaled = queries * step
+            offsets = queries @ low + 128 * scaled.sum(axis=1)
+        else:
+            # Per-query table of sub-vector . centroid dot products, flattened so one
+            # take() gathers every sub-space at once
+            m = len(self.codebook)
+            tables = np.einsum("qmd,mcd->qmc", queries.reshape(len(queries), m, -1), self.codebook)
+            tables = tables.reshape(len(queries), -1)
+            shift = np.arange(m, dtype=np.intp) * _PQ_CENTROIDS
+        for start in range(0, len(rows), self._ADC_BLOCK):
+            end = min(start + self._ADC_BLOCK, len(rows))
+            codes = self._matrix[start:end] if contiguous else self._matrix[rows[start:end]]
+            if self.quantization == "int8":
+                scores[:, start:end] = scaled @ codes.astype(np.float32).T + offsets[:, None]
+            else:
+                index = codes.astype(np.intp) + shift
+                for q, table in enumerate(tables):
+                    scores[q, start:end] = table.take(index).sum(axis=1)
+        return scores
+
+    def memory_bytes(self) -> int:
+        """Bytes of vector data held in RAM (codes plus codebook), excluding documents."""
+        codebook = 0
+        if self.codebook is not None:
+            codebook = sum(a.nbytes for a in self.codebook) if self.quantization == "int8" else self.codebook.nbytes
+        return self.codes.nbytes + self._slots[:self._count].nbytes + codebook
+
+    def save(self, path: str) -> None:
+        """Save full-precision vectors, documents and the trained quantizer to a directory."""
+        if self.raw_path and os.path.dirname(os.path.abspath(self.raw_path)) == os.path.abspath(path):
+            raise ValueError("raw_path must not be inside the save directory, which is replaced as a whole")
+        # Streamed from the raw file block by block: the full matrix may not fit in RAM
+        write_store(path, _RawRows(self), self.documents, dtype="float32", extra=self._save_state)
+
+    def _save_state(self, path: str) -> None:
+        super()._save_state(path)
+        if self.is_trained:
+            if self.quantization == "int8":
+                np.save(os.path.join(path, "codebook.npy"), np.stack(self.codebook))
+            else:
+                np.save(os.path.join(path, "codebook.npy"), self.codebook)
+            np.save(os.path.join(path, "codes.npy"), self.codes)
+
+    def _config(self) -> dict:
+        return {
+            "quantization": self.quantization,
+            "pq_subvectors": self.pq_subvectors,
+            "train_size": self.train_size,
+            "rerank_factor": self.rerank_factor,
+            "raw_path": self.raw_path,
+            "kmeans_iterations": self.kmeans_iterations,
+            "seed": self.seed,
+        }
+
+    def _load_state(self, path: str) -> None:
+        codebook_path = os.path.join(path, "codebook.npy")
+        if os.path.exists(codebook_path) and self._count:
+            codebook = np.load(codebook_path)
+            self.codebook = (codebook[0], codebook[1]) if self.quantization == "int8" else codebook
+            self._matrix[:self._count] = np.load(os.path.join(path, "codes.npy"))
+        elif self._count >= self.train_size:
+            self.train()
+
+    def close(self) -> None:
+        """Close the full-precision vector file (a temporary one is deleted)."""
+        self._raw_map = None
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
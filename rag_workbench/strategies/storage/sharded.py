@@ -0,0 +1,328 @@
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from rag_workbench.core.interfaces import VectorStore, Document
+from rag_workbench.strategies.storage.filters import parse_filter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def shard_path(path: str, shard: int) -> str:
+    """Directory of one shard inside a saved sharded store."""
+    return os.path.join(path, f"shard-{shard:03d}")
+
+def _serve_shard(factory: Callable[[], VectorStore], conn) -> None:
+    """Worker process loop: build the shard, then answer (method, args, kwargs) requests."""
+    try:
+        store, error = factory(), None
+    except Exception as e:
+        store, error = None, e
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        method, args, kwargs = message
+        try:
+            if error is not None:
+                raise error
+            conn.send((True, getattr(store, method)(*args, **kwargs)))
+        except Exception as e:
+            conn.send((False, e))
+    close = getattr(store, "close", None)
+    if close is not None:
+        close()
+
+class ProcessShard(VectorStore):
+    """A vector store living in its own worker process, called over a pipe.
+
+    `factory` builds the store inside the worker, so it must be picklable (a
+    module-level function or a functools.partial of one). Searches in different
+    ProcessShards run truly in parallel, whatever the store type.
+    """
+    def __init__(self, factory: Callable[[], VectorStore]):
+        # spawn rather than fork: the parent may be running ingest/serving threads
+        context = multiprocessing.get_context("spawn")
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve_shard, args=(factory, child), daemon=True)
+        self._process.start()
+        child.close()
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, *args, **kwargs):
+        with self._lock:
+            self._conn.send((method, args, kwargs))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def __len__(self) -> int:
+        return self._call("__len__")
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        self._call("add_documents", documents, embeddings)
+
+    def delete(self, ids: List[str]) -> None:
+        self._call("delete", ids)
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return self._call("search", query_embedding, k=k, where=where)
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        return self._call("search_batch", query_embeddings, k=k, where=where)
+
+    def search_batch_with_scores(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        return self._call("search_batch_with_scores", query_embeddings, k=k, where=where)
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        return self._call("get_documents", ids)
+
+    def save(self, path: str) -> None:
+        self._call("save", path)
+
+    def close(self) -> None:
+        if self._process.is_alive():
+            with self._lock:
+                self._conn.send(None)
+            self._process.join(timeout=10)
+        self._conn.close()
+
+class ShardedVectorStore(VectorStore):
+    """Partitions chunks across N independent shard stores and searches them in parallel.
+
+    Chunks are routed by a stable hash of their ID or, with `partition_key`, of
+    one metadata field (chunks lacking the field fall back to the ID hash). A
+    search fans out to every shard at once, each returns its own top k with
+    scores, and a k-way heap merge keeps the global top k. A filter that pins
+    the partition key to a value ($eq / $in, possibly inside $and) only queries
+    the shards those values live on.
+
+    Shards are built by `shard_factory(shard_number)`: any store that returns
+    scores (memory, numpy, quantized, ivf, faiss). With `processes=True` every
+    shard lives in its own worker process, so even pure-Python shards search on
+    separate cores; otherwise shards share this process and the fan-out runs on
+    threads, which parallelizes stores whose search releases the GIL (NumPy, FAISS).
+
+    Each shard is self-contained: `save` writes one directory per shard, and
+    `rebuild_shard` replaces a single shard without touching the others.
+    """
+    def __init__(
+        self,
+        shard_factory: Callable[[int], VectorStore],
+        num_shards: int,
+        partition_key: Optional[str] = None,
+        processes: bool = False,
+    ):
+        if num_shards <= 0:
+            raise ValueError("num_shards must be positive")
+        self.shard_factory = shard_factory
+        self.num_shards = num_shards
+        self.partition_key = partition_key
+        self.processes = processes
+        self._pool = ThreadPoolExecutor(max_workers=num_shards, thread_name_prefix="shard")
+        self.shards: List[VectorStore] = list(self._pool.map(self._create_shard, range(num_shards)))
+
+    def _create_shard(self, shard: int) -> VectorStore:
+        if self.processes:
+            # functools.partial rather than a closure: it has to be pickled to the worker
+            return ProcessShard(partial(self.shard_factory, shard))
+        return self.shard_factory(shard)
+
+    def __len__(self) -> int:
+        return sum(self._map(len, range(self.num_shards)))
+
+    @staticmethod
+    def _hash(value: Any) -> int:
+        # Python's hash() is salted per process; crc32 is stable across runs and workers
+        if isinstance(value, bool) or (isinstance(value, float) and value.is_integer()):
+            value = int(value)
+        return zlib.crc32(repr(value).encode("utf-8"))
+
+    def shard_for(self, doc: Document) -> int:
+        """The shard a chunk belongs to."""
+        if self.partition_key is not None and self.partition_key in doc.metadata:
+            return self._hash(doc.metadata[self.partition_key]) % self.num_shards
+        key = doc.id if doc.id is not None else doc.content
+        return self._hash(key) % self.num_shards
+
+    def _map(self, fn: Callable[[VectorStore], Any], shards) -> List[Any]:
+        """Run fn on the given shards in parallel, results in shard order."""
+        shards = list(shards)
+        if len(shards) == 1:
+            return [fn(self.shards[shards[0]])]
+        return list(self._pool.map(lambda shard: fn(self.shards[shard]), shards))
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        if len(documents) != len(embeddings):
+            raise ValueError("Number of documents and embeddings must match")
+        groups: Dict[int, List[int]] = {}
+        for i, doc in enumerate(documents):
+            groups.setdefault(self.shard_for(doc), []).append(i)
+        if self.partition_key is not None:
+            # A chunk whose partition value changed still has a copy on its old shard; drop it
+            routed = {documents[i].id: shard for shard, positions in groups.items() for i in positions}
+            routed.pop(None, None)
+            if routed:
+                def drop_stale(shard: int) -> None:
+                    self.shards[shard].delete([doc_id for doc_id, target in routed.items() if target != shard])
+
+                list(self._pool.map(drop_stale, range(self.num_shards)))
+        vectors = np.asarray(embeddings, dtype=np.float32) if np is not None else embeddings
+
+        def add(shard: int) -> None:
+            positions = groups[shard]
+            batch = vectors[positions] if np is not None else [vectors[i] for i in positions]
+            self.shards[shard].add_documents([documents[i] for i in positions], batch)
+
+        list(self._pool.map(add, groups))
+
+    def delete(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        if self.partition_key is not None:
+            # The ID alone does not say which shard holds the chunk
+            self._map(lambda shard: shard.delete(list(ids)), range(self.num_shards))
+            return
+        groups: Dict[int, List[str]] = {}
+        for doc_id in ids:
+            groups.setdefault(self._hash(doc_id) % self.num_shards, []).append(doc_id)
+        list(self._pool.map(lambda shard: self.shards[shard].delete(groups[shard]), groups))
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        if self.partition_key is None:
+            shards = sorted({self._hash(doc_id) % self.num_shards for doc_id in ids})
+        else:
+            shards = range(self.num_shards)
+        found = {}
+        for docs in self._map(lambda shard: shard.get_documents(list(ids)), shards):
+            for doc in docs:
+                found[doc.id] = doc
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return self.search_batch([query_embedding], k=k, where=where)[0]
+
+    def search_with_scores(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        return self.search_batch_with_scores([query_embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in results]
+            for results in self.search_batch_with_scores(query_embeddings, k=k, where=where)
+        ]
+
+    def search_batch_with_scores(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """Scatter the batch to the shards, then heap-merge each query's per-shard top k."""
+        if len(query_embeddings) == 0:
+            return []
+        if k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        shards = self._target_shards(where)
+        if np is not None:
+            query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        per_shard = self._map(
+            lambda shard: shard.search_batch_with_scores(query_embeddings, k=k, where=where), shards
+        )
+        return [
+            list(itertools.islice(heapq.merge(*hits, key=lambda hit: -hit[1]), k))
+            for hits in zip(*per_shard)
+        ]
+
+    def _target_shards(self, where: Optional[Dict[str, Any]]) -> List[int]:
+        if not where or self.partition_key is None:
+            return list(range(self.num_shards))
+        shards = self._shards_for_condition(parse_filter(where))
+        return sorted(shards) if shards is not None else list(range(self.num_shards))
+
+    def _shards_for_condition(self, condition: Tuple) -> Optional[Set[int]]:
+        """Shards that can hold matches, or None when the condition does not narrow them."""
+        op = condition[0]
+        if op in ("eq", "in") and condition[1] == self.partition_key:
+            values = [condition[2]] if op == "eq" else condition[2]
+            return {self._hash(value) % self.num_shards for value in values}
+        if op in ("and", "or"):
+            narrowed = [self._shards_for_condition(child) for child in condition[1]]
+            if op == "and":
+                known = [shards for shards in narrowed if shards is not None]
+                return set.intersection(*known) if known else None
+            if any(shards is None for shards in narrowed):
+                return None
+            return set().union(*narrowed)
+        return None
+
+    def rebuild_shard(
+        self,
+        shard: int,
+        documents: Optional[List[Document]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> None:
+        """Replace one shard with a fresh one from the factory, the others keep serving.
+
+        With a factory that loads from a persisted shard directory, this reloads the
+        shard from disk; pass `documents` and `embeddings` (all of which must route
+        to this shard) to repopulate it from source data instead.
+        """
+        if not 0 <= shard < self.num_shards:
+            raise ValueError(f"No shard {shard}; the store has {self.num_shards}")
+        if documents:
+            wrong = [doc.id for doc in documents if self.shard_for(doc) != shard]
+            if wrong:
+                raise ValueError(f"{len(wrong)} documents belong to other shards, e.g. {wrong[0]!r}")
+        replacement = self._create_shard(shard)
+        if documents:
+            replacement.add_documents(documents, embeddings)
+        previous, self.shards[shard] = self.shards[shard], replacement
+        close = getattr(previous, "close", None)
+        if close is not None:
+            close()
+
+    def save(self, path: str) -> None:
+        """Write each shard to its own directory (shard-000, ...) plus the shard layout."""
+        os.makedirs(path, exist_ok=True)
+        list(self._pool.map(
+            lambda shard: self.shards[shard].save(shard_path(path, shard)), range(self.num_shards)
+        ))
+        with open(os.path.join(path, "sharding.json"), "w", encoding="utf-8") as f:
+            json.dump({"num_shards": self.num_shards, "partition_key": self.partition_key}, f)
+
+    @staticmethod
+    def read_layout(path: str) -> Optional[Dict[str, Any]]:
+        """The shard layout saved at `path`, or None if there is no sharded store there."""
+        layout_path = os.path.join(path, "sharding.json")
+        if not os.path.exists(layout_path):
+            return None
+        with open(layout_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def close(self) -> None:
+        for shard in self.shards:
+            close = getattr(shard, "close", None)
+            if close is not None:
+                close()
+        self._pool.shutdown()
@@ -1,5 +1,16 @@
-from typing import List, Optional, Any
+import json
+import os
+from array import array
+from typing import List, Optional, Any, Dict, Tuple
 from rag_workbench.core.interfaces import VectorStore, Document
+from rag_workbench.strategies.storage.persistence import StoreReader, write_store
+from rag_workbench.strategies.storage.chunk_store import ChunkStore
+from rag_workbench.strategies.storage.filters import MetadataIndex, matches, overfetch, parse_filter, to_chroma_where
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class ChromaDBVectorStore(VectorStore):
     def __init__(self, collection_name: str = "rag_workbench", persist_directory: str = "./chroma_db"):
@@ -19,50 +30,143 @@ class ChromaDBVectorStore(VectorStore):
         metadatas = [doc.metadata for doc in documents]
         documents_text = [doc.content for doc in documents]
         
-        self.collection.add(
+        # Upsert so re-ingesting a chunk with a stable ID replaces it instead of failing/duplicating
+        self.collection.upsert(
             ids=ids,
             embeddings=embeddings,
             metadatas=metadatas,
             documents=documents_text
         )
 
-    def search(self, query_embedding: List[float], k: int = 4) -> List[Document]:
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        if not ids:
+            return []
+        result = self.collection.get(ids=list(ids), include=["documents", "metadatas"])
+        found = {
+            doc_id: Document(id=doc_id, content=text, metadata=metadata or {})
+            for doc_id, text, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+        }
+        return [found[doc_id] for doc_id in ids if doc_id in found]
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return self.search_batch([query_embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        if not query_embeddings:
+            return []
+        # Chroma filters natively; normalize to the one-operator-per-dict form it requires
         results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k
+            query_embeddings=query_embeddings,
+            n_results=k,
+            where=to_chroma_where(where) if where else None
         )
         
         # Parse results back to Document objects
-        documents = []
-        if results['ids']:
-            # Chroma returns lists of lists for batch queries
-            ids = results['ids'][0]
-            metadatas = results['metadatas'][0]
-            documents_text = results['documents'][0]
-            
-            for i in range(len(ids)):
-                doc = Document(
-                    id=ids[i],
-                    content=documents_text[i],
-                    metadata=metadatas[i] if metadatas else {}
-                )
-                documents.append(doc)
+        # Chroma returns lists of lists, one inner list per query
+        batches = []
+        for q in range(len(query_embeddings)):
+            documents = []
+            if results['ids']:
+                ids = results['ids'][q]
+                metadatas = results['metadatas'][q] if results['metadatas'] else None
+                documents_text = results['documents'][q]
                 
-        return documents
+                for i in range(len(ids)):
+                    doc = Document(
+                        id=ids[i],
+                        content=documents_text[i],
+                        metadata=metadatas[i] if metadatas else {}
+                    )
+                    documents.append(doc)
+            batches.append(documents)
+                
+        return batches
 
 class InMemoryVectorStore(VectorStore):
     """Simple in-memory vector store for testing/prototyping without dependencies."""
+    # Filters estimated to match at most this fraction of rows are applied before
+    # scoring (only matching rows are scored); broader ones filter the ranked results
+    _PREFILTER_SELECTIVITY = 0.2
+
     def __init__(self):
-        self.documents = []
+        # Chunks are kept compactly and embeddings as packed float32 arrays
+        # rather than lists of Python floats (4 bytes per value instead of ~32)
+        self.documents = ChunkStore()
         self.embeddings = []
+        self._positions = {}
+        # Built on the first filtered search, then kept up to date
+        self._filter_index: Optional[MetadataIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
 
     def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
-        self.documents.extend(documents)
-        self.embeddings.extend(embeddings)
+        index = self._filter_index
+        for doc, emb in zip(documents, embeddings):
+            emb = array("f", emb)
+            position = self._positions.get(doc.id) if doc.id is not None else None
+            if position is not None:
+                if index is not None:
+                    index.remove(position, self.documents.metadata_at(position))
+                    index.add(position, doc.metadata)
+                self.documents[position] = doc
+                self.embeddings[position] = emb
+                continue
+            if doc.id is not None:
+                self._positions[doc.id] = len(self.documents)
+            if index is not None:
+                index.add(len(self.documents), doc.metadata)
+            self.documents.append(doc)
+            self.embeddings.append(emb)
 
-    def search(self, query_embedding: List[float], k: int = 4) -> List[Document]:
+    def delete(self, ids: List[str]) -> None:
+        index = self._filter_index
+        # Swap-remove: move the last row into each deleted slot
+        for doc_id in ids:
+            position = self._positions.pop(doc_id, None)
+            if position is None:
+                continue
+            last = len(self.documents) - 1
+            if index is not None:
+                index.remove(position, self.documents.metadata_at(position))
+            if position != last:
+                if index is not None:
+                    index.move(last, position, self.documents.metadata_at(last))
+                self.documents.move(last, position)
+                self.embeddings[position] = self.embeddings[last]
+                moved_id = self.documents.id_at(position)
+                if moved_id is not None:
+                    self._positions[moved_id] = position
+            self.documents.pop()
+            self.embeddings.pop()
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        return [self.documents[self._positions[doc_id]] for doc_id in ids if doc_id in self._positions]
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query_embedding, k=k, where=where)]
+
+    def search_batch_with_scores(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        return [self.search_with_scores(query_embedding, k=k, where=where) for query_embedding in query_embeddings]
+
+    def search_with_scores(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search and return (document, cosine similarity) pairs, best first."""
         import math
-        
+
         def cosine_similarity(v1, v2):
             dot_product = sum(a*b for a, b in zip(v1, v2))
             magnitude1 = math.sqrt(sum(a*a for a in v1))
@@ -71,12 +175,388 @@ class InMemoryVectorStore(VectorStore):
                 return 0
             return dot_product / (magnitude1 * magnitude2)
 
+        condition = parse_filter(where) if where else None
+        rows = range(len(self.embeddings))
+        if condition is not None:
+            index = self._metadata_index()
+            if index.estimate(condition) <= self._PREFILTER_SELECTIVITY * len(index):
+                rows = sorted(index.rows(condition))
+                condition = None
+
         scores = []
-        for i, emb in enumerate(self.embeddings):
-            score = cosine_similarity(query_embedding, emb)
+        for i in rows:
+            score = cosine_similarity(query_embedding, self.embeddings[i])
             scores.append((score, i))
         
         scores.sort(key=lambda x: x[0], reverse=True)
-        top_k_indices = [idx for _, idx in scores[:k]]
+        if condition is not None:
+            # Post-filter: walk the ranking until k matching rows are found
+            top_k = []
+            for score, idx in scores:
+                if matches(condition, self.documents.metadata_at(idx)):
+                    top_k.append((score, idx))
+                    if len(top_k) == k:
+                        break
+        else:
+            top_k = scores[:k]
         
-        return [self.documents[i] for i in top_k_indices]
+        return [(self.documents[i], score) for score, i in top_k]
+
+    def _metadata_index(self) -> MetadataIndex:
+        if self._filter_index is None:
+            index = MetadataIndex()
+            for row in range(len(self.documents)):
+                index.add(row, self.documents.metadata_at(row))
+            self._filter_index = index
+        return self._filter_index
+
+
+class NumpyVectorStore(VectorStore):
+    """In-memory vector store backed by a contiguous, pre-normalized NumPy matrix.
+
+    Vectors are L2-normalized once on insert so a search is a single matrix-vector
+    product followed by an argpartition-based top-k. Storage grows geometrically,
+    so appends are amortized O(1). Use dtype="float16" to halve memory; scoring is
+    still done in float32, one block at a time.
+    """
+    _GROWTH_FACTOR = 1.5
+    _MIN_CAPACITY = 1024
+    # Rows converted to float32 at once when scoring a float16 matrix
+    _SCORE_BLOCK = 65536
+    # Bytes held at once by a batch search for its scores (float32) and top-k
+    # partition (int64); queries are scored in blocks that fit, so memory does not
+    # grow with the batch
+    _SCORE_BUDGET = 64 * 1024 * 1024
+    # Filters estimated to match at most this fraction of rows are applied before
+    # scoring (only matching rows are scored); broader ones filter the ranked results
+    _PREFILTER_SELECTIVITY = 0.2
+
+    def __init__(self, dtype: str = "float32", initial_capacity: int = 0):
+        if np is None:
+            raise ImportError("NumPy is not installed. Please install it with `pip install numpy`.")
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported dtype for NumpyVectorStore: {dtype}")
+        self.dtype = np.dtype(dtype)
+        self.initial_capacity = initial_capacity
+        self.documents = ChunkStore()
+        self._matrix = None
+        self._count = 0
+        self._reset_row_index()
+        # Built on the first filtered search, then kept up to date
+        self._filter_index: Optional[MetadataIndex] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _reset_row_index(self) -> None:
+        """Start an empty document ID -> row index."""
+        self._rows: Dict[str, int] = {}
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    @property
+    def vectors(self):
+        """View of the stored (normalized) vectors, without the unused capacity."""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=self.dtype)
+        return self._matrix[:self._count]
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> None:
+        if len(documents) != len(embeddings):
+            raise ValueError("Number of documents and embeddings must match")
+        if not documents:
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a 2D array-like of shape (n, dimension)")
+        vectors = self._normalize(vectors)
+        if self.dimension is not None and vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dimension}"
+            )
+
+        # Documents whose ID is already stored (or repeated later in the batch) are
+        # overwritten in place; the last occurrence of an ID wins
+        index = self._filter_index
+        new_positions = []
+        batch_rows = {}
+        overwritten = []
+        overwritten_rows = []
+        for i, doc in enumerate(documents):
+            if doc.id is None:
+                new_positions.append(i)
+                continue
+            row = self._rows.get(doc.id)
+            if row is not None:
+                if index is not None:
+                    index.remove(row, self._metadata(row))
+                    index.add(row, doc.metadata)
+                overwritten_rows.append((row, i))
+                self.documents[row] = doc
+                overwritten.append(doc)
+            elif doc.id in batch_rows:
+                new_positions[batch_rows[doc.id]] = i
+            else:
+                batch_rows[doc.id] = len(new_positions)
+                new_positions.append(i)
+        if overwritten_rows:
+            rows, positions = zip(*overwritten_rows)
+            self._write_rows(np.asarray(rows, dtype=np.int64), vectors[list(positions)])
+        if len(new_positions) < len(documents):
+            vectors = vectors[new_positions]
+            documents = [documents[i] for i in new_positions]
+
+        start = self._count
+        self._reserve(self._count + len(vectors), vectors.shape[1])
+        self._write_rows(np.arange(self._count, self._count + len(vectors)), vectors)
+        for doc in documents:
+            if doc.id is not None:
+                self._rows[doc.id] = len(self.documents)
+            if index is not None:
+                index.add(len(self.documents), doc.metadata)
+            self.documents.append(doc)
+        self._count = len(self.documents)
+
+        written = [self._rows[doc.id] for doc in overwritten]
+        self._on_rows_written(np.concatenate([
+            np.asarray(written, dtype=np.int64),
+            np.arange(start, self._count, dtype=np.int64)
+        ]))
+
+    def delete(self, ids: List[str]) -> None:
+        index = self._filter_index
+        # Swap-remove: move the last row into each deleted slot, O(1) per deletion
+        for doc_id in ids:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                continue
+            last = self._count - 1
+            if index is not None:
+                index.remove(row, self._metadata(row))
+            if row != last:
+                if index is not None:
+                    index.move(last, row, self._metadata(last))
+                self._move_row(last, row)
+            self.documents.pop()
+            self._count -= 1
+
+    def _move_row(self, src: int, dst: int) -> None:
+        self._matrix[dst] = self._matrix[src]
+        self.documents.move(src, dst)
+        moved_id = self.documents.id_at(dst)
+        if moved_id is not None:
+            self._rows[moved_id] = dst
+
+    def _write_rows(self, rows, vectors) -> None:
+        """Store normalized vectors at the given rows; subclasses may encode them."""
+        self._matrix[rows] = vectors
+
+    def _on_rows_written(self, rows) -> None:
+        """Hook for subclasses that maintain per-row state (e.g. index assignments)."""
+        pass
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        return self.documents.metadata_at(row)
+
+    def get_documents(self, ids: List[str]) -> List[Document]:
+        rows = self._rows
+        return [self.documents[rows[doc_id]] for doc_id in ids if doc_id in rows]
+
+    def _metadata_index(self) -> MetadataIndex:
+        if self._filter_index is None:
+            index = MetadataIndex()
+            for row in range(self._count):
+                index.add(row, self._metadata(row))
+            self._filter_index = index
+        return self._filter_index
+
+    def search(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query_embedding, k=k, where=where)]
+
+    def search_with_scores(
+        self, query_embedding: List[float], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """Search and return (document, cosine similarity) pairs, best first."""
+        return self.search_batch_with_scores([query_embedding], k=k, where=where)[0]
+
+    def search_batch(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in results]
+            for results in self.search_batch_with_scores(query_embeddings, k=k, where=where)
+        ]
+
+    def search_batch_with_scores(
+        self, query_embeddings: List[List[float]], k: int = 4, where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """Score a whole batch of queries with one matrix-matrix product.
+
+        With a `where` filter, a selective filter is resolved through the inverted
+        metadata index and only the matching rows are scored; a broad one runs the
+        normal search with over-fetching and drops non-matching results.
+        """
+        if where is None:
+            return self._search_batch_with_scores(query_embeddings, k)
+        condition = parse_filter(where)
+        if len(query_embeddings) == 0:
+            return []
+        if self._count == 0 or k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        index = self._metadata_index()
+        estimate = index.estimate(condition)
+        if estimate <= self._PREFILTER_SELECTIVITY * len(index):
+            rows = np.fromiter(sorted(index.rows(condition)), dtype=np.int64)
+            return self._search_rows(query_embeddings, rows, k)
+        return self._post_filter(query_embeddings, condition, k, estimate / max(len(index), 1))
+
+    def _search_batch_with_scores(self, query_embeddings, k: int) -> List[List[Tuple[Document, float]]]:
+        """Unfiltered search; subclasses with their own index override this."""
+        if len(query_embeddings) == 0:
+            return []
+        if self._count == 0 or k <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2:
+            raise ValueError("Query embeddings must be a 2D array-like of shape (m, dimension)")
+        queries = self._normalize(queries)
+        results = []
+        for block in self._query_blocks(queries, self._count):
+            scores = self._score(block)
+            top = self._top_k(scores, k)
+            results.extend(
+                [(self.documents[i], float(row_scores[i])) for i in row_top]
+                for row_scores, row_top in zip(scores, top)
+            )
+        return results
+
+    def _search_rows(self, query_embeddings, rows, k: int) -> List[List[Tuple[Document, float]]]:
+        """Exact search restricted to the given rows (pre-filtering)."""
+        if len(rows) == 0:
+            return [[] for _ in range(len(query_embeddings))]
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2:
+            raise ValueError("Query embeddings must be a 2D array-like of shape (m, dimension)")
+        matrix = self._matrix[rows].astype(np.float32)
+        results = []
+        for block in self._query_blocks(self._normalize(queries), len(rows)):
+            scores = block @ matrix.T
+            top = self._top_k(scores, k)
+            results.extend(
+                [(self.documents[rows[i]], float(row_scores[i])) for i in row_top]
+                for row_scores, row_top in zip(scores, top)
+            )
+        return results
+
+    def _post_filter(self, query_embeddings, condition, k: int, selectivity: float):
+        """Over-fetch unfiltered results and keep matching ones, widening until k survive."""
+        fetch = overfetch(k, selectivity, self._count)
+        while True:
+            results = self._search_batch_with_scores(query_embeddings, fetch)
+            filtered = [
+                [(doc, score) for doc, score in hits if matches(condition, doc.metadata)][:k]
+                for hits in results
+            ]
+            # Stop once every query has k results or the search has nothing more to give
+            if fetch >= self._count or all(
+                len(hits) >= k or len(raw) < fetch for hits, raw in zip(filtered, results)
+            ):
+                return filtered
+            fetch = min(self._count, fetch * 2)
+
+    def _query_blocks(self, queries, columns: int):
+        """Split queries into blocks whose scores and top-k partition fit _SCORE_BUDGET."""
+        size = max(1, self._SCORE_BUDGET // (12 * max(columns, 1)))
+        for start in range(0, len(queries), size):
+            yield queries[start:start + size]
+
+    def _score(self, queries):
+        """Cosine scores of shape (num_queries, num_vectors)."""
+        matrix = self.vectors
+        if matrix.dtype == np.float32:
+            return queries @ matrix.T
+        scores = np.empty((len(queries), self._count), dtype=np.float32)
+        for start in range(0, self._count, self._SCORE_BLOCK):
+            block = matrix[start:start + self._SCORE_BLOCK].astype(np.float32)
+            scores[:, start:start + len(block)] = queries @ block.T
+        return scores
+
+    @staticmethod
+    def _top_k(scores, k: int):
+        """Row-wise indices of the k highest scores, best first."""
+        columns = scores.shape[1]
+        if k >= columns:
+            return np.argsort(-scores, axis=1, kind="stable")
+        # Partition on the scores themselves; negating them would copy the whole block
+        candidates = np.argpartition(scores, columns - k, axis=1)[:, columns - k:]
+        order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def save(self, path: str) -> None:
+        """Save vectors and documents to a directory in the memory-mappable store format."""
+        write_store(path, self.vectors, self.documents, dtype=self.dtype.name, extra=self._save_state)
+
+    def _save_state(self, path: str) -> None:
+        """Write store.json; subclasses extend it with the extra state `_load_state` reads."""
+        with open(os.path.join(path, "store.json"), "w", encoding="utf-8") as f:
+            json.dump(self._config(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyVectorStore":
+        """Load a saved store fully into memory (see MappedVectorStore.open for zero-copy)."""
+        config = {}
+        config_path = os.path.join(path, "store.json")
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        store = cls(**config)
+        reader = StoreReader(path)
+        try:
+            rows = reader.live_rows()
+            if len(rows):
+                # Stored vectors are already normalized; bypass add_documents' hooks.
+                # Copied a block at a time so a store never holds two full copies
+                store._reserve(len(rows), reader.dimension)
+                for start in range(0, len(rows), cls._SCORE_BLOCK):
+                    block = rows[start:start + cls._SCORE_BLOCK]
+                    store._write_rows(np.arange(start, start + len(block)), reader.vectors[block])
+                store.documents = ChunkStore(reader.records[i] for i in rows)
+                store._count = len(rows)
+                ids = (store.documents.id_at(i) for i in range(len(rows)))
+                store._rows = {doc_id: i for i, doc_id in enumerate(ids) if doc_id is not None}
+        finally:
+            reader.close()
+        store._load_state(path)
+        return store
+
+    def _config(self) -> dict:
+        """Constructor arguments needed to recreate this store."""
+        return {"dtype": self.dtype.name}
+
+    def _load_state(self, path: str) -> None:
+        """Hook for subclasses to restore extra state written by `save`."""
+        pass
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        # Zero vectors stay zero and score 0 against everything, matching InMemoryVectorStore
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, required: int, dimension: int) -> None:
+        if self._matrix is None:
+            capacity = max(required, self.initial_capacity, self._MIN_CAPACITY)
+            self._matrix = np.empty((capacity, dimension), dtype=self.dtype)
+            return
+        if required <= self._matrix.shape[0]:
+            return
+        capacity = max(required, int(self._matrix.shape[0] * self._GROWTH_FACTOR))
+        matrix = np.empty((capacity, dimension), dtype=self.dtype)
+        matrix[:self._count] = self._matrix[:self._count]
+        self._matrix = matrix
@@ -0,0 +1,32 @@
+import asyncio
+
+from rag_workbench.core.interfaces import Document
+from rag_workbench.pipeline import RAGPipeline
+from rag_workbench.serving import MicroBatcher
+from rag_workbench.strategies.chunking import FixedSizeChunker
+from rag_workbench.strategies.embedding import HashEmbeddingModel
+from rag_workbench.strategies.storage import InMemoryVectorStore
+
+def _pipeline():
+    pipeline = RAGPipeline(
+        chunking_strategy=FixedSizeChunker(chunk_size=100, chunk_overlap=0),
+        embedding_model=HashEmbeddingModel(dimension=64),
+        vector_store=InMemoryVectorStore(),
+    )
+    pipeline.ingest([Document(content=f"keyword{i}", metadata={}, id=f"doc{i}") for i in range(20)])
+    return pipeline
+
+def test_stop_before_start_is_a_no_op():
+    asyncio.run(MicroBatcher(_pipeline()).stop())
+
+def test_concurrent_queries_share_a_batch_without_waiting():
+    async def run():
+        # A long window that an idle batcher must not wait out
+        async with MicroBatcher(_pipeline(), max_wait_ms=10_000) as batcher:
+            results = await asyncio.wait_for(
+                asyncio.gather(*(batcher.query(f"keyword{i}", k=1) for i in range(8))), timeout=5
+            )
+            return batcher, results
+    batcher, results = asyncio.run(run())
+    assert [hits[0].metadata["parent_id"] for hits in results] == [f"doc{i}" for i in range(8)]
+    assert batcher.stats.batches < 8
@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from rag_workbench.strategies.retrieval.bm25 import BM25Index, tokenize
+
+VOCABULARY = [f"w{i}" for i in range(60)] + ["the", "a", "of"] * 10
+
+def _corpus(seed=0, size=300):
+    rng = random.Random(seed)
+    return {f"doc{i}": " ".join(rng.choices(VOCABULARY, k=rng.randint(3, 40))) for i in range(size)}
+
+def _exhaustive(corpus, query, k, k1=1.2, b=0.75):
+    tokens = {doc_id: tokenize(text) for doc_id, text in corpus.items()}
+    average = sum(len(t) for t in tokens.values()) / len(tokens)
+    weights = {}
+    for token in tokenize(query):
+        weights[token] = weights.get(token, 0) + 1
+    scores = {}
+    for term, weight in weights.items():
+        df = sum(1 for t in tokens.values() if term in t)
+        if not df:
+            continue
+        idf = math.log(1.0 + (len(tokens) - df + 0.5) / (df + 0.5)) * weight
+        for doc_id, t in tokens.items():
+            tf = t.count(term)
+            if tf:
+                norm = k1 * (1 - b + b * len(t) / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return sorted(scores.items(), key=lambda item: -item[1])[:k]
+
+def _assert_same_ranking(results, expected, reference):
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected])
+    # Ties may be broken differently; every returned document must carry its true score
+    for doc_id, score in results:
+        assert reference[doc_id] == pytest.approx(score)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_maxscore_matches_exhaustive_scoring(seed):
+    corpus = _corpus(seed)
+    index = BM25Index()
+    index.add_many(corpus.items())
+    # Upserts and deletes, compacted so collection statistics cover live documents only
+    rng = random.Random(seed)
+    for doc_id in rng.sample(sorted(corpus), 40):
+        del corpus[doc_id]
+    index.delete([doc_id for doc_id in index._numbers if doc_id not in corpus])
+    for doc_id in rng.sample(sorted(corpus), 20):
+        corpus[doc_id] = " ".join(rng.choices(VOCABULARY, k=10))
+        index.add(doc_id, corpus[doc_id])
+    index.compact()
+    for _ in range(20):
+        query = " ".join(rng.choices(VOCABULARY, k=rng.randint(1, 6)))
+        for k in (1, 5, 20):
+            expected = _exhaustive(corpus, query, k=len(corpus))
+            _assert_same_ranking(index.search(query, k=k), expected[:k], dict(expected))
+
+def test_resave_keeps_previous_generation_until_committed(tmp_path):
+    path = str(tmp_path)
+    index = BM25Index()
+    index.add_many(_corpus().items())
+    index.save(path)
+    index.add("extra", "w1 w2 w3")
+    index.save(path)
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["bm25.json", "lengths.2.bin", "postings.2.bin"]
+    loaded = BM25Index.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.search("w1 w2", k=5) == index.search("w1 w2", k=5)
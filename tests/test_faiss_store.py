@@ -0,0 +1,26 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+from rag_workbench.core.interfaces import Document
+from rag_workbench.strategies.storage import FaissVectorStore
+
+def _small_ivf_store():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((100, 32)).astype(np.float32)
+    docs = [Document(content=f"chunk {i}", metadata={}, id=f"doc{i}") for i in range(100)]
+    store = FaissVectorStore(index_type="ivf")
+    store.add_documents(docs, vectors)
+    return store, vectors
+
+def test_ivf_search_on_corpus_smaller_than_nlist():
+    store, vectors = _small_ivf_store()
+    results = store.search(vectors[7], k=3)
+    assert results[0].id == "doc7"
+
+def test_ivf_save_on_corpus_smaller_than_nlist(tmp_path):
+    store, vectors = _small_ivf_store()
+    store.save(str(tmp_path))
+    loaded = FaissVectorStore.load(str(tmp_path))
+    assert loaded.search(vectors[42], k=1)[0].id == "doc42"
@@ -0,0 +1,42 @@
+from rag_workbench.core.interfaces import Document
+from rag_workbench.pipeline import IngestionManifest, RAGPipeline
+from rag_workbench.pipeline.manifest import document_key
+from rag_workbench.strategies.chunking import FixedSizeChunker
+from rag_workbench.strategies.embedding import HashEmbeddingModel
+from rag_workbench.strategies.storage import InMemoryVectorStore
+
+HEADER = "Shared header text. "
+
+def _pipeline():
+    return RAGPipeline(
+        chunking_strategy=FixedSizeChunker(chunk_size=20, chunk_overlap=0),
+        embedding_model=HashEmbeddingModel(dimension=32),
+        vector_store=InMemoryVectorStore(),
+        manifest=IngestionManifest(),
+    )
+
+def test_id_less_documents_sharing_chunk_text_keep_distinct_chunks():
+    pipeline = _pipeline()
+    a = Document(content=HEADER + "body of document A", metadata={})
+    b = Document(content=HEADER + "body of document B", metadata={})
+    pipeline.ingest([a, b])
+    assert len(pipeline.vector_store) == 4
+
+def test_prune_keeps_chunks_of_unchanged_documents():
+    pipeline = _pipeline()
+    a = Document(content=HEADER + "body of document A", metadata={})
+    b = Document(content=HEADER + "body of document B", metadata={})
+    pipeline.ingest([a, b])
+    pipeline.ingest([b], prune=True)
+    assert set(pipeline.vector_store._positions) == set(pipeline.manifest.get_chunk_ids(document_key(b)))
+    assert len(pipeline.vector_store) == 2
+
+def test_manifest_tracks_chunk_ids_listed_by_several_entries():
+    manifest = IngestionManifest()
+    manifest.record("a", "h1", ["x", "y"])
+    manifest.record("b", "h2", ["y"])
+    manifest.remove("a")
+    assert not manifest.is_referenced("x")
+    assert manifest.is_referenced("y")
+    manifest.record("b", "h3", ["z"])
+    assert not manifest.is_referenced("y")
@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rag_workbench.config.settings import VectorStoreConfig, VectorStoreType
+from rag_workbench.core.interfaces import Document
+from rag_workbench.pipeline import PipelineBuilder
+from rag_workbench.strategies.storage import MappedVectorStore
+
+def _docs(n, prefix="doc"):
+    return [Document(content=f"chunk {i}", metadata={}, id=f"{prefix}{i}") for i in range(n)]
+
+def test_second_writer_fails_fast(tmp_path):
+    path = str(tmp_path / "store")
+    writer = MappedVectorStore.open(path, writable=True)
+    writer.add_documents(_docs(3), np.eye(3, 8))
+    with pytest.raises(RuntimeError):
+        MappedVectorStore.open(path, writable=True)
+    reader = MappedVectorStore.open(path)
+    assert len(reader) == 3
+    writer.close()
+    second = MappedVectorStore.open(path, writable=True)
+    second.add_documents(_docs(2, prefix="new"), np.eye(2, 8))
+    second.close()
+    assert len(MappedVectorStore.open(path)) == 5
+
+def test_builder_opens_mapped_store_read_only(tmp_path):
+    path = str(tmp_path / "store")
+    writer = MappedVectorStore.open(path, writable=True)
+    writer.add_documents(_docs(3), np.eye(3, 8))
+    config = VectorStoreConfig(store_type=VectorStoreType.NUMPY, index_path=path, mmap=True)
+    store = PipelineBuilder._build_vector_store(config)
+    with pytest.raises(ValueError):
+        store.add_documents(_docs(1, prefix="new"), np.eye(1, 8))
+    writer.close()